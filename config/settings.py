@@ -1,9 +1,10 @@
 """
 Kelp Deal Flow Pipeline - Configuration Settings
 """
+import os
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
@@ -12,9 +13,11 @@ OUTPUT_DIR = BASE_DIR / "output"
 PPTX_OUTPUT_DIR = OUTPUT_DIR / "pptx"
 CITATIONS_OUTPUT_DIR = OUTPUT_DIR / "citations"
 
-# Ensure output directories exist
-PPTX_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-CITATIONS_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+def ensure_output_dirs() -> None:
+    """Create output directories (called by writers, not at import time)"""
+    PPTX_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    CITATIONS_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
 @dataclass
@@ -139,10 +142,69 @@ class LLMConfig:
     """LLM Configuration for Ollama"""
     model_name: str = "qwen2.5:7b"  # Use qwen2.5 which is available
     base_url: str = "http://localhost:11434"
+    # Several inference hosts, e.g. OLLAMA_HOSTS="http://gpu1:11434,http://gpu2:11434";
+    # with more than one, requests are load-balanced across them (ollama_pool.py)
+    endpoints: List[str] = field(default_factory=lambda: [
+        url.strip() for url in os.environ.get("OLLAMA_HOSTS", "").split(",") if url.strip()
+    ])
+    pool_readmit_after: float = 10.0  # Seconds before an ejected host is probed again
     temperature_factual: float = 0.3  # For data extraction
     temperature_creative: float = 0.7  # For anonymization/rewriting
     max_tokens: int = 2048
     timeout: int = 120
+    connect_timeout: int = 10
+    probe_timeout: int = 5  # /api/tags health checks
+    max_connections: int = 8  # Pooled keep-alive connections to Ollama
+    keepalive_timeout: int = 60
+    # Concurrent generate requests per server; match the server's OLLAMA_NUM_PARALLEL
+    num_parallel: int = field(default_factory=lambda: int(os.environ.get("OLLAMA_NUM_PARALLEL", "4")))
+    # Adapt the in-flight limit (starting at num_parallel) to measured tokens/sec
+    adaptive_parallel: bool = True
+    min_parallel: int = 1
+    max_parallel: int = 16
+    limit_latency_tolerance: float = 2.0  # Throughput drop vs baseline that counts as thrashing
+    limit_baseline_decay: float = 0.9  # Per-window decay of the best-throughput baseline
+    limit_backoff: float = 0.75  # Multiplicative decrease factor
+    # Retries of transient errors (connection, 5xx) with jittered exponential backoff
+    retry_attempts: int = 2
+    retry_backoff: float = 0.5
+    retry_backoff_max: float = 8.0
+    # Circuit breaker: fail fast after this many consecutive backend failures,
+    # probe again after breaker_reset_timeout seconds
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    # Request all teaser sections in one schema-constrained call instead of four
+    one_shot_content: bool = False
+    # Prefill company data once per company and reuse Ollama's context tokens.
+    # Off by default: the session replaces per-section context packing with one
+    # shared pack, and its prefill must finish before any section starts
+    context_sessions: bool = False
+    context_keep_alive: str = "10m"  # Keep the model loaded between section prompts
+    # Sent with every request while a batch pins the content model (ModelResidency)
+    batch_keep_alive: str = "30m"
+    health_ttl: float = 30.0  # Reuse an availability probe for this long
+    health_refresh_interval: float = 15.0  # Background probe period (service mode)
+    # Generation options applied to every request unless overridden per call
+    default_options: Dict[str, Any] = field(default_factory=lambda: {
+        "num_gpu": 99,  # Use all available GPU layers
+        "num_ctx": 4096,
+    })
+
+
+@dataclass
+class PipelineConfig:
+    """Batch orchestration configuration"""
+    max_workers: int = 1  # Companies processed concurrently by process_all
+    research_cache_ttl_hours: float = 24.0  # Reuse sector research for this long
+    llm_cache_enabled: bool = True  # Serve repeated LLM prompts from output/llm_cache.sqlite
+    llm_cache_max_entries: int = 20000  # LRU-evicted beyond this
+    # Seconds per company for LLM teaser sections; unfinished ones use the
+    # sector template (0 = wait for every section)
+    content_deadline: float = 150.0
+    # Service mode: finished jobs (and their decks) are forgotten after this
+    # long, or once more than service_max_jobs are retained
+    service_job_ttl_hours: float = 24.0
+    service_max_jobs: int = 500
 
 
 @dataclass
@@ -168,4 +230,5 @@ COMPANY_FOLDERS = {
 # Initialize default configs
 BRANDING = KelpBranding()
 LLM_CONFIG = LLMConfig()
+PIPELINE_CONFIG = PipelineConfig()
 IMAGE_CONFIG = ImageConfig()
@@ -22,6 +22,10 @@ PowerPoint presentations.
 Usage:
     python main.py                        # Process all companies
     python main.py --company kalyani      # Process specific company
+    python main.py --workers 4            # Process 4 companies concurrently
+    python main.py --force                # Regenerate unchanged companies too
+    python main.py --resume               # Reuse checkpointed LLM/research output
+    python main.py --serve --port 8765    # Run as a service with warm engines
     python main.py --help                 # Show help
 
 Author: Shubrojyoti Dey
@@ -29,6 +33,7 @@ License: MIT
 """
 
 import sys
+import asyncio
 from pathlib import Path
 
 # Add project root to path
@@ -48,4 +53,4 @@ if __name__ == "__main__":
 ║  📊 Data-Dense Professional Presentations                                    ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
     """)
-    main()
+    asyncio.run(main())
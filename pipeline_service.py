@@ -0,0 +1,382 @@
+"""
+KELP Teaser Service
+===================
+
+Long-running teaser generation service with warm engines.
+
+A one-shot `main.py` run pays for interpreter start-up, engine
+construction, an Ollama probe and fresh HTTP connections before it does
+any real work. The service builds one PipelineV5Enhanced, warms its
+engines and HTTP pool once, and then processes queued jobs on them, so
+per-request latency is the pipeline work itself.
+
+API (JSON over HTTP, on TCP or a Unix socket):
+    POST /jobs                    {"company_name": "...", "markdown": "..."}
+                                  -> 202 {"job_id": ..., "status_url": ...}
+                                  ?wait=1 blocks until the job finishes
+    GET  /jobs                    all known jobs
+    GET  /jobs/{job_id}           job status and result
+    GET  /jobs/{job_id}/pptx      generated deck
+    GET  /jobs/{job_id}/citations citation document
+    GET  /health                  queue depth, workers, warm engines, Ollama models
+
+Each job writes its deck, citations and trace to its own folder,
+<service_dir>/decks/jobs/<job>-<slug>/. Finished jobs are kept for
+PIPELINE_CONFIG.service_job_ttl_hours, up to service_max_jobs of them;
+older ones are forgotten and their folder deleted. Uploaded markdown is
+removed as soon as its job finishes.
+
+Usage:
+    python pipeline_service.py                      # http://127.0.0.1:8765
+    python pipeline_service.py --port 9000 --workers 2
+    python pipeline_service.py --socket /tmp/kelp.sock
+    python pipeline_v5_enhanced.py --serve          # same, via the pipeline CLI
+
+    curl -X POST localhost:8765/jobs?wait=1 \\
+         -H 'Content-Type: application/json' \\
+         -d '{"company_name": "acme", "markdown": "# Acme ..."}'
+"""
+
+import asyncio
+import itertools
+import re
+import shutil
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Setup paths
+import sys
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.settings import OUTPUT_DIR, PIPELINE_CONFIG
+from pipeline_v5_enhanced import PipelineResult, PipelineV5Enhanced
+from src.orchestration import get_model_residency
+
+
+SERVICE_DIR = OUTPUT_DIR / "service"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_MARKDOWN_BYTES = 2 * 1024 * 1024
+
+
+@dataclass
+class ServiceJob:
+    """A queued teaser generation request"""
+    job_id: str
+    company_name: str
+    company_folder: str
+    status: str = "queued"  # queued -> running -> done | failed
+    created: str = ""
+    started: Optional[str] = None
+    finished: Optional[str] = None
+    queue_wait: float = 0.0
+    processing_time: float = 0.0
+    codename: str = ""
+    sector: str = ""
+    ppt_path: str = ""
+    citation_path: str = ""
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data.pop("company_folder")
+        return data
+
+
+def _slug(name: str) -> str:
+    """Folder-safe company slug (no '-', which the pipeline splits on)"""
+    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+    return slug[:40] or "company"
+
+
+class TeaserService:
+    """
+    Job queue in front of a single warm pipeline.
+
+    Uploaded markdown is written to <service_dir>/inbox/<job>-<slug>/, which
+    is the pipeline's data_dir, and processed by ``workers`` queue workers.
+    Engines, the Ollama availability probe, the image cache and the pooled
+    HTTP session are shared by every job.
+    """
+
+    def __init__(self, workers: int = 1, service_dir: Path = SERVICE_DIR,
+                 verbose: bool = True):
+        self.workers = max(1, workers)
+        self.service_dir = Path(service_dir)
+        self.inbox = self.service_dir / "inbox"
+        self.inbox.mkdir(parents=True, exist_ok=True)
+        self.pipeline = PipelineV5Enhanced(
+            verbose=verbose,
+            data_dir=self.inbox,
+            output_dir=self.service_dir / "decks",
+            job_dirs=True
+        )
+
+        self.jobs: Dict[str, ServiceJob] = {}
+        self._done: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._ids = itertools.count(1)
+        self.started_at = time.time()
+
+    async def start(self) -> None:
+        """Warm engines and the HTTP pool, then start queue workers"""
+        print("🔥 Warming engines...")
+        pipeline = self.pipeline
+        await pipeline.open_http()
+        _ = pipeline.enrichment_engine
+        available = await pipeline.content_generator.check_availability()
+        print(f"  {'✓' if available else '⚠'} Ollama {'available' if available else 'not reachable - fallback content'}")
+        # Keep the availability snapshot fresh so jobs never probe inline
+        pipeline.content_generator.client.health.start()
+        # Keep the content model loaded for the life of the service
+        if available:
+            await get_model_residency().pin()
+        # The image fetcher's constructor does blocking setup
+        await asyncio.to_thread(lambda: pipeline.image_fetcher)
+
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        print(f"✓ Service ready ({self.workers} worker{'s' if self.workers > 1 else ''})")
+
+    async def stop(self) -> None:
+        """Stop workers and release the HTTP pool"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        content = self.pipeline.loaded_engine("content")
+        if content is not None:
+            await content.client.health.stop()
+            await get_model_residency().release()
+        await self.pipeline.close_http()
+
+    def submit(self, company_name: str, markdown: str) -> ServiceJob:
+        """Write the payload to the inbox and queue it"""
+        self._prune()
+        job_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}{next(self._ids):04d}"
+        slug = _slug(company_name)
+        folder = f"{job_id}-{slug}"
+        folder_path = self.inbox / folder
+        folder_path.mkdir(parents=True, exist_ok=True)
+        (folder_path / f"{slug}.md").write_text(markdown, encoding="utf-8")
+
+        job = ServiceJob(job_id=job_id, company_name=company_name, company_folder=folder,
+                         created=datetime.now().isoformat())
+        self.jobs[job_id] = job
+        self._done[job_id] = asyncio.Event()
+        self._queue.put_nowait(job)
+        return job
+
+    async def wait(self, job_id: str) -> ServiceJob:
+        # Held here: a finished job may be pruned before this waiter resumes
+        job = self.jobs[job_id]
+        await self._done[job_id].wait()
+        return job
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run_job(job)
+            finally:
+                self._done[job.job_id].set()
+                self._queue.task_done()
+                # The deck is written; the upload and its checkpoints are not needed again
+                shutil.rmtree(self.inbox / job.company_folder, ignore_errors=True)
+                self.pipeline.discard_checkpoints(job.company_folder)
+
+    def _prune(self) -> None:
+        """Forget finished jobs past the TTL or the retention cap, oldest first"""
+        finished = [j for j in self.jobs.values() if j.status in ("done", "failed")]
+        cutoff = time.time() - PIPELINE_CONFIG.service_job_ttl_hours * 3600
+        excess = len(self.jobs) + 1 - PIPELINE_CONFIG.service_max_jobs  # Room for the new job
+        for job in sorted(finished, key=lambda j: j.finished or ""):
+            expired = datetime.fromisoformat(job.finished).timestamp() < cutoff
+            if not expired and excess <= 0:
+                break
+            excess -= 1
+            del self.jobs[job.job_id]
+            self._done.pop(job.job_id, None)
+            # Deck, citations and trace: private to this job
+            shutil.rmtree(self.pipeline.job_dir(job.company_folder), ignore_errors=True)
+
+    async def _run_job(self, job: ServiceJob) -> None:
+        job.status = "running"
+        job.started = datetime.now().isoformat()
+        job.queue_wait = time.time() - datetime.fromisoformat(job.created).timestamp()
+        try:
+            result: PipelineResult = await self.pipeline.process_company(
+                job.company_folder, close_sessions=False
+            )
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+        else:
+            job.status = "done" if result.success else "failed"
+            job.error = result.error
+            job.codename = result.codename
+            job.sector = result.sector
+            job.ppt_path = result.ppt_path
+            job.citation_path = result.citation_path
+            job.processing_time = result.processing_time
+        job.finished = datetime.now().isoformat()
+        print(f"{'✅' if job.status == 'done' else '❌'} Job {job.job_id} "
+              f"({job.company_name}): {job.status} in {job.processing_time:.1f}s")
+
+    def health(self) -> Dict:
+        ollama, hosts, limit, breaker = None, None, None, None
+        content = self.pipeline.loaded_engine("content")
+        if content is not None:
+            client = content.client
+            ollama = client.health.snapshot
+            if hasattr(client, "stats"):
+                hosts = client.stats()  # Multi-host pool
+            else:
+                limit = client.limiter.stats()
+                breaker = client.breaker.stats()
+        return {
+            "status": "ok",
+            "uptime": round(time.time() - self.started_at, 1),
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": sum(1 for j in self.jobs.values() if j.status == "running"),
+            "jobs": len(self.jobs),
+            "warm_engines": self.pipeline.warm_engines(),
+            "ollama": ollama.as_dict() if ollama else None,
+            "ollama_hosts": hosts,
+            "ollama_limit": limit,
+            "ollama_breaker": breaker,
+        }
+
+
+def create_app(service: TeaserService):
+    """Build the aiohttp application for a service"""
+    from aiohttp import web
+
+    routes = web.RouteTableDef()
+
+    def _job_or_404(request) -> ServiceJob:
+        job = service.jobs.get(request.match_info["job_id"])
+        if job is None:
+            raise web.HTTPNotFound(text="unknown job")
+        return job
+
+    @routes.post("/jobs")
+    async def submit_job(request):
+        if request.content_length and request.content_length > MAX_MARKDOWN_BYTES:
+            raise web.HTTPRequestEntityTooLarge(max_size=MAX_MARKDOWN_BYTES,
+                                                actual_size=request.content_length)
+        if request.content_type == "application/json":
+            try:
+                payload = await request.json()
+            except ValueError:
+                raise web.HTTPBadRequest(text="invalid JSON")
+            company_name = str(payload.get("company_name", "")).strip()
+            markdown = payload.get("markdown", "")
+        else:
+            # Raw markdown body, name in the query string
+            company_name = request.query.get("company_name", "").strip()
+            markdown = await request.text()
+
+        if not company_name or not isinstance(markdown, str) or not markdown.strip():
+            raise web.HTTPBadRequest(text="company_name and non-empty markdown are required")
+
+        job = service.submit(company_name, markdown)
+        if request.query.get("wait") in ("1", "true", "yes"):
+            await service.wait(job.job_id)
+            return web.json_response(job.to_dict())
+        return web.json_response(
+            {**job.to_dict(), "status_url": f"/jobs/{job.job_id}"}, status=202
+        )
+
+    @routes.get("/jobs")
+    async def list_jobs(request):
+        return web.json_response([job.to_dict() for job in service.jobs.values()])
+
+    @routes.get("/jobs/{job_id}")
+    async def get_job(request):
+        return web.json_response(_job_or_404(request).to_dict())
+
+    async def _artifact(request, attr: str):
+        job = _job_or_404(request)
+        if job.status != "done":
+            raise web.HTTPConflict(text=f"job is {job.status}")
+        path = Path(getattr(job, attr) or "")
+        if not path.is_file():
+            raise web.HTTPNotFound(text="artifact not available")
+        return web.FileResponse(path, headers={
+            "Content-Disposition": f'attachment; filename="{path.name}"'
+        })
+
+    @routes.get("/jobs/{job_id}/pptx")
+    async def get_pptx(request):
+        return await _artifact(request, "ppt_path")
+
+    @routes.get("/jobs/{job_id}/citations")
+    async def get_citations(request):
+        return await _artifact(request, "citation_path")
+
+    @routes.get("/health")
+    async def health(request):
+        return web.json_response(service.health())
+
+    app = web.Application(client_max_size=MAX_MARKDOWN_BYTES)
+    app.add_routes(routes)
+
+    async def on_startup(app):
+        await service.start()
+
+    async def on_cleanup(app):
+        await service.stop()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                socket_path: Optional[str] = None, workers: int = 1,
+                verbose: bool = True) -> None:
+    """Run the service until cancelled (Ctrl+C)"""
+    from aiohttp import web
+
+    service = TeaserService(workers=workers, verbose=verbose)
+    runner = web.AppRunner(create_app(service))
+    await runner.setup()
+    if socket_path:
+        site = web.UnixSite(runner, socket_path)
+        where = f"unix:{socket_path}"
+    else:
+        site = web.TCPSite(runner, host, port)
+        where = f"http://{host}:{port}"
+    await site.start()
+    print(f"🛰️  KELP teaser service listening on {where}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="KELP teaser generation service")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Bind address (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port (default: %(default)s)")
+    parser.add_argument("--socket", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=PIPELINE_CONFIG.max_workers,
+                        help="Jobs processed concurrently (default: %(default)s)")
+    parser.add_argument("--quiet", action="store_true", help="Minimal output")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.socket, args.workers, not args.quiet))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,64 +11,55 @@ This version extends V4 with:
 Usage:
     python pipeline_v5_enhanced.py                    # Process all companies
     python pipeline_v5_enhanced.py --company kalyani  # Single company
+    python pipeline_v5_enhanced.py --workers 4        # 4 companies at a time
+    python pipeline_v5_enhanced.py --force            # Ignore run manifest, rebuild all
+    python pipeline_v5_enhanced.py --resume           # Reuse checkpointed stage outputs
+    python pipeline_v5_enhanced.py --serve            # Long-running service, warm engines
 """
 
+from __future__ import annotations
+
 import asyncio
+import threading
 import time
 import json
 import re
 import random
+import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import asdict, dataclass, field
 
 # Setup paths
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config.settings import COMPANY_DATA_DIR, OUTPUT_DIR
+from config.settings import COMPANY_DATA_DIR, LLM_CONFIG, OUTPUT_DIR, PIPELINE_CONFIG, ensure_output_dirs
 
-# Import pipeline components
+# Import pipeline components. Only lightweight modules are imported here;
+# engines with heavy dependencies (aiohttp, bs4, ddgs, pptx, docx, PIL,
+# icrawler) are imported when their stage first runs, so CLI introspection
+# and short jobs start fast. scripts/check_import_time.py guards this.
 from src.data_ingestion import load_company_data, CompanyData
 from src.sector_intelligence import classify_company
-from src.content_generation.data_enrichment_engine import (
-    DataEnrichmentEngine, ExtractedMetrics
-)
-from src.content_generation.investment_content_generator import (
-    InvestmentContentGenerator, generate_teaser_content_gpu
-)
-from src.presentation.enhanced_kelp_generator import (
-    EnhancedKelpGenerator, EnhancedTeaserData
+from src.content_generation.context_packer import pack_context
+from src.content_generation.llm_usage import GENERATE_SPAN, UsageTotals, llm_usage
+from src.content_generation.research_cache import ResearchCache
+from src.orchestration import (
+    CheckpointStore, Fallback, RunManifest, Stage, StageGraph, TraceFile, get_model_residency
 )
-from src.citation import generate_citations_from_content
+from src.orchestration.run_manifest import config_fingerprint, hash_inputs
+from src.orchestration.results_sink import ResultsSink, ResultsSummary
+from src.orchestration.tracing import Tracer, activate, current_tracer, lane, span
 
-# Import FREE image fetcher (no API keys needed!)
-try:
-    from src.image_intelligence.free_image_fetcher import FreeImageFetcher
-    HAS_IMAGE_FETCHER = True
-except ImportError:
-    HAS_IMAGE_FETCHER = False
-    print("⚠ FreeImageFetcher not available - images will not be added to PPTs")
-
-# Import Web Research Engine for real market statistics
-try:
-    from src.content_generation.advanced_research_engine import (
-        AdvancedResearchEngine, MarketIntelligence, perform_deep_research
+if TYPE_CHECKING:
+    from src.content_generation.data_enrichment_engine import (
+        DataEnrichmentEngine, ExtractedMetrics
     )
-    HAS_WEB_RESEARCH = True
-    HAS_ADVANCED_RESEARCH = True
-except ImportError:
-    HAS_ADVANCED_RESEARCH = False
-    try:
-        from src.content_generation.web_research_engine import (
-            WebResearchEngine as AdvancedResearchEngine, 
-            MarketResearch as MarketIntelligence
-        )
-        HAS_WEB_RESEARCH = True
-    except ImportError:
-        HAS_WEB_RESEARCH = False
-        print("⚠ Web Research Engine not available - using synthetic data only")
+    from src.content_generation.investment_content_generator import InvestmentContentGenerator
+    from src.presentation.enhanced_kelp_generator import EnhancedTeaserData
+    from src.web_scraping.http_pool import SharedHTTPClient
 
 
 @dataclass
@@ -87,8 +78,18 @@ class PipelineResult:
     # Data quality indicators
     financial_data_extracted: bool = False
     content_generated_by_llm: bool = False
+    content_fallback_sections: List[str] = field(default_factory=list)  # Template/default, not LLM
     images_added: int = 0  # Count of images added to PPT
     
+    # Seconds spent per pipeline stage (from the run's trace spans)
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    
+    # Ollama token counts and GPU time per engine/prompt (see llm_usage.py)
+    llm_usage: Dict[str, Any] = field(default_factory=dict)
+    
+    # Reused from the run manifest because inputs, config and code were unchanged
+    cached: bool = False
+    
     error: Optional[str] = None
 
 
@@ -103,37 +104,101 @@ class PipelineV5Enhanced:
     - More data-dense presentations
     """
     
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, data_dir: Optional[Path] = None,
+                 output_dir: Optional[Path] = None, job_dirs: bool = False):
         self.verbose = verbose
         self.results: List[PipelineResult] = []
         
+        # Company folders are read from data_dir (the service mode points
+        # this at its inbox of uploaded markdown)
+        self.data_dir = Path(data_dir) if data_dir else COMPANY_DATA_DIR
+        
         # Initialize generators
-        self.output_dir = OUTPUT_DIR / "v5_enhanced"
+        self.output_dir = Path(output_dir) if output_dir else OUTPUT_DIR / "v5_enhanced"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        ensure_output_dirs()
+        # Service mode: each company's deck, citations and trace go to
+        # output_dir/jobs/<company_folder>/ so jobs never share a file
+        self.job_dirs = job_dirs
         
-        self.ppt_generator = EnhancedKelpGenerator(self.output_dir)
-        self.enrichment_engine = DataEnrichmentEngine()
-        self.content_generator = InvestmentContentGenerator()
+        # Engines are created on first use (see _lazy); blocking stages may
+        # race to create them from worker threads, hence the lock
+        self._engines: Dict[str, Any] = {}
+        self._engine_lock = threading.Lock()
         
-        # Initialize FREE image fetcher
-        if HAS_IMAGE_FETCHER:
-            self.image_fetcher = FreeImageFetcher(
-                cache_dir=OUTPUT_DIR / "image_cache"
-            )
-            self.log("Image fetcher initialized (DuckDuckGo + icrawler)", "INFO")
-        else:
-            self.image_fetcher = None
+        # Sector research is shared by every company in the same sector
+        self.research_cache = ResearchCache(
+            OUTPUT_DIR / "research_cache",
+            ttl_seconds=PIPELINE_CONFIG.research_cache_ttl_hours * 3600
+        )
         
-        # Initialize Advanced Web Research Engine (Gemini-style)
-        if HAS_WEB_RESEARCH:
-            if HAS_ADVANCED_RESEARCH:
-                self.web_research = AdvancedResearchEngine()
+        # Pooled keep-alive HTTP session shared by the research engines;
+        # created and opened lazily on the running loop, closed once per batch
+        self.http_client: Optional[SharedHTTPClient] = None
+        
+        self.stage_graph = self._build_stage_graph()
+    
+    def _lazy(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Create an engine on first access and keep it for later companies"""
+        if name not in self._engines:
+            with self._engine_lock:
+                if name not in self._engines:
+                    self._engines[name] = factory()
+        return self._engines[name]
+    
+    def loaded_engine(self, name: str) -> Optional[Any]:
+        """An engine that has already been created, without creating it"""
+        return self._engines.get(name)
+    
+    def warm_engines(self) -> List[str]:
+        """Names of the engines created so far"""
+        return sorted(k for k, v in self._engines.items() if v is not None)
+    
+    @property
+    def enrichment_engine(self) -> DataEnrichmentEngine:
+        def create():
+            from src.content_generation.data_enrichment_engine import DataEnrichmentEngine
+            return DataEnrichmentEngine()
+        return self._lazy("enrichment", create)
+    
+    @property
+    def content_generator(self) -> InvestmentContentGenerator:
+        def create():
+            from src.content_generation.investment_content_generator import InvestmentContentGenerator
+            return InvestmentContentGenerator()
+        return self._lazy("content", create)
+    
+    @property
+    def image_fetcher(self) -> Optional[Any]:
+        """FREE image fetcher (DuckDuckGo + icrawler), or None if unavailable"""
+        def create():
+            try:
+                from src.image_intelligence.free_image_fetcher import FreeImageFetcher
+            except ImportError:
+                print("⚠ FreeImageFetcher not available - images will not be added to PPTs")
+                return None
+            self.log("Image fetcher initialized (DuckDuckGo + icrawler)", "INFO")
+            return FreeImageFetcher(cache_dir=OUTPUT_DIR / "image_cache")
+        return self._lazy("images", create)
+    
+    @property
+    def web_research(self) -> Optional[Any]:
+        """Advanced (Gemini-style) research engine, falling back to the basic one"""
+        def create():
+            try:
+                from src.content_generation.advanced_research_engine import AdvancedResearchEngine
                 self.log("Advanced Research Engine initialized (deep web reading)", "INFO")
-            else:
-                self.web_research = AdvancedResearchEngine()
+                return AdvancedResearchEngine()
+            except ImportError:
+                pass
+            try:
+                from src.content_generation.web_research_engine import WebResearchEngine
                 self.log("Web Research Engine initialized (DuckDuckGo search)", "INFO")
-        else:
-            self.web_research = None
+                return WebResearchEngine()
+            except ImportError:
+                print("⚠ Web Research Engine not available - using synthetic data only")
+                return None
+        return self._lazy("research", create)
     
     def log(self, message: str, level: str = "INFO") -> None:
         """Log a message if verbose mode is on"""
@@ -148,7 +213,7 @@ class PipelineV5Enhanced:
     
     def _read_raw_markdown(self, company_folder: str) -> str:
         """Read raw markdown file for a company"""
-        folder_path = COMPANY_DATA_DIR / company_folder
+        folder_path = self.data_dir / company_folder
         md_files = list(folder_path.glob("*.md"))
         if md_files:
             with open(md_files[0], 'r', encoding='utf-8') as f:
@@ -195,14 +260,14 @@ class PipelineV5Enhanced:
         
         return info
     
-    async def _enrich_with_gpu(self, raw_content: str, sector: str) -> ExtractedMetrics:
-        """GPU-accelerated data enrichment"""
+    async def _enrich_with_gpu(self, raw_content: str, sector: str) -> Optional[ExtractedMetrics]:
+        """GPU-accelerated data enrichment (None if it failed)"""
         try:
             metrics = await self.enrichment_engine.extract_all_metrics(raw_content, sector)
             return metrics
         except Exception as e:
             self.log(f"Enrichment error: {e}", "WARN")
-            return ExtractedMetrics()
+            return None
     
     def _prepare_enhanced_teaser_data(self, 
                                       company_data: CompanyData,
@@ -213,7 +278,7 @@ class PipelineV5Enhanced:
                                       basic_info: Dict,
                                       company_folder: str = "") -> EnhancedTeaserData:
         """Prepare data structure for enhanced PPT generation"""
-        from src.presentation.enhanced_kelp_generator import PROJECT_CODENAMES
+        from src.presentation.enhanced_kelp_generator import EnhancedTeaserData, PROJECT_CODENAMES
         
         data = EnhancedTeaserData()
         
@@ -456,201 +521,385 @@ class PipelineV5Enhanced:
         
         return data
     
-    async def process_company(self, company_folder: str) -> PipelineResult:
-        """Process a single company through the enhanced pipeline"""
-        start_time = time.time()
-        company_name = company_folder.split('-')[-1] if '-' in company_folder else company_folder
+    # ========================================================================
+    # PIPELINE STAGES
+    # ========================================================================
+    
+    def _build_stage_graph(self) -> StageGraph:
+        """
+        Declare the per-company pipeline as a stage graph.
         
-        print(f"\n{'='*60}")
-        print(f"📦 Processing: {company_name.upper()}")
-        print(f"{'='*60}")
+        Enrichment, web research and image fetching depend only on the
+        classified sector and raw markdown, so they run concurrently; PPT
+        rendering waits for both the teaser data and the images.
+        
+        The slow network/LLM stages are checkpointed, so a resumed run
+        (--resume) only repeats the cheap parsing and the rendering.
+        """
+        return StageGraph([
+            Stage("load", self._stage_load,
+                  inputs=["company_folder"],
+                  outputs=["company_data", "raw_content"], blocking=True),
+            Stage("classify", self._stage_classify,
+                  inputs=["company_data"],
+                  outputs=["sector", "sub_sector", "confidence"]),
+            Stage("basic_info", self._stage_basic_info,
+                  inputs=["raw_content", "company_data"],
+                  outputs=["basic_info"]),
+            Stage("enrich", self._stage_enrich,
+                  inputs=["raw_content", "sector"],
+                  outputs=["enriched_metrics"], checkpoint=True),
+            Stage("research", self._stage_research,
+                  inputs=["sector", "sub_sector", "raw_content", "company_name"],
+                  outputs=["market_research"], checkpoint=True),
+            Stage("images", self._stage_images,
+                  inputs=["sector"],
+                  outputs=["slide_images"], blocking=True, checkpoint=True),
+            Stage("content", self._stage_content,
+                  inputs=["raw_content", "sector", "enriched_metrics", "market_research"],
+                  outputs=["generated_content"], checkpoint=True),
+            Stage("teaser_data", self._stage_teaser_data,
+                  inputs=["company_data", "sector", "sub_sector", "enriched_metrics",
+                          "generated_content", "basic_info", "company_folder"],
+                  outputs=["teaser_data"]),
+            Stage("render", self._stage_render,
+                  inputs=["teaser_data", "slide_images", "sector", "sub_sector",
+                          "company_folder"],
+                  outputs=["ppt_path"], blocking=True),
+            Stage("citations", self._stage_citations,
+                  inputs=["teaser_data", "company_name", "sector", "company_folder"],
+                  outputs=["citation_path"], blocking=True),
+        ])
+    
+    def _stage_load(self, company_folder: str) -> Tuple[CompanyData, str]:
+        """Step 1: Load parsed company data and the raw markdown"""
+        self.log("Loading company data...", "STEP")
+        company_data = load_company_data(company_folder, self.data_dir)
+        raw_content = self._read_raw_markdown(company_folder)
+        
+        if not company_data or not raw_content:
+            raise ValueError(f"Could not load data for {company_folder}")
         
+        self.log(f"Loaded {len(raw_content):,} characters", "SUCCESS")
+        return company_data, raw_content
+    
+    def _stage_classify(self, company_data: CompanyData) -> Tuple[str, str, float]:
+        """Step 2: Classify sector"""
+        self.log("Classifying sector...", "STEP")
+        classification_result = classify_company(company_data)
+        if isinstance(classification_result, tuple):
+            classification = classification_result[0]
+        else:
+            classification = classification_result
+        sector = classification.sector_name
+        sub_sector = classification.sector_key
+        confidence = classification.confidence
+        
+        self.log(f"Sector: {sector} / {sub_sector} (confidence: {confidence:.0%})", "SUCCESS")
+        return sector, sub_sector, confidence
+    
+    def _stage_basic_info(self, raw_content: str, company_data: CompanyData) -> Dict:
+        """Step 3: Extract basic info"""
+        self.log("Extracting basic information...", "STEP")
+        basic_info = self._extract_basic_info(raw_content, company_data)
+        self.log(f"Found {len(basic_info['products'])} products, {len(basic_info['clients'])} clients", "SUCCESS")
+        return basic_info
+    
+    async def _stage_enrich(self, raw_content: str, sector: str) -> ExtractedMetrics:
+        """Step 4: GPU data enrichment"""
+        self.log("Extracting financial data with GPU...", "GPU")
+        enriched_metrics = await self._enrich_with_gpu(raw_content, sector)
+        if enriched_metrics is None:
+            # Downstream stages get empty metrics; a resume retries enrichment
+            from src.content_generation.data_enrichment_engine import ExtractedMetrics
+            return Fallback(ExtractedMetrics())
+        
+        if enriched_metrics.revenue_latest or enriched_metrics.ebitda_margin:
+            rev_str = f"₹{enriched_metrics.revenue_latest:.0f}Cr" if enriched_metrics.revenue_latest else "N/A"
+            ebitda_str = f"{enriched_metrics.ebitda_margin:.1f}%" if enriched_metrics.ebitda_margin else "N/A"
+            self.log(f"Revenue: {rev_str}, EBITDA: {ebitda_str}", "SUCCESS")
+        else:
+            self.log("Limited financial data found", "WARN")
+        return enriched_metrics
+    
+    async def _stage_research(self, sector: str, sub_sector: str,
+                              raw_content: str, company_name: str) -> Optional[Any]:
+        """Step 4.5: Deep web research for market intelligence (Gemini-style)"""
+        if not self.web_research:
+            return None
+        
+        self.log("Deep web research for market intelligence...", "GPU")
         try:
-            # Step 1: Load Company Data
-            self.log("Loading company data...", "STEP")
-            company_data = load_company_data(company_folder)
-            raw_content = self._read_raw_markdown(company_folder)
-            
-            if not company_data or not raw_content:
-                raise ValueError(f"Could not load data for {company_folder}")
-            
-            self.log(f"Loaded {len(raw_content):,} characters", "SUCCESS")
-            
-            # Step 2: Classify Sector
-            self.log("Classifying sector...", "STEP")
-            classification_result = classify_company(company_data)
-            if isinstance(classification_result, tuple):
-                classification = classification_result[0]
-            else:
-                classification = classification_result
-            sector = classification.sector_name
-            sub_sector = classification.sector_key
-            confidence = classification.confidence
-            
-            self.log(f"Sector: {sector} / {sub_sector} (confidence: {confidence:.0%})", "SUCCESS")
-            
-            # Step 3: Extract Basic Info
-            self.log("Extracting basic information...", "STEP")
-            basic_info = self._extract_basic_info(raw_content, company_data)
-            self.log(f"Found {len(basic_info['products'])} products, {len(basic_info['clients'])} clients", "SUCCESS")
-            
-            # Step 4: GPU Data Enrichment
-            self.log("Extracting financial data with GPU...", "GPU")
-            enriched_metrics = await self._enrich_with_gpu(raw_content, sector)
-            
-            financial_extracted = bool(enriched_metrics.revenue_latest or enriched_metrics.ebitda_margin)
-            if financial_extracted:
-                rev_str = f"₹{enriched_metrics.revenue_latest:.0f}Cr" if enriched_metrics.revenue_latest else "N/A"
-                ebitda_str = f"{enriched_metrics.ebitda_margin:.1f}%" if enriched_metrics.ebitda_margin else "N/A"
-                self.log(f"Revenue: {rev_str}, EBITDA: {ebitda_str}", "SUCCESS")
+            # Use the new deep_research method if available. Its queries
+            # depend only on sector/sub-sector, so results are shared per
+            # sector: concurrent companies await one run, later ones hit disk.
+            if hasattr(self.web_research, 'deep_research'):
+                market_research = await self.research_cache.get_or_compute(
+                    sector, sub_sector,
+                    lambda: self.web_research.deep_research(
+                        sector=sector,
+                        sub_sector=sub_sector,
+                        company_context=pack_context(raw_content, "research", 500)
+                    ),
+                    should_cache=lambda intel: bool(
+                        intel and (intel.sources or intel.market_size)
+                    )
+                )
             else:
-                self.log("Limited financial data found", "WARN")
+                market_research = await self.web_research.comprehensive_research(
+                    sector=sector,
+                    sub_sector=sub_sector,
+                    company_name=company_name
+                )
             
-            # Step 4.5: Deep Web Research for Market Intelligence (Gemini-style)
-            market_research = None
-            if self.web_research:
-                self.log("Deep web research for market intelligence...", "GPU")
-                try:
-                    # Use the new deep_research method if available
-                    if hasattr(self.web_research, 'deep_research'):
-                        market_research = await self.web_research.deep_research(
-                            sector=sector,
-                            sub_sector=sub_sector,
-                            company_context=raw_content[:2000]
-                        )
-                    else:
-                        market_research = await self.web_research.comprehensive_research(
-                            sector=sector,
-                            sub_sector=sub_sector,
-                            company_name=company_name
-                        )
-                    
-                    if market_research:
-                        research_items = []
-                        if market_research.market_size:
-                            research_items.append(f"Market: {market_research.market_size}")
-                        if market_research.market_cagr:
-                            research_items.append(f"CAGR: {market_research.market_cagr}")
-                        # Handle both old and new attribute names
-                        trends = getattr(market_research, 'trends', None) or getattr(market_research, 'industry_trends', [])
-                        if trends:
-                            research_items.append(f"{len(trends)} trends")
-                        stats = getattr(market_research, 'statistics', {})
-                        if stats:
-                            research_items.append(f"{len(stats)} stats")
-                        if research_items:
-                            self.log(f"Research: {', '.join(research_items)}", "SUCCESS")
-                        else:
-                            self.log("Web research returned limited data", "WARN")
-                except Exception as e:
-                    self.log(f"Web research failed: {e}", "WARN")
-                    market_research = None
-            
-            # Step 5: GPU Content Generation (now enhanced with web research)
-            self.log("Generating investment content with GPU...", "GPU")
-            financials_dict = {
-                'revenue': enriched_metrics.revenue_latest,
-                'ebitda_margin': enriched_metrics.ebitda_margin,
-                'employees': enriched_metrics.employee_count,
-            }
-            
-            # Enhance with web research data if available (handles both old and new structures)
             if market_research:
-                financials_dict['market_size'] = market_research.market_size or ''
-                financials_dict['market_cagr'] = market_research.market_cagr or ''
-                
-                # Handle both attribute names (trends vs industry_trends)
+                research_items = []
+                if market_research.market_size:
+                    research_items.append(f"Market: {market_research.market_size}")
+                if market_research.market_cagr:
+                    research_items.append(f"CAGR: {market_research.market_cagr}")
+                # Handle both old and new attribute names
                 trends = getattr(market_research, 'trends', None) or getattr(market_research, 'industry_trends', [])
-                financials_dict['industry_trends'] = trends[:3] if trends else []
-                
-                # Key players and growth drivers
-                players = getattr(market_research, 'key_players', [])
-                financials_dict['key_players'] = players[:5] if players else []
-                
-                drivers = getattr(market_research, 'growth_drivers', [])
-                financials_dict['growth_drivers'] = drivers[:3] if drivers else []
-                
-                # Additional statistics from advanced research
+                if trends:
+                    research_items.append(f"{len(trends)} trends")
                 stats = getattr(market_research, 'statistics', {})
                 if stats:
-                    financials_dict['market_statistics'] = stats
-                
-                # Investment implications for thesis
-                implications = getattr(market_research, 'investment_implications', [])
-                if implications:
-                    financials_dict['investment_implications'] = implications[:3]
+                    research_items.append(f"{len(stats)} stats")
+                if research_items:
+                    self.log(f"Research: {', '.join(research_items)}", "SUCCESS")
+                else:
+                    self.log("Web research returned limited data", "WARN")
+            return market_research
+        except Exception as e:
+            self.log(f"Web research failed: {e}", "WARN")
+            # Content built without research is not checkpointed either
+            return Fallback(None)
+    
+    def _stage_images(self, sector: str) -> Dict[str, List[Path]]:
+        """Step 6.5: Fetch sector images (FREE - no API keys!)"""
+        slide_images = {}
+        if not self.image_fetcher:
+            self.log("Image fetcher not available - skipping images", "WARN")
+            return slide_images
+        
+        self.log("Fetching sector images (FREE web scraping)...", "GPU")
+        try:
+            images_dict = self.image_fetcher.fetch_all_for_company(sector)
             
-            generated_content = await generate_teaser_content_gpu(
-                raw_content, sector, financials_dict, self.verbose
-            )
+            # Convert to path list for each slide
+            for slide_key, fetched_images in images_dict.items():
+                slide_images[slide_key] = [img.path for img in fetched_images if img and img.path]
             
-            content_by_llm = bool(generated_content.get('business_overview'))
-            if content_by_llm:
-                self.log("Investment-grade content generated", "SUCCESS")
+            total_images = sum(len(imgs) for imgs in slide_images.values())
+            self.log(f"Fetched {total_images} sector-appropriate images", "SUCCESS")
+        except Exception as e:
+            self.log(f"Image fetching failed: {e}", "WARN")
+            return Fallback({})
+        return slide_images
+    
+    async def _stage_content(self, raw_content: str, sector: str,
+                             enriched_metrics: ExtractedMetrics,
+                             market_research: Optional[Any]) -> Dict:
+        """Step 5: GPU content generation (enhanced with web research)"""
+        self.log("Generating investment content with GPU...", "GPU")
+        financials_dict = {
+            'revenue': enriched_metrics.revenue_latest,
+            'ebitda_margin': enriched_metrics.ebitda_margin,
+            'employees': enriched_metrics.employee_count,
+        }
+        
+        # Enhance with web research data if available (handles both old and new structures)
+        if market_research:
+            financials_dict['market_size'] = market_research.market_size or ''
+            financials_dict['market_cagr'] = market_research.market_cagr or ''
             
-            # Step 6: Prepare Enhanced Teaser Data
-            self.log("Preparing enhanced teaser data...", "STEP")
-            teaser_data = self._prepare_enhanced_teaser_data(
-                company_data, sector, sub_sector,
-                enriched_metrics, generated_content, basic_info,
-                company_folder
-            )
+            # Handle both attribute names (trends vs industry_trends)
+            trends = getattr(market_research, 'trends', None) or getattr(market_research, 'industry_trends', [])
+            financials_dict['industry_trends'] = trends[:3] if trends else []
             
-            # Step 6.5: Fetch Sector Images (FREE - no API keys!)
-            slide_images = {}
-            if self.image_fetcher:
-                self.log("Fetching sector images (FREE web scraping)...", "GPU")
-                try:
-                    images_dict = self.image_fetcher.fetch_all_for_company(sector)
-                    
-                    # Convert to path list for each slide
-                    for slide_key, fetched_images in images_dict.items():
-                        slide_images[slide_key] = [img.path for img in fetched_images if img and img.path]
-                    
-                    total_images = sum(len(imgs) for imgs in slide_images.values())
-                    self.log(f"Fetched {total_images} sector-appropriate images", "SUCCESS")
-                    
-                    # Set images in generator
-                    self.ppt_generator.set_slide_images(slide_images)
-                    
-                except Exception as e:
-                    self.log(f"Image fetching failed: {e}", "WARN")
-                    slide_images = {}
-            else:
-                self.log("Image fetcher not available - skipping images", "WARN")
+            # Key players and growth drivers
+            players = getattr(market_research, 'key_players', [])
+            financials_dict['key_players'] = players[:5] if players else []
             
-            # Step 7: Generate Enhanced PPT
-            self.log("Generating enhanced PPT with dense layouts...", "PPT")
-            ppt_path = self.ppt_generator.generate(
-                teaser_data, 
-                f"{sector}_{sub_sector}"
-            )
+            drivers = getattr(market_research, 'growth_drivers', [])
+            financials_dict['growth_drivers'] = drivers[:3] if drivers else []
+            
+            # Additional statistics from advanced research
+            stats = getattr(market_research, 'statistics', {})
+            if stats:
+                financials_dict['market_statistics'] = stats
             
-            # Step 8: Generate Citations
-            self.log("Generating citation document...", "STEP")
-            source_file = str(COMPANY_DATA_DIR / company_folder)
-            slide_content = {
-                'slide1': {
-                    'company_description': teaser_data.business_bullets[0] if teaser_data.business_bullets else '',
-                    'sections': {
-                        'products': teaser_data.product_portfolio,
-                        'customers': teaser_data.key_customers,
-                        'certifications': teaser_data.certifications,
-                    }
-                },
-                'slide2': {
-                    'metrics': list(teaser_data.key_metrics_headline.values()) if teaser_data.key_metrics_headline else [],
-                },
-                'slide3': {
-                    'highlights': [h.get('title', '') for h in teaser_data.investment_highlights] if teaser_data.investment_highlights else [],
+            # Investment implications for thesis
+            implications = getattr(market_research, 'investment_implications', [])
+            if implications:
+                financials_dict['investment_implications'] = implications[:3]
+        
+        from src.content_generation.investment_content_generator import generate_teaser_content_gpu
+        
+        generated_content = await generate_teaser_content_gpu(
+            raw_content, sector, financials_dict, self.verbose,
+            generator=self.content_generator,
+            deadline=PIPELINE_CONFIG.content_deadline or None
+        )
+        
+        if generated_content.get('business_overview'):
+            self.log("Investment-grade content generated", "SUCCESS")
+        if generated_content.get('fallback_sections'):
+            # Template/default sections: used now, regenerated on resume
+            return Fallback(generated_content)
+        return generated_content
+    
+    def _stage_teaser_data(self, company_data: CompanyData, sector: str, sub_sector: str,
+                           enriched_metrics: ExtractedMetrics, generated_content: Dict,
+                           basic_info: Dict, company_folder: str) -> EnhancedTeaserData:
+        """Step 6: Prepare enhanced teaser data"""
+        self.log("Preparing enhanced teaser data...", "STEP")
+        return self._prepare_enhanced_teaser_data(
+            company_data, sector, sub_sector,
+            enriched_metrics, generated_content, basic_info,
+            company_folder
+        )
+    
+    def _stage_render(self, teaser_data: EnhancedTeaserData,
+                      slide_images: Dict[str, List[Path]],
+                      sector: str, sub_sector: str, company_folder: str) -> Path:
+        """Step 7: Generate enhanced PPT with a company-private generator"""
+        self.log("Generating enhanced PPT with dense layouts...", "PPT")
+        from src.presentation.enhanced_kelp_generator import EnhancedKelpGenerator
+        
+        ppt_generator = EnhancedKelpGenerator(self.job_dir(company_folder) or self.output_dir)
+        ppt_generator.set_slide_images(slide_images)
+        return ppt_generator.generate(
+            teaser_data, 
+            f"{sector}_{sub_sector}"
+        )
+    
+    def _stage_citations(self, teaser_data: EnhancedTeaserData, company_name: str,
+                         sector: str, company_folder: str) -> str:
+        """Step 8: Generate citation document"""
+        self.log("Generating citation document...", "STEP")
+        source_file = str(self.data_dir / company_folder)
+        slide_content = {
+            'slide1': {
+                'company_description': teaser_data.business_bullets[0] if teaser_data.business_bullets else '',
+                'sections': {
+                    'products': teaser_data.product_portfolio,
+                    'customers': teaser_data.key_customers,
+                    'certifications': teaser_data.certifications,
                 }
+            },
+            'slide2': {
+                'metrics': list(teaser_data.key_metrics_headline.values()) if teaser_data.key_metrics_headline else [],
+            },
+            'slide3': {
+                'highlights': [h.get('title', '') for h in teaser_data.investment_highlights] if teaser_data.investment_highlights else [],
             }
-            citation_path = generate_citations_from_content(
-                company_name,
-                sector,
-                source_file,
-                slide_content
-            )
+        }
+        from src.citation import generate_citations_from_content
+        
+        return generate_citations_from_content(
+            company_name,
+            sector,
+            source_file,
+            slide_content,
+            output_dir=self.job_dir(company_folder)
+        )
+    
+    async def process_company(self, company_folder: str,
+                              close_sessions: bool = True,
+                              resume: bool = False) -> PipelineResult:
+        """
+        Process a single company through the enhanced pipeline.
+        
+        Stages run via the stage graph, so independent steps overlap and
+        per-company wall time follows the critical path. Each call renders
+        with its own EnhancedKelpGenerator so that slide images and
+        presentation state never leak between companies that are processed
+        concurrently by process_all.
+        
+        Every stage, LLM call and HTTP request emits a trace span. When no
+        tracer is active (a standalone call rather than process_all), the
+        company gets its own Chrome trace written next to the results.
+        
+        Args:
+            company_folder: Folder name under the pipeline's data_dir.
+            close_sessions: Close the shared HTTP session when done. Batch
+                runs pass False and close it once after all companies finish.
+            resume: Restore checkpointed stage outputs from a previous run of
+                the same inputs instead of recomputing them.
+        """
+        company_name = company_folder.split('-')[-1] if '-' in company_folder else company_folder
+        
+        owns_tracer = current_tracer() is None
+        tracer = current_tracer() or Tracer(f"pipeline_v5:{company_name}")
+        with activate(tracer), lane(company_name):
+            with span("process_company", "company", folder=company_folder):
+                try:
+                    result = await self._process_company(company_folder, company_name, resume)
+                finally:
+                    # Release pooled connections
+                    if close_sessions:
+                        await self.close_http()
+        
+        result.stage_timings = tracer.stage_timings(company_name)
+        result.llm_usage = llm_usage(tracer, company_name)
+        if owns_tracer:
+            trace_path = self._write_trace(tracer, company_name, self.job_dir(company_folder))
+            self.log(f"Trace written: {trace_path.name}", "INFO")
+        return result
+    
+    def _write_trace(self, tracer: Tracer, label: str = "",
+                     directory: Optional[Path] = None) -> Path:
+        """Write a Chrome-trace JSON next to the processing results"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = f"_{label}" if label else ""
+        return tracer.write((directory or self.output_dir) / f"trace{suffix}_{timestamp}.json")
+    
+    def job_dir(self, company_folder: str) -> Optional[Path]:
+        """Private artifact directory for a company (None unless job_dirs)"""
+        if not self.job_dirs:
+            return None
+        path = self.output_dir / "jobs" / company_folder
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+    
+    def discard_checkpoints(self, company_folder: str) -> None:
+        """Delete a company's stage checkpoints"""
+        shutil.rmtree(self.output_dir / "checkpoints" / company_folder, ignore_errors=True)
+    
+    def _checkpoint_store(self, company_folder: str, resume: bool) -> CheckpointStore:
+        """Checkpoint directory for a company, keyed on its markdown and config"""
+        fingerprint = {
+            "inputs": hash_inputs(self.data_dir / company_folder),
+            "config": config_fingerprint(),
+        }
+        return CheckpointStore(self.output_dir / "checkpoints" / company_folder,
+                               fingerprint, resume=resume)
+    
+    async def _process_company(self, company_folder: str, company_name: str,
+                               resume: bool = False) -> PipelineResult:
+        """Run the stage graph for one company and build its result"""
+        start_time = time.time()
+        
+        print(f"\n{'='*60}")
+        print(f"📦 Processing: {company_name.upper()}")
+        print(f"{'='*60}")
+        
+        try:
+            await self.open_http()
+            checkpoints = self._checkpoint_store(company_folder, resume)
+            values = await self.stage_graph.run({
+                "company_folder": company_folder,
+                "company_name": company_name,
+            }, checkpoints=checkpoints)
+            if checkpoints.restored:
+                self.log(f"Resumed from checkpoint: {', '.join(checkpoints.restored)}", "INFO")
+            
+            teaser_data = values["teaser_data"]
+            enriched_metrics = values["enriched_metrics"]
+            slide_images = values["slide_images"]
+            ppt_path = values["ppt_path"]
+            citation_path = values["citation_path"]
             
             processing_time = time.time() - start_time
             
@@ -659,16 +908,17 @@ class PipelineV5Enhanced:
             
             result = PipelineResult(
                 company_name=company_name,
-                sector=sector,
-                sub_sector=sub_sector,
+                sector=values["sector"],
+                sub_sector=values["sub_sector"],
                 codename=teaser_data.codename,
-                confidence=confidence,
+                confidence=values["confidence"],
                 ppt_path=str(ppt_path),
                 citation_path=str(citation_path) if citation_path else "",
                 processing_time=processing_time,
                 success=True,
-                financial_data_extracted=financial_extracted,
-                content_generated_by_llm=content_by_llm,
+                financial_data_extracted=bool(enriched_metrics.revenue_latest or enriched_metrics.ebitda_margin),
+                content_generated_by_llm=bool(values["generated_content"].get('business_overview')),
+                content_fallback_sections=values["generated_content"].get('fallback_sections', []),
                 images_added=images_count
             )
             
@@ -677,13 +927,6 @@ class PipelineV5Enhanced:
             print(f"   🖼️ Images: {images_count}")
             print(f"   ⏱ Time: {processing_time:.1f}s")
             
-            # Cleanup web research session
-            if self.web_research:
-                try:
-                    await self.web_research.close()
-                except:
-                    pass
-            
             return result
             
         except Exception as e:
@@ -706,64 +949,207 @@ class PipelineV5Enhanced:
                 error=error_msg
             )
     
-    async def process_all(self) -> List[PipelineResult]:
-        """Process all companies in data directory"""
+    async def open_http(self) -> None:
+        """Open the shared HTTP session and lend it to the research engine"""
+        if self.http_client is None:
+            from src.web_scraping.http_pool import SharedHTTPClient
+            self.http_client = SharedHTTPClient()
+        session = await self.http_client.open()
+        if self.web_research and hasattr(self.web_research, 'use_session'):
+            self.web_research.use_session(session)
+    
+    async def close_http(self) -> None:
+        """Close research sessions, the shared pool and Ollama clients, ignoring shutdown errors"""
+        try:
+            # Only engines that were actually created need closing
+            if self._engines.get("research"):
+                await self._engines["research"].close()
+            if self.http_client is not None:
+                await self.http_client.close()
+            from src.content_generation.ollama_client import close_ollama_clients
+            await close_ollama_clients()
+        except Exception:
+            pass
+    
+    async def process_all(self, workers: Optional[int] = None,
+                          force: bool = False,
+                          resume: bool = False,
+                          retain_results: bool = True) -> List[PipelineResult]:
+        """
+        Process all companies in data directory.
+        
+        Companies run concurrently on the current event loop, at most
+        ``workers`` at a time, so batch wall time tracks the slowest shard
+        rather than the sum of every company.
+        
+        Runs are incremental: a company whose markdown, config and code
+        fingerprint matches run_manifest.json, and whose deck and citations
+        still exist, reuses its previous result instead of regenerating.
+        
+        Each result is appended to processing_results.jsonl (and flushed)
+        as soon as its company finishes, so a crash keeps the bookkeeping
+        for everything already done and the file can be tailed live.
+        
+        Args:
+            workers: Maximum companies in flight. Defaults to
+                PIPELINE_CONFIG.max_workers.
+            force: Regenerate every company regardless of the manifest.
+            resume: Reuse checkpointed stage outputs for companies that
+                do need regenerating (see process_company).
+            retain_results: Keep every PipelineResult in memory and return
+                them. Pass False for very large batches; results then live
+                only in the JSONL sink and memory stays constant.
+        
+        Returns:
+            One PipelineResult per company folder, in folder order (empty
+            when retain_results is False).
+        """
+        workers = max(1, workers or PIPELINE_CONFIG.max_workers)
+        
         print("=" * 70)
         print("PIPELINE V5 - ENHANCED DATA-DENSE LAYOUTS")
         print("=" * 70)
-        print(f"📂 Data: {COMPANY_DATA_DIR}")
+        print(f"📂 Data: {self.data_dir}")
         print(f"📂 Output: {self.output_dir}")
         
         # Find all company folders
-        company_folders = [f.name for f in COMPANY_DATA_DIR.iterdir() if f.is_dir()]
-        print(f"\n📋 Found {len(company_folders)} companies to process")
+        company_folders = sorted(f.name for f in self.data_dir.iterdir() if f.is_dir())
+        print(f"\n📋 Found {len(company_folders)} companies to process ({workers} at a time)")
         
-        self.results = []
-        for folder in company_folders:
-            result = await self.process_company(folder)
-            self.results.append(result)
+        manifest = RunManifest.load(self.output_dir / "run_manifest.json")
+        jsonl_path = self.output_dir / "processing_results.jsonl"
+        summary = ResultsSummary()
+        results: List[Optional[PipelineResult]] = [None] * len(company_folders) if retain_results else []
         
-        # Summary
-        success_count = sum(1 for r in self.results if r.success)
-        failed_count = len(self.results) - success_count
+        async def run_one(folder: str) -> PipelineResult:
+            fingerprint = manifest.fingerprint(self.data_dir / folder)
+            if not force:
+                previous = manifest.lookup(folder, fingerprint)
+                if previous is not None:
+                    self.log(f"{folder}: unchanged, reusing {Path(previous['ppt_path']).name}", "INFO")
+                    return PipelineResult(**{**previous, "processing_time": 0.0,
+                                             "stage_timings": {}, "llm_usage": {},
+                                             "cached": True})
+                self.log(f"{folder}: changed ({', '.join(manifest.changes(folder, fingerprint))})", "INFO")
+            
+            # Loaded once, before the first company that needs generation
+            await residency.pin()
+            result = await self.process_company(folder, close_sessions=False, resume=resume)
+            # Template or default sections (deadline missed, LLM down or failing)
+            # are retried by the next run
+            if result.success and not result.content_fallback_sections:
+                manifest.record(folder, fingerprint, asdict(result))
+                manifest.save()
+            return result
+        
+        # A fixed pool of workers pulls folders from a shared iterator, so
+        # the number of live tasks is bounded by ``workers`` not batch size
+        pending = iter(enumerate(company_folders))
+        
+        async def worker(sink: ResultsSink, trace_file: TraceFile) -> None:
+            for index, folder in pending:
+                result = await run_one(folder)
+                record = {**self._result_record(result),
+                          "finished": datetime.now().isoformat()}
+                sink.write(record)
+                summary.add(record)
+                if retain_results:
+                    results[index] = result
+                # The result holds its timings and usage: stream the company's
+                # spans to disk and drop them, so memory stays flat
+                events = tracer.drain(result.company_name)
+                usage_totals.add(events)
+                trace_file.write(events)
+        
+        tracer = Tracer("pipeline_v5")
+        usage_totals = UsageTotals()
+        trace_path = self.output_dir / f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        residency = get_model_residency()
+        try:
+            with activate(tracer), ResultsSink(jsonl_path) as sink, \
+                    TraceFile(trace_path, tracer) as trace_file:
+                try:
+                    await asyncio.gather(*(worker(sink, trace_file) for _ in range(workers)))
+                finally:
+                    await residency.release()
+                    residency.release_vision()
+                    await self.close_http()
+        finally:
+            # Spans outside company lanes (model residency, stragglers)
+            usage_totals.add(tracer.spans(GENERATE_SPAN))
         
+        self.results = [r for r in results if r is not None]
+        
+        # Summary
         print("\n" + "=" * 70)
         print("PIPELINE COMPLETE - SUMMARY")
         print("=" * 70)
         
         for r in self.results:
-            status = "✅" if r.success else "❌"
+            status = "♻️" if r.cached else ("✅" if r.success else "❌")
             print(f"{status} {r.company_name}: Project {r.codename} ({r.sector})")
         
-        print(f"\n✅ Successful: {success_count}")
-        print(f"❌ Failed: {failed_count}")
+        print(f"\n✅ Successful: {summary.successful} ({summary.cached} unchanged, reused)")
+        print(f"❌ Failed: {summary.failed}")
         
-        if success_count > 0:
+        if summary.successful > 0:
             print(f"\n📂 Output location: {self.output_dir}")
+        print(f"🧾 Results: {jsonl_path.name}")
+        print(f"🧭 Trace: {trace_path.name} (open in ui.perfetto.dev)")
+        cache_stats = self.research_cache.stats()
+        print(f"🔍 Sector research: {cache_stats['misses']} computed, "
+              f"{cache_stats['hits']} from cache, {cache_stats['coalesced']} shared in-flight")
+        from src.content_generation.llm_cache import get_llm_cache
+        llm_cache = get_llm_cache()
+        llm_stats = llm_cache.stats()
+        if llm_cache.enabled:
+            print(f"🗄️  LLM responses: {llm_stats['hits']} from cache, {llm_stats['misses']} generated, "
+                  f"{llm_stats['evictions']} evicted")
+        run_usage = usage_totals.summary()
+        totals = run_usage["totals"]
+        if totals["generated"]:
+            print(f"🧮 LLM tokens: {totals['prompt_tokens']} prompt + {totals['completion_tokens']} "
+                  f"generated in {totals['eval_s'] + totals['prompt_eval_s']:.1f}s GPU "
+                  f"({totals['tokens_per_sec']} tok/s)")
+            for name, usage in list(run_usage["prompts"].items())[:3]:
+                print(f"   {name}: {usage['generated']} calls, {usage['completion_tokens']} tokens, "
+                      f"{usage['eval_s'] + usage['prompt_eval_s']:.1f}s")
         
-        # Save results
+        # Save run summary; per-company records live in the JSONL sink
         results_path = self.output_dir / "processing_results.json"
         results_data = {
             "timestamp": datetime.now().isoformat(),
-            "total": len(self.results),
-            "successful": success_count,
-            "failed": failed_count,
-            "results": [
-                {
-                    "company": r.company_name,
-                    "sector": r.sector,
-                    "codename": r.codename,
-                    "ppt_path": r.ppt_path,
-                    "success": r.success,
-                    "time": r.processing_time
-                }
-                for r in self.results
-            ]
+            **summary.as_dict(),
+            "results_path": str(jsonl_path),
+            "trace_path": str(trace_path),
+            "llm_cache": llm_stats,
+            "llm_usage": run_usage,
+            "model_residency": residency.stats(),
         }
+        if retain_results:
+            results_data["results"] = [self._result_record(r) for r in self.results]
         with open(results_path, 'w') as f:
             json.dump(results_data, f, indent=2)
         
         return self.results
+    
+    @staticmethod
+    def _result_record(r: PipelineResult) -> Dict[str, Any]:
+        """Flat JSON record for one company result"""
+        return {
+            "company": r.company_name,
+            "sector": r.sector,
+            "codename": r.codename,
+            "ppt_path": r.ppt_path,
+            "success": r.success,
+            "cached": r.cached,
+            "time": r.processing_time,
+            "stages": r.stage_timings,
+            "content_fallback": r.content_fallback_sections,
+            "llm": r.llm_usage.get("totals"),
+            "llm_prompts": r.llm_usage.get("prompts"),
+            "error": r.error
+        }
 
 
 async def main():
@@ -773,20 +1159,60 @@ async def main():
     parser = argparse.ArgumentParser(description="Pipeline V5 - Enhanced PPT Generation")
     parser.add_argument("--company", type=str, help="Process specific company folder")
     parser.add_argument("--quiet", action="store_true", help="Minimal output")
+    parser.add_argument("--workers", type=int, default=PIPELINE_CONFIG.max_workers,
+                        help="Companies to process concurrently (default: %(default)s)")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate every company, ignoring the run manifest")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse checkpointed research, images and LLM content")
+    parser.add_argument("--no-retain-results", action="store_true",
+                        help="Keep results only in the JSONL sink (constant memory)")
+    parser.add_argument("--one-shot", action="store_true",
+                        help="Generate all teaser sections in one structured LLM call")
+    parser.add_argument("--context-sessions", action="store_true",
+                        help="Prefill company data once and reuse it for every section "
+                             "(replaces per-section context packing)")
+    parser.add_argument("--no-llm-cache", action="store_true",
+                        help="Bypass the persistent LLM response cache")
+    parser.add_argument("--content-deadline", type=float, default=PIPELINE_CONFIG.content_deadline,
+                        help="Seconds per company for LLM sections before template "
+                             "content is used; 0 waits (default: %(default)s)")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a long-lived service with warm engines (see pipeline_service.py)")
+    parser.add_argument("--host", default="127.0.0.1", help="Service bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Service port")
+    parser.add_argument("--socket", help="Service Unix socket path (instead of TCP)")
     args = parser.parse_args()
     
+    if args.one_shot:
+        # Part of config_fingerprint, so manifest/checkpoints are not reused across modes
+        LLM_CONFIG.one_shot_content = True
+    if args.context_sessions:
+        LLM_CONFIG.context_sessions = True  # Also part of config_fingerprint
+    if args.no_llm_cache:
+        from src.content_generation.llm_cache import get_llm_cache
+        get_llm_cache().enabled = False
+    PIPELINE_CONFIG.content_deadline = args.content_deadline
+    
+    if args.serve:
+        from pipeline_service import serve
+        await serve(args.host, args.port, args.socket, args.workers, not args.quiet)
+        return
+    
     pipeline = PipelineV5Enhanced(verbose=not args.quiet)
     
     if args.company:
         # Find matching folder
-        folders = [f.name for f in COMPANY_DATA_DIR.iterdir() if f.is_dir()]
+        folders = [f.name for f in pipeline.data_dir.iterdir() if f.is_dir()]
         matching = [f for f in folders if args.company.lower() in f.lower()]
         if matching:
-            await pipeline.process_company(matching[0])
+            await pipeline.process_company(matching[0], resume=args.resume)
         else:
             print(f"❌ No company folder matching '{args.company}' found")
     else:
-        await pipeline.process_all()
+        await pipeline.process_all(workers=args.workers, force=args.force,
+                                   resume=args.resume,
+                                   retain_results=not args.no_retain_results)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Import-Time Budget Check
+========================
+
+Guards the lazy-import architecture: importing the pipeline (what
+`python main.py --help` pays before doing anything) must stay cheap and
+must not pull in heavy optional subsystems.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+then fails if
+- the cumulative import time exceeds the budget, or
+- any module from HEAVY_MODULES was imported.
+
+Usage:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 300 --top 15
+    python scripts/check_import_time.py --module main
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Subsystems that must only load when their stage first runs
+HEAVY_MODULES = {
+    "aiohttp", "bs4", "ddgs", "duckduckgo_search", "icrawler", "requests",
+    "PIL", "pptx", "docx", "torch", "transformers", "diffusers", "lxml",
+}
+
+DEFAULT_BUDGET_MS = 500.0
+
+
+def measure(module: str) -> List[Tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) for every import, in order"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"❌ import {module} failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check pipeline import time against a budget")
+    parser.add_argument("--module", default="pipeline_v5_enhanced", help="Module to import")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum cumulative import time (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    rows = measure(args.module)
+    target = next((r for r in rows if r[0].strip() == args.module), None)
+    total_ms = (target[2] if target else sum(r[1] for r in rows)) / 1000
+
+    # Top-level package of every imported module
+    imported: Dict[str, str] = {}
+    for name, _, _ in rows:
+        module = name.strip()
+        imported.setdefault(module.split(".")[0], module)
+    heavy = sorted(set(imported) & HEAVY_MODULES)
+
+    print(f"📦 import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"   Slowest {args.top} by self time:")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"   {self_us / 1000:8.1f} ms  {cumulative_us / 1000:8.1f} ms cum  {name.strip()}")
+
+    ok = True
+    if total_ms > args.budget_ms:
+        print(f"❌ Import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        ok = False
+    if heavy:
+        print(f"❌ Heavy modules imported eagerly: {', '.join(heavy)}")
+        ok = False
+    if ok:
+        print("✅ Import budget OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
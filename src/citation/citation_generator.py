@@ -243,8 +243,8 @@ class CitationDocumentGenerator:
         run.font.size = Pt(9)
         run.font.color.rgb = RGBColor(*BRANDING.text_light_grey)
     
-    def generate(self, output_filename: str = None) -> str:
-        """Generate the citation document"""
+    def generate(self, output_filename: str = None, output_dir: Optional[Path] = None) -> str:
+        """Generate the citation document (in CITATIONS_OUTPUT_DIR unless output_dir is given)"""
         self._add_header()
         
         # Summary statistics
@@ -281,15 +281,17 @@ class CitationDocumentGenerator:
             output_filename = f"{safe_name}_Citations.docx"
         
         # Save
-        CITATIONS_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        output_path = CITATIONS_OUTPUT_DIR / output_filename
+        output_dir = Path(output_dir) if output_dir else CITATIONS_OUTPUT_DIR
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / output_filename
         self.doc.save(str(output_path))
         
         return str(output_path)
 
 
 def generate_citations_from_content(company_name: str, sector: str, source_file: str,
-                                   slide_content: Dict, image_citations: List[Dict] = None) -> str:
+                                   slide_content: Dict, image_citations: List[Dict] = None,
+                                   output_dir: Optional[Path] = None) -> str:
     """
     Generate citation document from slide content.
     
@@ -299,6 +301,7 @@ def generate_citations_from_content(company_name: str, sector: str, source_file:
         source_file: Path to source markdown file
         slide_content: Dict with 'slide1', 'slide2', 'slide3' content
         image_citations: List of image source citations
+        output_dir: Directory for the document (default CITATIONS_OUTPUT_DIR)
     
     Returns:
         Path to generated citation document
@@ -365,7 +368,7 @@ def generate_citations_from_content(company_name: str, sector: str, source_file:
     
     # Generate document
     generator = CitationDocumentGenerator(tracker.collection)
-    return generator.generate()
+    return generator.generate(output_dir=output_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,252 @@
+"""
+Adaptive Concurrency Limit
+==========================
+
+AIMD limiter for concurrent generate requests to one Ollama server.
+
+A fixed num_parallel is either too low (the GPU idles between requests)
+or too high (requests share the GPU, and each runs so slowly that total
+throughput drops). The best value depends on the model size and num_ctx.
+AdaptiveLimiter starts at LLM_CONFIG.num_parallel and adjusts it from
+what it measures:
+
+- each completed request reports the tokens it generated, its wall time
+  and how long it queued for a slot
+- after a window of completions, the limiter computes total throughput
+  (tokens/sec across the window) and compares it with a baseline: the
+  best throughput seen, decaying by limit_baseline_decay per window so
+  it follows the current model and load
+- callers queueing for a slot (median queue wait, or waiters left at the
+  end of the window) means demand exceeds the limit
+- with demand, throughput below baseline / latency_tolerance, or a drop
+  after the last increase, means requests are thrashing: multiplicative
+  decrease
+- with demand and throughput holding up: additive increase (+1)
+- a failed or timed-out request counts as congestion
+
+Per-request rate is deliberately not the signal: it falls whenever
+Ollama batches more requests together, even while total throughput
+rises. Callers report only real generations. Cache hits, coalesced
+calls and single-token prefills (ContextSession) stay out of the window.
+
+The current limit is exposed through stats() (client.limiter.stats(),
+the service /health endpoint) and on every "ollama.generate" trace span.
+"""
+
+import asyncio
+import statistics
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from config.settings import LLM_CONFIG
+
+
+class AdaptiveLimiter:
+    """
+    Async slot limiter whose limit moves with observed throughput.
+
+    Usage:
+        await limiter.acquire()
+        try:
+            ...
+        finally:
+            limiter.release()
+        limiter.record(tokens=120, seconds=2.4, queued=0.3)
+    """
+
+    def __init__(self, initial: Optional[int] = None, min_limit: Optional[int] = None,
+                 max_limit: Optional[int] = None, latency_tolerance: Optional[float] = None,
+                 backoff: Optional[float] = None, adaptive: Optional[bool] = None):
+        self.min_limit = max(1, min_limit or LLM_CONFIG.min_parallel)
+        self.max_limit = max(self.min_limit, max_limit or LLM_CONFIG.max_parallel)
+        initial = initial or LLM_CONFIG.num_parallel
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_tolerance = latency_tolerance or LLM_CONFIG.limit_latency_tolerance
+        self.backoff = backoff or LLM_CONFIG.limit_backoff
+        self.baseline_decay = LLM_CONFIG.limit_baseline_decay
+        self.adaptive = LLM_CONFIG.adaptive_parallel if adaptive is None else adaptive
+
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.baseline_throughput = 0.0  # Best recent total tokens/sec (decaying)
+        self.last_throughput = 0.0
+        self.last_queue_wait = 0.0
+
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._tokens = 0
+        self._latencies: List[float] = []
+        self._queue_waits: List[float] = []
+        self._window_start = 0.0
+        self._window_end = 0.0
+        self._saturated = False
+        self._just_increased = False
+        self._changed_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def reset(self) -> None:
+        """Forget waiters and slots from a finished event loop (keeps the limit)"""
+        self._waiters.clear()
+        self.in_flight = 0
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.current and not self._waiters:
+            self.in_flight += 1
+            return
+        self._saturated = True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as we were cancelled: pass it on
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.current:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.release()
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    def record(self, tokens: Optional[int], seconds: float, queued: float = 0.0) -> None:
+        """Report a completed generation (tokens generated, wall time, queue wait)"""
+        if not self.adaptive or not tokens or seconds <= 0:
+            return
+        now = time.perf_counter()
+        if not self._latencies:
+            # The window follows the previous one, unless the server sat idle in between
+            self._window_start = max(self._window_end, now - seconds)
+        self._tokens += tokens
+        self._latencies.append(seconds)
+        self._queue_waits.append(queued)
+        if len(self._latencies) >= max(2, self.current):
+            self._adjust(now)
+
+    def record_failure(self) -> None:
+        """A failed or timed-out request: back off straight away"""
+        if self.adaptive:
+            self._decrease()
+            self._end_window()
+
+    def _adjust(self, now: float) -> None:
+        throughput = self._tokens / max(now - self._window_start, 1e-6)
+        queue_wait = statistics.median(self._queue_waits)
+        # Callers waited for a slot: demand exceeds the limit
+        demand = (self._saturated or bool(self._waiters)
+                  or queue_wait > 0.01 * statistics.median(self._latencies))
+        self.baseline_throughput = max(throughput, self.baseline_throughput * self.baseline_decay)
+
+        thrashing = demand and throughput < self.baseline_throughput / self.latency_tolerance
+        # The step up made things worse overall: undo it
+        overshot = self._just_increased and throughput < self.last_throughput * 0.9
+        self._just_increased = False
+        if thrashing or overshot:
+            self._decrease()
+        elif demand and self.current < self.max_limit:
+            self.limit += 1
+            self.increases += 1
+            self._just_increased = True
+            self._changed_at = time.time()
+            self._wake()
+        self.last_throughput = throughput
+        self.last_queue_wait = queue_wait
+        self._window_end = now
+        self._end_window()
+
+    def _decrease(self) -> None:
+        limit = max(float(self.min_limit), self.limit * self.backoff)
+        if int(limit) < self.current:
+            self.decreases += 1
+            self._changed_at = time.time()
+        self.limit = limit
+
+    def _end_window(self) -> None:
+        self._tokens = 0
+        self._latencies = []
+        self._queue_waits = []
+        self._saturated = bool(self._waiters)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.current,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "tokens_per_sec": round(self.last_throughput, 1),
+            "baseline_tokens_per_sec": round(self.baseline_throughput, 1),
+            "queue_wait_ms": round(self.last_queue_wait * 1000, 1),
+            "since_change": round(time.time() - self._changed_at, 1),
+        }
+
+
+# ----------------------------------------------------------------------
+# Demo against a simulated GPU
+# ----------------------------------------------------------------------
+
+async def _demo(requests: int = 400, sweet_spot: int = 6) -> None:
+    """
+    Simulated server: batching slows each request a little, so total
+    throughput still rises up to `sweet_spot` concurrent requests. Past
+    that point it collapses (KV cache spills, thrashing).
+    """
+    limiter = AdaptiveLimiter(initial=2, max_limit=16, adaptive=True)
+    active = 0
+    done_tokens = 0
+    started = time.perf_counter()
+
+    async def request() -> None:
+        nonlocal active, done_tokens
+        queued = time.perf_counter()
+        async with limiter:
+            wait = time.perf_counter() - queued
+            active += 1
+            slowdown = (1 + 0.15 * active if active <= sweet_spot
+                        else (1 + 0.15 * sweet_spot) * (active / sweet_spot) ** 2)
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.01 * slowdown)
+            active -= 1
+            done_tokens += 20
+            limiter.record(20, time.perf_counter() - t0, wait)
+
+    print(f"🎛️  AIMD limiter vs simulated GPU (sweet spot {sweet_spot} concurrent)")
+    tasks = [asyncio.ensure_future(request()) for _ in range(requests)]
+    while not all(t.done() for t in tasks):
+        await asyncio.sleep(0.05)
+        s = limiter.stats()
+        print(f"   limit={s['limit']:2d} in_flight={s['in_flight']:2d} queued={s['queued']:3d} "
+              f"tok/s={s['tokens_per_sec']:7.1f}")
+    elapsed = time.perf_counter() - started
+    print(f"\n   {done_tokens / elapsed:.0f} tokens/sec overall; final {limiter.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_demo())
@@ -22,6 +22,10 @@ from urllib.parse import quote_plus, urlparse
 from bs4 import BeautifulSoup
 import time
 
+from src.content_generation.early_stop import JsonValueStop
+from src.content_generation.ollama_client import OllamaError, get_ollama_client
+from src.orchestration.tracing import span
+
 # Import new ddgs package for DuckDuckGo search
 try:
     from ddgs import DDGS
@@ -89,10 +93,13 @@ class AdvancedResearchEngine:
     5. Source attribution and citation
     """
     
-    def __init__(self, ollama_url: str = "http://localhost:11434"):
-        self.ollama_url = ollama_url
+    def __init__(self, ollama_url: Optional[str] = None):
+        self.llm = get_ollama_client(ollama_url)
+        self.ollama_url = self.llm.base_url
         self.model = "qwen2.5:7b"
         self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = True
+        self.timeout = aiohttp.ClientTimeout(total=30, connect=10)
         
         # Request headers to avoid blocking
         self.headers = {
@@ -107,21 +114,26 @@ class AdvancedResearchEngine:
         self._last_request_time = 0
         self._min_request_interval = 0.5  # seconds
         
+    def use_session(self, session: aiohttp.ClientSession) -> None:
+        """Borrow a shared pooled session; close() will leave it open"""
+        self.session = session
+        self._owns_session = False
+    
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session"""
         if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30, connect=10)
             connector = aiohttp.TCPConnector(limit=10, limit_per_host=3)
             self.session = aiohttp.ClientSession(
-                timeout=timeout, 
+                timeout=self.timeout, 
                 connector=connector,
                 headers=self.headers
             )
+            self._owns_session = True
         return self.session
     
     async def close(self):
-        """Close the HTTP session"""
-        if self.session and not self.session.closed:
+        """Close the HTTP session (borrowed sessions are left to their owner)"""
+        if self._owns_session and self.session and not self.session.closed:
             await self.session.close()
     
     async def _rate_limit(self):
@@ -146,8 +158,13 @@ class AdvancedResearchEngine:
             return results
         
         try:
-            # Use the ddgs package - runs synchronously but wrapped in async
-            ddgs_results = list(DDGS().text(query, max_results=num_results))
+            # The ddgs package is synchronous - run it in a worker thread so
+            # concurrent stages (image fetching, other companies) keep moving
+            with span("ddgs.text", "http", query=query) as trace:
+                ddgs_results = await asyncio.to_thread(
+                    lambda: list(DDGS().text(query, max_results=num_results))
+                )
+                trace["results"] = len(ddgs_results)
             
             for r in ddgs_results:
                 url = r.get('href', '')
@@ -178,63 +195,67 @@ class AdvancedResearchEngine:
         try:
             session = await self._get_session()
             
-            async with session.get(url, allow_redirects=True) as resp:
-                if resp.status != 200:
-                    return None
-                
-                content_type = resp.headers.get('content-type', '')
-                if 'text/html' not in content_type and 'text/plain' not in content_type:
-                    return None
-                
-                html = await resp.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Remove script, style, nav, footer, header elements
-                for tag in soup(['script', 'style', 'nav', 'footer', 'header', 
-                                'aside', 'iframe', 'noscript', 'form']):
-                    tag.decompose()
-                
-                # Get title
-                title = ""
-                title_tag = soup.find('title')
-                if title_tag:
-                    title = title_tag.get_text(strip=True)
-                
-                # Extract main content
-                # Try common content containers first
-                main_content = None
-                for selector in ['article', 'main', '.content', '.post-content', 
-                                '.article-body', '#content', '.entry-content']:
-                    main_content = soup.select_one(selector)
-                    if main_content:
-                        break
-                
-                if not main_content:
-                    main_content = soup.find('body')
-                
-                if not main_content:
-                    return None
-                
-                # Get text content
-                text = main_content.get_text(separator=' ', strip=True)
-                text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
-                text = text[:max_chars]
-                
-                # Extract statistics from the content
-                statistics = self._extract_statistics(text)
-                
-                fetch_time = time.time() - start_time
-                
-                return WebSource(
-                    url=url,
-                    title=title,
-                    domain=urlparse(url).netloc,
-                    content=text,
-                    snippet=text[:300] + "..." if len(text) > 300 else text,
-                    statistics=statistics,
-                    fetch_time=fetch_time
-                )
-                
+            with span("http.get", "http", domain=urlparse(url).netloc) as trace:
+                async with session.get(url, allow_redirects=True, headers=self.headers,
+                                       timeout=self.timeout) as resp:
+                    trace["status"] = resp.status
+                    if resp.status != 200:
+                        return None
+                    
+                    content_type = resp.headers.get('content-type', '')
+                    if 'text/html' not in content_type and 'text/plain' not in content_type:
+                        return None
+                    
+                    html = await resp.text()
+            
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            # Remove script, style, nav, footer, header elements
+            for tag in soup(['script', 'style', 'nav', 'footer', 'header', 
+                            'aside', 'iframe', 'noscript', 'form']):
+                tag.decompose()
+            
+            # Get title
+            title = ""
+            title_tag = soup.find('title')
+            if title_tag:
+                title = title_tag.get_text(strip=True)
+            
+            # Extract main content
+            # Try common content containers first
+            main_content = None
+            for selector in ['article', 'main', '.content', '.post-content', 
+                            '.article-body', '#content', '.entry-content']:
+                main_content = soup.select_one(selector)
+                if main_content:
+                    break
+            
+            if not main_content:
+                main_content = soup.find('body')
+            
+            if not main_content:
+                return None
+            
+            # Get text content
+            text = main_content.get_text(separator=' ', strip=True)
+            text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+            text = text[:max_chars]
+            
+            # Extract statistics from the content
+            statistics = self._extract_statistics(text)
+            
+            fetch_time = time.time() - start_time
+            
+            return WebSource(
+                url=url,
+                title=title,
+                domain=urlparse(url).netloc,
+                content=text,
+                snippet=text[:300] + "..." if len(text) > 300 else text,
+                statistics=statistics,
+                fetch_time=fetch_time
+            )
+            
         except asyncio.TimeoutError:
             print(f"  ⚠ Timeout fetching: {urlparse(url).netloc}")
         except Exception as e:
@@ -288,34 +309,21 @@ class AdvancedResearchEngine:
     # =========================================================================
     
     async def _call_llm(self, prompt: str, max_tokens: int = 1500, 
-                        temperature: float = 0.3) -> str:
+                        temperature: float = 0.3, stop_when=None, name: str = "") -> str:
         """Call local LLM with optimized parameters for factual extraction"""
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=90)
-            ) as session:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,  # Low for factual content
-                        "num_predict": max_tokens,
-                        "num_gpu": 99,
-                        "top_p": 0.9,
-                        "repeat_penalty": 1.15,
-                        "num_ctx": 4096,  # Larger context
-                    }
-                }
-                
-                async with session.post(
-                    f"{self.ollama_url}/api/generate", 
-                    json=payload
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return data.get("response", "").strip()
-        except Exception as e:
+            response = await self.llm.generate(
+                prompt,
+                engine="AdvancedResearchEngine",
+                prompt_name=name,
+                model=self.model,
+                temperature=temperature,  # Low for factual content
+                max_tokens=max_tokens,
+                options={"top_p": 0.9, "repeat_penalty": 1.15},
+                stop_when=stop_when
+            )
+            return response.strip()
+        except OllamaError as e:
             print(f"  ⚠ LLM call error: {e}")
         
         return ""
@@ -365,7 +373,8 @@ RULES:
 
 OUTPUT JSON:"""
 
-        response = await self._call_llm(prompt, max_tokens=1200, temperature=0.2)
+        response = await self._call_llm(prompt, max_tokens=1200, temperature=0.2,
+                                        stop_when=JsonValueStop("{"), name="synthesize_research")
         
         try:
             # Extract JSON from response
@@ -523,7 +532,8 @@ DATA:
 Write in professional investment banking style. Include specific numbers.
 SUMMARY:"""
 
-        return await self._call_llm(prompt, max_tokens=150, temperature=0.3)
+        return await self._call_llm(prompt, max_tokens=150, temperature=0.3,
+                                    name="executive_summary")
 
 
 # Convenience function for pipeline integration
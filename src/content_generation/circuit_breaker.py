@@ -0,0 +1,135 @@
+"""
+Circuit Breaker
+===============
+
+Fail fast while an Ollama server is down, and back off between retries.
+
+Engines turn any OllamaError into empty content, so a dead or flapping
+server used to cost every remaining company a full timeout per prompt.
+OllamaClient keeps one CircuitBreaker per server:
+
+- closed: requests flow; consecutive backend failures (connection
+  errors, timeouts, 5xx) are counted and a success resets the count
+- open: after failure_threshold consecutive failures every request
+  fails immediately with CircuitOpenError
+- half-open: once reset_timeout seconds have passed a single probe
+  request is let through; success closes the circuit, failure opens it
+  for another reset_timeout
+
+backoff_delay() gives the jittered exponential delays used between
+retries of transient errors.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config.settings import LLM_CONFIG
+
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def backoff_delay(attempt: int, base: Optional[float] = None,
+                  cap: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+    base = LLM_CONFIG.retry_backoff if base is None else base
+    cap = LLM_CONFIG.retry_backoff_max if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (thread-safe, shared by the
+    async and sync paths).
+
+    Usage:
+        if not breaker.allow():
+            raise CircuitOpenError(...)
+        try:
+            ...
+        except BackendFailure:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(self, failure_threshold: Optional[int] = None,
+                 reset_timeout: Optional[float] = None, name: str = ""):
+        self.failure_threshold = max(1, failure_threshold or LLM_CONFIG.breaker_failure_threshold)
+        self.reset_timeout = (LLM_CONFIG.breaker_reset_timeout
+                              if reset_timeout is None else reset_timeout)
+        self.name = name
+
+        self.state = CLOSED
+        self.failures = 0  # Consecutive
+        self.opened = 0  # Times the circuit has opened
+        self.rejected = 0  # Requests failed fast
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> float:
+        """Seconds until a half-open probe is allowed (0 when closed)"""
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.time())
+
+    def allow(self) -> bool:
+        """Whether a request may go out now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True  # This request is the probe
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"  ✓ Ollama {self.name} recovered - circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED
+                                           and self.failures >= self.failure_threshold):
+                if self.state == CLOSED:
+                    self.opened += 1
+                    print(f"  ⚠ Ollama {self.name}: {self.failures} consecutive failures - "
+                          f"circuit open for {self.reset_timeout:.0f}s")
+                self.state = OPEN
+                self._opened_at = time.time()
+                self._probing = False
+
+    def reset(self) -> None:
+        """Close the circuit from outside (e.g. a health probe saw the server come back)"""
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"  ✓ Ollama {self.name} reachable again - circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """The half-open probe ended without a verdict (e.g. cancelled)"""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after(), 1),
+        }
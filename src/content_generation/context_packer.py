@@ -0,0 +1,181 @@
+"""
+Context Packer
+==============
+
+Relevance-based prompt context instead of fixed-length truncation.
+
+Prompts used to embed raw_content[:4000] (or [:2000], or everything), so
+they paid for shareholder tables and board lists while sections such as
+Future Plan or Financials, further down the one-pager, were cut off.
+The packer splits the markdown into the sections found by
+MarkdownParser.extract_sections and scores each section title for the
+prompt's purpose. It then fills a token budget greedily, best sections
+first, and reassembles the chosen sections in document order.
+
+    context = pack_context(raw_markdown, "growth", token_budget=750)
+
+Purposes: overview, highlights, growth, expansion, enrichment, research,
+teaser (the union of the four section purposes).
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from src.data_ingestion.markdown_parser import MarkdownParser
+
+
+CHARS_PER_TOKEN = 4  # Rough average for English prose and tables
+DEFAULT_TOKEN_BUDGET = 1000
+MIN_PARTIAL_TOKENS = 80  # Below this, a truncated section is not worth including
+
+# Text before the first "##" (template line, injected web research) is
+# always kept, up to a quarter of the budget
+HEADER_SECTION = "header"
+DEFAULT_WEIGHT = 0.1
+
+# Never worth prompt tokens, whatever the purpose
+EXCLUDED_KEYWORDS = (
+    "shareholder", "board members", "auditor", "caro", "related party",
+    "people", "ownership",
+)
+
+# Title keyword -> relevance, per prompt purpose. A section scores the
+# highest weight among the keywords found in its (lower-cased) title.
+PURPOSE_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "overview": {
+        "business description": 1.0, "product": 0.9, "industries": 0.8,
+        "application": 0.8, "operational": 0.8, "key metrics": 0.8,
+        "financials": 0.7, "clients": 0.7, "facilities": 0.7, "global presence": 0.6,
+        "segment": 0.5, "geographic": 0.5, "awards": 0.5, "brand": 0.5,
+        "details": 0.5, "milestones": 0.4,
+    },
+    "highlights": {
+        "key metrics": 1.0, "financials": 1.0, "business description": 0.9,
+        "operational": 0.9, "swot": 0.9, "clients": 0.8, "awards": 0.7,
+        "market size": 0.7, "product": 0.6, "facilities": 0.6, "patents": 0.6,
+        "milestones": 0.5, "partners": 0.5, "peers": 0.5,
+    },
+    "growth": {
+        "future plan": 1.0, "swot": 0.9, "market size": 0.9, "key metrics": 0.8,
+        "financials": 0.8, "segment": 0.6, "milestones": 0.6, "facilities": 0.6,
+        "business description": 0.5, "global presence": 0.5,
+    },
+    "expansion": {
+        "future plan": 1.0, "facilities": 1.0, "milestones": 0.8, "operational": 0.7,
+        "global presence": 0.6, "business description": 0.4,
+    },
+    "enrichment": {
+        "key metrics": 1.0, "financials": 1.0, "operational": 0.9,
+        "business description": 0.8, "market size": 0.8, "segment": 0.7,
+        "facilities": 0.7, "clients": 0.6, "awards": 0.6, "details": 0.6,
+        "credit": 0.6, "future plan": 0.6, "swot": 0.5,
+    },
+    "research": {
+        "business description": 1.0, "product": 0.9, "industries": 0.9,
+        "application": 0.9, "market size": 0.8, "peers": 0.7, "segment": 0.6,
+    },
+}
+PURPOSE_WEIGHTS["teaser"] = {
+    keyword: max(PURPOSE_WEIGHTS[p].get(keyword, 0.0)
+                 for p in ("overview", "highlights", "growth", "expansion"))
+    for p in ("overview", "highlights", "growth", "expansion")
+    for keyword in PURPOSE_WEIGHTS[p]
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class PackedContext:
+    """Packed prompt context and what went into it"""
+    text: str
+    tokens: int
+    sections: List[str] = field(default_factory=list)
+    truncated: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+
+
+@lru_cache(maxsize=32)
+def split_sections(markdown: str) -> Tuple[Tuple[str, str], ...]:
+    """(title, body) pairs in document order, via MarkdownParser"""
+    parser = MarkdownParser(Path())
+    parser.content = markdown
+    return tuple((title, body) for title, body in parser.extract_sections().items() if body)
+
+
+def score_section(title: str, purpose: str) -> float:
+    weights = PURPOSE_WEIGHTS.get(purpose, PURPOSE_WEIGHTS["teaser"])
+    lowered = title.lower()
+    if any(keyword in lowered for keyword in EXCLUDED_KEYWORDS):
+        return 0.0
+    return max((w for keyword, w in weights.items() if keyword in lowered),
+               default=DEFAULT_WEIGHT)
+
+
+def _render(title: str, body: str) -> str:
+    return body if title == HEADER_SECTION else f"## {title}\n{body}"
+
+
+def _truncate(text: str, tokens: int) -> str:
+    """Cut to roughly `tokens`, on a line boundary where possible"""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    newline = cut.rfind("\n")
+    return cut[:newline] if newline > limit // 2 else cut
+
+
+def pack(markdown: str, purpose: str = "teaser",
+         token_budget: int = DEFAULT_TOKEN_BUDGET) -> PackedContext:
+    """Greedily fill token_budget with the most relevant sections"""
+    sections = split_sections(markdown)
+    if estimate_tokens(markdown) <= token_budget or not sections:
+        text = markdown if sections else _truncate(markdown, token_budget)
+        return PackedContext(text, estimate_tokens(text), [t for t, _ in sections])
+
+    chosen: Dict[int, str] = {}
+    truncated = []
+    remaining = token_budget
+    scores = {}
+    for i, (title, body) in enumerate(sections):
+        if title == HEADER_SECTION:
+            chosen[i] = _truncate(body, token_budget // 4)
+            remaining -= estimate_tokens(chosen[i]) + 1
+        else:
+            scores[i] = score_section(title, purpose)
+    ranked = sorted((i for i in scores if scores[i] > 0), key=lambda i: (-scores[i], i))
+
+    # Whole sections first, best first; then spend what is left on the
+    # best section that did not fit, cut to size
+    for i in ranked:
+        cost = estimate_tokens(_render(*sections[i])) + 1
+        if cost <= remaining:
+            chosen[i] = _render(*sections[i])
+            remaining -= cost
+    for i in ranked:
+        if i not in chosen and remaining >= MIN_PARTIAL_TOKENS and scores[i] > DEFAULT_WEIGHT:
+            chosen[i] = _truncate(_render(*sections[i]), remaining - 1)
+            remaining -= estimate_tokens(chosen[i]) + 1
+            truncated.append(sections[i][0])
+            break
+    dropped = [title for i, (title, _) in enumerate(sections) if i not in chosen]
+
+    text = "\n\n".join(chosen[i] for i in sorted(chosen))
+    return PackedContext(
+        text=text,
+        tokens=estimate_tokens(text),
+        sections=[sections[i][0] for i in sorted(chosen)],
+        truncated=truncated,
+        dropped=dropped,
+    )
+
+
+def pack_context(markdown: str, purpose: str = "teaser",
+                 token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Packed context text for a prompt"""
+    return pack(markdown, purpose, token_budget).text
@@ -0,0 +1,98 @@
+"""
+Context Sessions
+================
+
+Prefill a shared prompt prefix once and reuse it for follow-up prompts.
+
+Every teaser section prompt embeds the same company markdown, so Ollama
+re-tokenizes and re-prefills several thousand tokens per section. A
+ContextSession sends the prefix (company data) once with a pinned
+keep_alive, keeps the `context` token array Ollama returns, and passes
+that array with each section prompt. Only the short section instructions
+are then new input; the model stays loaded between calls.
+
+Sections stay independent: every follow-up starts from the prefix
+context, never from another section's answer.
+
+If priming fails, follow-ups fall back to sending prefix + prompt as
+plain text, so callers never need a second code path.
+
+Trade-off (why LLM_CONFIG.context_sessions is off by default): every
+section sees the same prefix, so InvestmentContentGenerator skips
+per-section context packing and sends one shared "teaser" pack. The
+sections also wait for the prefill before any of them can start. It
+pays off when prefill dominates (long company data, slow prompt
+evaluation); otherwise concurrent per-section packed prompts finish
+sooner and each gets the data most relevant to it.
+
+    session = ContextSession(client, company_block, model="qwen2.5:7b")
+    overview = await session.generate("Write the business overview ...")
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from config.settings import LLM_CONFIG
+from src.content_generation.ollama_client import OllamaClient, OllamaError
+
+
+class ContextSession:
+    """Shared-prefix generation session on one OllamaClient"""
+
+    def __init__(self, client: OllamaClient, prefix: str, model: Optional[str] = None,
+                 keep_alive: Optional[str] = None, engine: str = ""):
+        # A pool hands out one host: the prefilled context lives in its KV cache
+        self.client = client.pin() if hasattr(client, "pin") else client
+        self.prefix = prefix
+        self.model = model or client.model
+        # A batch-wide pin (ModelResidency) outlasts the per-company default
+        self.keep_alive = (keep_alive or getattr(self.client, "keep_alive", None)
+                           or LLM_CONFIG.context_keep_alive)
+        self.engine = engine
+
+        self.context: Optional[List[int]] = None
+        self.prefix_tokens = 0
+        self.reused = 0
+        self._primed = False
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def prime(self) -> bool:
+        """Prefill the prefix once (concurrent callers wait for the first)"""
+        if self._primed:
+            return self.context is not None
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._primed:
+                try:
+                    data = await self.client.generate_raw(
+                        self.prefix + "\n\nReply with OK.",
+                        engine=self.engine,
+                        prompt_name="prefill",
+                        model=self.model,
+                        temperature=0,  # Deterministic, so the context (and cache key) is stable
+                        max_tokens=1,
+                        keep_alive=self.keep_alive,
+                        keep_context=True,
+                    )
+                    self.context = data.get("context") or None
+                    self.prefix_tokens = data.get("prompt_eval_count") or 0
+                except OllamaError as e:
+                    print(f"  ⚠ Context prefill failed, sending full prompts: {e}")
+                self._primed = True
+        return self.context is not None
+
+    async def generate_raw(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        """generate_raw for `prompt` as a continuation of the prefix"""
+        kwargs.setdefault("model", self.model)
+        kwargs.setdefault("engine", self.engine)
+        if await self.prime():
+            self.reused += 1
+            return await self.client.generate_raw(
+                prompt, context=self.context, keep_alive=self.keep_alive, **kwargs
+            )
+        return await self.client.generate_raw(f"{self.prefix}\n\n{prompt}", **kwargs)
+
+    async def generate(self, prompt: str, **kwargs: Any) -> str:
+        data = await self.generate_raw(prompt, **kwargs)
+        return data.get("response", "")
@@ -21,7 +21,10 @@ import json
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 import asyncio
-import aiohttp
+
+from src.content_generation.context_packer import pack_context
+from src.content_generation.early_stop import JsonValueStop
+from src.content_generation.ollama_client import OllamaError, get_ollama_client
 
 # Try to import numpy for calculations
 try:
@@ -94,46 +97,33 @@ class DataEnrichmentEngine:
     Extracts comprehensive metrics from company data for rich PPT generation.
     """
     
-    def __init__(self, ollama_base_url: str = "http://localhost:11434"):
-        self.base_url = ollama_base_url
+    def __init__(self, ollama_base_url: Optional[str] = None):
+        self.client = get_ollama_client(ollama_base_url)
+        self.base_url = self.client.base_url
         self.model = "qwen2.5:7b"
-        self._available = None
         
     async def check_availability(self) -> bool:
-        """Check if Ollama is running and accessible"""
-        if self._available is not None:
-            return self._available
-            
-        try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(f"{self.base_url}/api/tags") as resp:
-                    self._available = resp.status == 200
-        except:
-            self._available = False
-        return self._available
-    
-    async def llm_extract(self, prompt: str, max_tokens: int = 1000) -> str:
+        """Check if Ollama is running and accessible and serving the model (cached health snapshot)"""
+        health = await self.client.health.status()
+        return health.serves(self.model)
+    
+    async def llm_extract(self, prompt: str, max_tokens: int = 1000,
+                          stop_when=None, name: str = "") -> str:
         """Use LLM to extract structured data"""
         if not await self.check_availability():
             return ""
             
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60)) as session:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,  # Low temp for accurate extraction
-                        "num_predict": max_tokens,
-                        "num_gpu": 99,  # Use all available GPU layers
-                    }
-                }
-                async with session.post(f"{self.base_url}/api/generate", json=payload) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return data.get("response", "")
-        except Exception as e:
+            return await self.client.generate(
+                prompt,
+                engine="DataEnrichmentEngine",
+                prompt_name=name,
+                model=self.model,
+                temperature=0.1,  # Low temp for accurate extraction
+                max_tokens=max_tokens,
+                stop_when=stop_when
+            )
+        except OllamaError as e:
             print(f"LLM extraction error: {e}")
         return ""
     
@@ -448,8 +438,8 @@ class DataEnrichmentEngine:
     async def enrich_with_llm(self, raw_content: str, sector: str) -> Dict[str, Any]:
         """Use LLM to extract additional insights and format data"""
         
-        # Truncate content for LLM (first 4000 chars)
-        content_snippet = raw_content[:4000]
+        # Most relevant sections within ~1000 tokens (not just the first 4000 chars)
+        content_snippet = pack_context(raw_content, "enrichment", 1000)
         
         prompt = f"""You are a financial analyst extracting key metrics for an M&A investment teaser.
 
@@ -472,7 +462,9 @@ Provide a JSON response with these exact keys:
 
 Return ONLY the JSON, no other text:"""
 
-        result = await self.llm_extract(prompt, max_tokens=800)
+        # Only the first JSON object is used; stop once it closes
+        result = await self.llm_extract(prompt, max_tokens=800, stop_when=JsonValueStop("{"),
+                                        name="investment_insights")
         
         if result:
             try:
@@ -0,0 +1,107 @@
+"""
+Early Stop Predicates
+=====================
+
+Stop conditions for streamed generations (OllamaClient.generate with
+stop_when=...).
+
+Most engine prompts ask for a single JSON object or array and then pull
+it out with re.search. Once that value is closed, everything else the
+model produces is discarded, yet without streaming the pipeline still
+waits for num_predict tokens or EOS. These predicates watch the growing
+response and report when it is complete, so the client can drop the
+connection and Ollama stops generating.
+
+Predicates are stateful and incremental (each call only scans new text),
+so create one per request:
+
+    text = await client.generate(prompt, stop_when=JsonValueStop("{"))
+"""
+
+import re
+from typing import Callable
+
+
+class JsonValueStop:
+    """
+    True once the first top-level JSON value opened by one of `openers`
+    is balanced.
+
+    Brackets inside string literals (including escaped quotes) are
+    ignored; text before the opening bracket (preamble, code fences) is
+    skipped.
+    """
+
+    _CLOSERS = {"{": "}", "[": "]"}
+
+    def __init__(self, openers: str = "{["):
+        self.openers = openers
+        self.tag = f"json:{openers}"
+        self._pos = 0
+        self._stack = []
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self.done = False
+
+    def __call__(self, text: str) -> bool:
+        if self.done:
+            return True
+        for ch in text[self._pos:]:
+            if not self._started:
+                if ch in self.openers:
+                    self._started = True
+                    self._stack.append(self._CLOSERS[ch])
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in self._CLOSERS:
+                self._stack.append(self._CLOSERS[ch])
+            elif self._stack and ch == self._stack[-1]:
+                self._stack.pop()
+                if not self._stack:
+                    self.done = True
+                    break
+        self._pos = len(text)
+        return self.done
+
+
+class BulletCountStop:
+    """True once `count` complete bullet lines (-, •, *, or 1.) have been written"""
+
+    _BULLET = re.compile(r"^\s*(?:[-•*]|\d+[.)])\s+\S")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.tag = f"bullets:{count}"
+        self._pos = 0
+        self._seen = 0
+
+    def __call__(self, text: str) -> bool:
+        # Only lines terminated by a newline are complete
+        end = text.rfind("\n") + 1
+        if end > self._pos:
+            for line in text[self._pos:end].splitlines():
+                if self._BULLET.match(line):
+                    self._seen += 1
+            self._pos = end
+        return self._seen >= self.count
+
+
+class FirstOf:
+    """True as soon as any of the wrapped predicates is"""
+
+    def __init__(self, *predicates: Callable[[str], bool]):
+        self.predicates = predicates
+        self.tag = "|".join(getattr(p, "tag", "?") for p in predicates)
+
+    def __call__(self, text: str) -> bool:
+        # Evaluate all so each keeps its incremental position
+        return any([p(text) for p in self.predicates])
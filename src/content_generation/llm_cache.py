@@ -0,0 +1,185 @@
+"""
+LLM Response Cache
+==================
+
+Persistent SQLite cache for Ollama generate responses.
+
+Rerunning the pipeline on an unchanged company repeats every prompt in
+the content, enrichment and research engines. OllamaClient looks each
+request up here first, keyed on a hash of the full payload (model,
+prompt, sampling options, format), so re-renders after template changes
+cost no GPU time.
+
+- size cap with least-recently-used eviction
+- hit / miss / store / eviction / bypass counters
+- bypass globally (cache.enabled = False, `--no-llm-cache`) or per call
+  (client.generate(..., use_cache=False))
+- only successful, non-empty responses are stored
+
+Inspect or clear from the command line:
+    python -m src.content_generation.llm_cache
+    python -m src.content_generation.llm_cache --clear
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import OUTPUT_DIR, PIPELINE_CONFIG
+
+
+DEFAULT_CACHE_PATH = OUTPUT_DIR / "llm_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def payload_key(payload: Dict[str, Any]) -> str:
+    """Stable hash of a generate payload (streaming flag and keep_alive excluded)"""
+    keyed = {k: v for k, v in payload.items() if k not in ("stream", "keep_alive")}
+    blob = json.dumps(keyed, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    LRU-bounded SQLite cache of generate responses.
+
+    The database is opened on first use, so constructing (or importing)
+    the cache costs nothing when it is disabled.
+
+    Usage:
+        cache = get_llm_cache()
+        data = cache.get(payload)
+        if data is None:
+            data = ...  # call Ollama
+            cache.put(payload, data)
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH,
+                 max_entries: Optional[int] = None, enabled: Optional[bool] = None):
+        self.path = Path(path)
+        self.max_entries = max_entries or PIPELINE_CONFIG.llm_cache_max_entries
+        self.enabled = PIPELINE_CONFIG.llm_cache_enabled if enabled is None else enabled
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        # Counters for run summaries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, payload: Dict[str, Any], use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """Cached response JSON for a payload, or None"""
+        if not (self.enabled and use_cache):
+            self.bypassed += 1
+            return None
+        key = payload_key(payload)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT data FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, payload: Dict[str, Any], data: Dict[str, Any],
+            use_cache: bool = True) -> None:
+        """Store a successful response and evict least-recently-used overflow"""
+        if not (self.enabled and use_cache) or not data.get("response"):
+            return
+        key = payload_key(payload)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, data, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload.get("model", ""), json.dumps(data, ensure_ascii=False), now, now)
+            )
+            self.stores += 1
+            overflow = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+
+    def clear(self) -> int:
+        """Delete every entry; returns the number removed"""
+        with self._lock:
+            return self._connect().execute("DELETE FROM responses").rowcount
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/store/eviction/bypass counters"""
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores,
+                "evictions": self.evictions, "bypassed": self.bypassed}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide cache shared by every OllamaClient"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+        return _cache
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the LLM response cache")
+    parser.add_argument("--path", type=Path, default=DEFAULT_CACHE_PATH, help="Cache database")
+    parser.add_argument("--clear", action="store_true", help="Delete every cached response")
+    args = parser.parse_args()
+
+    cache = LLMResponseCache(args.path, enabled=True)
+    if args.clear:
+        print(f"🗑️  Removed {cache.clear()} cached responses")
+    else:
+        print(f"🗄️  {args.path}: {cache.size()} cached responses (cap {cache.max_entries})")
+    cache.close()
@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config.settings import LLM_CONFIG
+from src.content_generation.ollama_client import OllamaError, get_ollama_client
 
 
 @dataclass
@@ -28,54 +29,26 @@ class OllamaInterface:
     
     def __init__(self, model_name: str = None, base_url: str = None):
         self.model_name = model_name or LLM_CONFIG.model_name
-        self.base_url = base_url or LLM_CONFIG.base_url
-        self._available = None
+        self.client = get_ollama_client(base_url)
+        self.base_url = self.client.base_url
         
     def is_available(self) -> bool:
         """Check if Ollama is running and model is available"""
-        if self._available is not None:
-            return self._available
-            
-        try:
-            import requests
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                models = response.json().get('models', [])
-                model_names = [m.get('name', '').split(':')[0] for m in models]
-                self._available = any(self.model_name.split(':')[0] in name for name in model_names)
-            else:
-                self._available = False
-        except Exception:
-            self._available = False
-            
-        return self._available
+        return self.client.health.status_sync().serves(self.model_name)
     
-    def generate(self, prompt: str, temperature: float = 0.5, max_tokens: int = 1024) -> str:
+    def generate(self, prompt: str, temperature: float = 0.5, max_tokens: int = 1024,
+                 name: str = "") -> str:
         """Generate text using Ollama"""
         try:
-            import requests
-            
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                        "num_predict": max_tokens
-                    }
-                },
-                timeout=LLM_CONFIG.timeout
+            return self.client.generate_sync(
+                prompt,
+                engine="OllamaInterface",
+                prompt_name=name,
+                model=self.model_name,
+                temperature=temperature,
+                max_tokens=max_tokens
             )
-            
-            if response.status_code == 200:
-                return response.json().get('response', '')
-            else:
-                print(f"Ollama error: {response.status_code}")
-                return ""
-                
-        except Exception as e:
+        except OllamaError as e:
             print(f"Ollama generation failed: {e}")
             return ""
 
@@ -117,7 +90,8 @@ Original Description:
 
 Anonymized Description (2-3 sentences):"""
 
-        result = self.llm.generate(prompt, temperature=0.3, max_tokens=300)
+        result = self.llm.generate(prompt, temperature=0.3, max_tokens=300,
+                                   name="anonymize_description")
         
         # Clean up result
         result = result.strip()
@@ -249,7 +223,8 @@ Draft Highlights:
 
 Rewrite as 4 polished bullet points (one per line, no bullet markers):"""
 
-        result = self.llm.generate(prompt, temperature=0.5, max_tokens=200)
+        result = self.llm.generate(prompt, temperature=0.5, max_tokens=200,
+                                   name="enhance_highlights")
         
         if not result:
             return None
@@ -278,7 +253,8 @@ Key Facts:
 
 Write an anonymous, compelling 2-sentence summary for investors:"""
 
-        result = self.llm.generate(prompt, temperature=0.5, max_tokens=150)
+        result = self.llm.generate(prompt, temperature=0.5, max_tokens=150,
+                                   name="executive_summary")
         
         if result and len(result) > 50:
             return result.strip()
@@ -0,0 +1,114 @@
+"""
+LLM Usage Accounting
+====================
+
+Token and latency totals per engine and prompt, from Ollama's own counters.
+
+Every /api/generate response reports prompt_eval_count, eval_count and
+the prompt_eval, eval and load durations (in nanoseconds). OllamaClient
+copies them onto its "ollama.generate" trace span together with the
+calling engine and prompt name; this module sums those spans, per
+company (one trace lane) or for a whole run:
+
+    usage = llm_usage(tracer, lane="acme")
+    usage["prompts"]["InvestmentContentGenerator/growth_potential"]["tokens_per_sec"]
+
+Cache hits and calls that joined an identical in-flight request are
+counted, but only generations that actually ran add tokens and GPU time.
+
+A batch that drains finished companies from its tracer keeps run totals
+in a UsageTotals instead of rescanning the trace.
+"""
+
+import copy
+
+from typing import Any, Dict, Iterable, Optional
+
+from src.orchestration.tracing import Tracer
+
+
+GENERATE_SPAN = "ollama.generate"
+
+_COUNTERS = ("calls", "generated", "cache_hits", "coalesced", "stopped_early", "errors",
+             "prompt_tokens", "completion_tokens")
+_SECONDS = ("prompt_eval_s", "eval_s", "load_s", "wall_s")
+
+
+def _empty() -> Dict[str, Any]:
+    usage: Dict[str, Any] = {key: 0 for key in _COUNTERS}
+    usage.update({key: 0.0 for key in _SECONDS})
+    return usage
+
+
+def _add(usage: Dict[str, Any], args: Dict[str, Any], duration_s: float) -> None:
+    usage["calls"] += 1
+    if args.get("error"):
+        usage["errors"] += 1
+        return
+    if args.get("cache") == "hit":
+        usage["cache_hits"] += 1
+        return
+    if args.get("coalesced"):
+        usage["coalesced"] += 1
+        return
+    usage["generated"] += 1
+    usage["stopped_early"] += bool(args.get("stopped_early"))
+    usage["prompt_tokens"] += args.get("prompt_eval_count") or 0
+    usage["completion_tokens"] += args.get("eval_count") or 0
+    usage["prompt_eval_s"] += (args.get("prompt_eval_ms") or 0) / 1000
+    usage["eval_s"] += (args.get("eval_ms") or 0) / 1000
+    usage["load_s"] += (args.get("load_ms") or 0) / 1000
+    usage["wall_s"] += duration_s
+
+
+def _finish(usage: Dict[str, Any]) -> Dict[str, Any]:
+    for key in _SECONDS:
+        usage[key] = round(usage[key], 3)
+    # Decode speed from Ollama's eval timer; wall time as the fallback
+    # (early-stopped streams never receive the final counters)
+    decode_s = usage["eval_s"] or usage["wall_s"]
+    usage["tokens_per_sec"] = round(usage["completion_tokens"] / decode_s, 1) if decode_s else None
+    usage["prompt_tokens_per_sec"] = (round(usage["prompt_tokens"] / usage["prompt_eval_s"], 1)
+                                      if usage["prompt_eval_s"] else None)
+    return usage
+
+
+class UsageTotals:
+    """Running LLM usage totals, fed generate spans in batches"""
+
+    def __init__(self):
+        self.totals = _empty()
+        self.prompts: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, spans: Iterable[Dict[str, Any]]) -> None:
+        for event in spans:
+            if event.get("name", GENERATE_SPAN) != GENERATE_SPAN:
+                continue
+            args = event.get("args", {})
+            duration_s = event.get("dur", 0.0) / 1e6
+            key = f"{args.get('engine') or 'unknown'}/{args.get('prompt_name') or 'unnamed'}"
+            _add(self.prompts.setdefault(key, _empty()), args, duration_s)
+            _add(self.totals, args, duration_s)
+
+    def summary(self) -> Dict[str, Any]:
+        """{"totals": {...}, "prompts": {"Engine/prompt": {...}}}"""
+        prompts = copy.deepcopy(self.prompts)
+        # Biggest GPU consumers first
+        ordered = sorted(prompts.items(), key=lambda kv: -(kv[1]["eval_s"] + kv[1]["prompt_eval_s"]
+                                                           or kv[1]["wall_s"]))
+        return {
+            "totals": _finish(dict(self.totals)),
+            "prompts": {key: _finish(usage) for key, usage in ordered},
+        }
+
+
+def summarize_spans(spans: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """{"totals": {...}, "prompts": {"Engine/prompt": {...}}} from generate spans"""
+    usage = UsageTotals()
+    usage.add(spans)
+    return usage.summary()
+
+
+def llm_usage(tracer: Tracer, lane: Optional[str] = None) -> Dict[str, Any]:
+    """LLM usage recorded by a tracer, for one lane (company) or the whole run"""
+    return summarize_spans(tracer.spans(GENERATE_SPAN, lane))
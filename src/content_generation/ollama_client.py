@@ -0,0 +1,648 @@
+"""
+Ollama Client
+=============
+
+One pooled client for every call to the local Ollama server.
+
+Content engines used to open a brand-new aiohttp.ClientSession for every
+prompt (and OllamaInterface a bare requests.post), paying connection setup
+on each call and scattering timeouts and generation options across six
+classes. OllamaClient keeps a persistent connection pool and takes its
+timeouts, pool size and default options from LLM_CONFIG, so throughput is
+tuned in one place.
+
+- async path: aiohttp session, re-created if the event loop changes
+  (e.g. successive asyncio.run calls from sync wrappers)
+- sync path: requests.Session per thread, for OllamaInterface
+- every generate call emits an "ollama.generate" trace span carrying the
+  engine, prompt name and Ollama's token counts and timers (summed per
+  company and run by llm_usage.py)
+- generate requests in flight per client are capped by an AIMD
+  AdaptiveLimiter that starts at LLM_CONFIG.num_parallel and follows
+  measured tokens/sec; extra callers queue locally instead of inside
+  Ollama (the sync path keeps a fixed num_parallel cap)
+- streaming mode reports time-to-first-token and can stop generation as
+  soon as the response is complete (see early_stop.py)
+- identical requests are answered from the persistent LLMResponseCache,
+  and identical requests in flight at the same moment share one
+  generation (InflightRequests)
+- availability comes from a TTL-cached OllamaHealthMonitor (client.health)
+- connection errors and 5xx responses are retried with jittered backoff,
+  and a CircuitBreaker (client.breaker) fails fast with CircuitOpenError
+  after repeated backend failures until a probe request succeeds
+
+Engines share clients through get_ollama_client(base_url). With several
+LLM_CONFIG.endpoints configured, get_ollama_client() returns an
+OllamaPool that spreads requests across them (see ollama_pool.py).
+"""
+
+import asyncio
+import copy
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+from config.settings import LLM_CONFIG
+from src.content_generation.adaptive_limit import AdaptiveLimiter
+from src.content_generation.circuit_breaker import CircuitBreaker, backoff_delay
+from src.content_generation.ollama_health import OllamaHealthMonitor
+from src.orchestration.tracing import span
+
+if TYPE_CHECKING:
+    from src.content_generation.llm_cache import LLMResponseCache
+
+
+def payload_key(payload: Dict[str, Any]) -> str:
+    # Deferred: importing llm_cache here would break `python -m ...llm_cache`
+    from src.content_generation.llm_cache import payload_key as _payload_key
+
+    return _payload_key(payload)
+
+
+class OllamaError(RuntimeError):
+    """Raised when Ollama is unreachable or returns an error"""
+    retryable = False  # Worth repeating after a backoff
+
+
+class OllamaUnavailableError(OllamaError):
+    """Backend failure (transport error, 5xx); counts toward the circuit breaker"""
+    retryable = True
+
+
+class OllamaTimeoutError(OllamaUnavailableError):
+    """No complete response in time; not retried, that would cost another timeout"""
+    retryable = False
+
+
+class OllamaConnectionError(OllamaUnavailableError):
+    """The server could not be reached; safe to retry on another host"""
+
+
+class CircuitOpenError(OllamaConnectionError):
+    """Failed fast: the server's circuit breaker is open"""
+    retryable = False
+
+
+class InflightRequests:
+    """
+    Single-flight map: concurrent calls with the same key share one task.
+
+    Callers await a shielded task, so one caller being cancelled does not
+    cancel the generation for the others; once every caller has been
+    cancelled, the shared task is cancelled too and the GPU is freed.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.coalesced = 0
+
+    def pending(self, key: str) -> bool:
+        task = self._tasks.get(key)
+        return (task is not None and not task.done()
+                and task.get_loop() is asyncio.get_running_loop())
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        if self.pending(key):
+            self.coalesced += 1
+            task = self._tasks[key]
+        else:
+            task = asyncio.get_running_loop().create_task(factory())
+            self._tasks[key] = task
+            task.add_done_callback(
+                lambda t, k=key: self._tasks.pop(k) if self._tasks.get(k) is t else None
+            )
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Each caller gets its own copy of the shared result
+            return dict(await asyncio.shield(task))
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1:
+                task.cancel()  # Nobody is waiting for this generation any more
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+
+class OllamaClient:
+    """
+    Pooled async (and sync) client for the Ollama HTTP API.
+
+    Usage:
+        client = get_ollama_client()
+        text = await client.generate(prompt, temperature=0.3, max_tokens=500,
+                                     engine="MyEngine")
+    """
+
+    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None,
+                 timeout: Optional[float] = None, connect_timeout: Optional[float] = None,
+                 max_connections: Optional[int] = None,
+                 num_parallel: Optional[int] = None,
+                 default_options: Optional[Dict[str, Any]] = None,
+                 cache: Optional["LLMResponseCache"] = None):
+        self.base_url = (base_url or LLM_CONFIG.base_url).rstrip("/")
+        self.model = model or LLM_CONFIG.model_name
+        self.timeout = timeout or LLM_CONFIG.timeout
+        self.connect_timeout = connect_timeout or LLM_CONFIG.connect_timeout
+        self.max_connections = max_connections or LLM_CONFIG.max_connections
+        self.num_parallel = max(1, num_parallel or LLM_CONFIG.num_parallel)
+        self.default_options = dict(
+            LLM_CONFIG.default_options if default_options is None else default_options
+        )
+
+        self.health = OllamaHealthMonitor(self)
+        if cache is None:
+            # Imported here so `python -m ...llm_cache` does not import itself twice
+            from src.content_generation.llm_cache import get_llm_cache
+            cache = get_llm_cache()
+        self.cache = cache
+
+        self.inflight = InflightRequests()
+
+        self._session = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.limiter = AdaptiveLimiter(self.num_parallel)
+        self.breaker = CircuitBreaker(name=self.base_url)
+        # Set by ModelResidency while a batch pins the model; renewed by every request
+        self.keep_alive: Optional[str] = None
+        # An OllamaPool turns this off: it fails over to another host instead
+        self.retry_unreachable = True
+        self._sync_slots = threading.BoundedSemaphore(self.num_parallel)
+        self._thread_local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Request building
+    # ------------------------------------------------------------------
+
+    def build_payload(self, prompt: str, model: Optional[str] = None,
+                      temperature: Optional[float] = None,
+                      max_tokens: Optional[int] = None,
+                      options: Optional[Dict[str, Any]] = None,
+                      **extra: Any) -> Dict[str, Any]:
+        """Merge default, per-call and sampling options into a generate payload"""
+        merged = dict(self.default_options)
+        merged["temperature"] = LLM_CONFIG.temperature_factual if temperature is None else temperature
+        merged["num_predict"] = LLM_CONFIG.max_tokens if max_tokens is None else max_tokens
+        if options:
+            merged.update(options)
+        payload = {
+            "model": model or self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": merged,
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        payload.update(extra)
+        return payload
+
+    # ------------------------------------------------------------------
+    # Async path
+    # ------------------------------------------------------------------
+
+    async def _get_session(self):
+        """Pooled session bound to the running event loop"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if (self._session is None or self._session.closed
+                or self._session_loop is not loop):
+            # A session from a finished loop cannot be closed from this one;
+            # drop it and let its connector be garbage collected
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=LLM_CONFIG.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout,
+                                              connect=self.connect_timeout),
+            )
+            self._session_loop = loop
+            self.limiter.reset()
+        return self._session
+
+    async def generate_raw(self, prompt: str, engine: str = "", prompt_name: str = "",
+                           timeout: Optional[float] = None, use_cache: bool = True,
+                           stream: bool = False,
+                           stop_when: Optional[Callable[[str], bool]] = None,
+                           keep_context: bool = False,
+                           **payload_kwargs: Any) -> Dict[str, Any]:
+        """
+        POST /api/generate and return the full response JSON.
+
+        Served from the response cache when the same payload was seen
+        before; use_cache=False forces a fresh generation.
+
+        Args:
+            engine, prompt_name: Who is asking, for tracing and usage
+                accounting (e.g. "InvestmentContentGenerator",
+                "growth_potential").
+            stream: Consume the response token by token; adds ttft_ms
+                (time to first token) to the result and the trace span.
+            stop_when: Predicate over the text so far (implies stream);
+                once it returns True the connection is dropped, which
+                makes Ollama stop generating. The result then has
+                stopped_early=True.
+            keep_context: Keep Ollama's `context` token array in the
+                result (see ContextSession); dropped by default so cache
+                entries stay small.
+
+        Raises:
+            OllamaError: On transport errors or a non-200 response.
+        """
+        import aiohttp
+
+        stream = stream or stop_when is not None
+        payload = self.build_payload(prompt, **payload_kwargs)
+        payload["stream"] = stream
+        cache_key = self._cache_key(payload, stop_when)
+        session = await self._get_session()
+        # Always explicit: timeout=None on session.post would lift the session's limits
+        request_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout,
+                                                connect=self.connect_timeout)
+
+        with span("ollama.generate", "llm", engine=engine, prompt_name=prompt_name,
+                  model=payload["model"], prompt_chars=len(prompt), stream=stream) as trace:
+            data = self.cache.get(cache_key, use_cache)
+            trace["cache"] = "miss" if data is None else "hit"
+            if data is not None:
+                return data
+
+            async def fetch() -> Dict[str, Any]:
+                # Predicates are stateful: each retry watches a fresh copy
+                pristine = copy.deepcopy(stop_when)
+                attempts = LLM_CONFIG.retry_attempts + 1
+                for attempt in range(attempts):
+                    try:
+                        result = await self._attempt(
+                            session, payload, request_timeout, trace,
+                            stop_when if attempt == 0 else copy.deepcopy(pristine)
+                        )
+                        break
+                    except OllamaError as e:
+                        if not self._should_retry(e, attempt, attempts):
+                            raise
+                        delay = backoff_delay(attempt)
+                        trace["retries"] = attempt + 1
+                        print(f"  ↻ {e} - retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                if not keep_context:
+                    result.pop("context", None)
+                self.cache.put(cache_key, result, use_cache)
+                return result
+
+            # An identical request already in flight computes this one too
+            inflight_key = payload_key({**cache_key, "keep_context": keep_context})
+            trace["coalesced"] = self.inflight.pending(inflight_key)
+            data = await self.inflight.run(inflight_key, fetch)
+            self._record_usage(trace, data)
+            return data
+
+    @staticmethod
+    def _record_usage(trace: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """Ollama's token counts and timers (nanoseconds) onto the trace span"""
+        trace["prompt_eval_count"] = data.get("prompt_eval_count")
+        trace["eval_count"] = data.get("eval_count")
+        for timer in ("prompt_eval", "eval", "load"):
+            ns = data.get(f"{timer}_duration")
+            trace[f"{timer}_ms"] = round(ns / 1e6, 1) if ns else None
+
+    @staticmethod
+    def _cache_key(payload: Dict[str, Any],
+                   stop_when: Optional[Callable[[str], bool]]) -> Dict[str, Any]:
+        # An early-stopped response is only valid for the same stop condition
+        if stop_when is None:
+            return payload
+        return {**payload, "early_stop": getattr(stop_when, "tag", repr(stop_when))}
+
+    def request_key(self, prompt: str, stop_when: Optional[Callable[[str], bool]] = None,
+                    keep_context: bool = False, engine: str = "", prompt_name: str = "",
+                    timeout: Optional[float] = None, use_cache: bool = True,
+                    stream: bool = False, **payload_kwargs: Any) -> str:
+        """Identity of a generate_raw call, for coalescing above the client (OllamaPool)"""
+        payload = self.build_payload(prompt, **payload_kwargs)
+        return payload_key({**self._cache_key(payload, stop_when), "keep_context": keep_context})
+
+    def _should_retry(self, error: "OllamaError", attempt: int, attempts: int) -> bool:
+        if not error.retryable or attempt == attempts - 1:
+            return False
+        return self.retry_unreachable or not isinstance(error, OllamaConnectionError)
+
+    async def _attempt(self, session, payload: Dict[str, Any], request_timeout,
+                       trace: Dict[str, Any],
+                       stop_when: Optional[Callable[[str], bool]]) -> Dict[str, Any]:
+        """One request, behind the circuit breaker and the concurrency limiter"""
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Ollama at {self.base_url} is failing; circuit open "
+                                   f"for another {self.breaker.retry_after():.0f}s")
+        queued = time.perf_counter()
+        try:
+            async with self.limiter:
+                started = time.perf_counter()
+                trace["queued_ms"] = round((started - queued) * 1000, 1)
+                trace["limit"] = self.limiter.current
+                try:
+                    result = await self._post_generate(session, payload, request_timeout,
+                                                       trace, stop_when)
+                except OllamaConnectionError:
+                    raise  # Host down, not overloaded
+                except OllamaUnavailableError:
+                    self.limiter.record_failure()
+                    raise
+                if payload.get("options", {}).get("num_predict", 2) > 1:
+                    # Single-token prefills (ContextSession) say nothing about throughput
+                    self.limiter.record(result.get("eval_count"),
+                                        time.perf_counter() - started, started - queued)
+        except OllamaUnavailableError:
+            self.breaker.record_failure()
+            raise
+        except OllamaError:
+            self.breaker.record_success()  # The server answered
+            raise
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _post_generate(self, session, payload: Dict[str, Any],
+                             request_timeout, trace: Dict[str, Any],
+                             stop_when: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        import aiohttp
+
+        try:
+            async with session.post(f"{self.base_url}/api/generate", json=payload,
+                                    timeout=request_timeout) as resp:
+                trace["status"] = resp.status
+                if resp.status != 200:
+                    body = await resp.text()
+                    error = OllamaUnavailableError if resp.status >= 500 else OllamaError
+                    raise error(f"Ollama returned {resp.status}: {body[:200]}")
+                if payload["stream"]:
+                    return await self._read_stream(resp, stop_when, trace)
+                return await resp.json()
+        except aiohttp.ClientConnectorError as e:
+            self.health.mark_down(e)
+            raise OllamaConnectionError(f"Ollama unreachable: {e!r}") from e
+        except asyncio.TimeoutError as e:
+            raise OllamaTimeoutError(f"Ollama timed out: {e!r}") from e
+        except aiohttp.ClientError as e:
+            raise OllamaUnavailableError(f"Ollama request failed: {e!r}") from e
+
+    async def _read_stream(self, resp, stop_when: Optional[Callable[[str], bool]],
+                           trace: Dict[str, Any]) -> Dict[str, Any]:
+        """Accumulate NDJSON chunks until done or stop_when fires"""
+        started = time.perf_counter()
+        text = ""
+        chunks = 0
+        final: Dict[str, Any] = {}
+        stopped = False
+        ttft_ms = None
+
+        async for line in resp.content:
+            if not line.strip():
+                continue
+            try:
+                chunk = json.loads(line)
+            except ValueError as e:
+                raise OllamaError(f"Malformed stream chunk: {line[:200]!r}") from e
+            if chunk.get("error"):
+                raise OllamaError(f"Ollama error: {chunk['error']}")
+            token = chunk.get("response", "")
+            if token:
+                if ttft_ms is None:
+                    ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+                text += token
+                chunks += 1
+            if chunk.get("done"):
+                final = chunk
+                break
+            if token and stop_when is not None and stop_when(text):
+                # Closing (not releasing) the connection cancels the generation
+                resp.close()
+                stopped = True
+                break
+
+        trace["ttft_ms"] = ttft_ms
+        trace["stopped_early"] = stopped
+        data = {k: v for k, v in final.items() if k != "response"}
+        data.update(response=text, done=not stopped, ttft_ms=ttft_ms, stopped_early=stopped)
+        # One stream chunk per token; the server only reports counts when done
+        data.setdefault("eval_count", chunks)
+        return data
+
+    async def generate(self, prompt: str, engine: str = "", **kwargs: Any) -> str:
+        """
+        Generate text; returns the response string (raises OllamaError).
+
+        Accepts generate_raw's keyword arguments, e.g.
+        stop_when=JsonValueStop("{") to stop once a JSON object closes.
+        """
+        data = await self.generate_raw(prompt, engine=engine, **kwargs)
+        return data.get("response", "")
+
+    async def _get_models(self, endpoint: str) -> List[str]:
+        """Model names from /api/tags or /api/ps (raises OllamaError)"""
+        import aiohttp
+
+        session = await self._get_session()
+        with span(f"ollama.{endpoint}", "http") as trace:
+            try:
+                async with session.get(
+                    f"{self.base_url}/api/{endpoint}",
+                    timeout=aiohttp.ClientTimeout(total=LLM_CONFIG.probe_timeout)
+                ) as resp:
+                    trace["status"] = resp.status
+                    if resp.status != 200:
+                        raise OllamaError(f"Ollama returned {resp.status}")
+                    data = await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise OllamaError(f"Ollama probe failed: {e!r}") from e
+        return [m.get("name", "") for m in data.get("models", [])]
+
+    async def list_models(self) -> List[str]:
+        """Names of locally available models (raises OllamaError)"""
+        return await self._get_models("tags")
+
+    async def list_running(self) -> List[str]:
+        """Names of models currently loaded in memory (raises OllamaError)"""
+        return await self._get_models("ps")
+
+    async def load_model(self, model: Optional[str] = None,
+                         keep_alive: Any = None) -> bool:
+        """
+        Load a model without generating (keep_alive=0 unloads it).
+
+        Returns False instead of raising, so residency changes never fail
+        a batch.
+        """
+        import aiohttp
+
+        payload = {"model": model or self.model, "stream": False,
+                   "keep_alive": self.keep_alive if keep_alive is None else keep_alive}
+        session = await self._get_session()
+        action = "unload" if payload["keep_alive"] in (0, "0") else "load"
+        with span(f"ollama.{action}", "llm", model=payload["model"],
+                  keep_alive=str(payload["keep_alive"])) as trace:
+            try:
+                await self._post_generate(session, payload,
+                                          aiohttp.ClientTimeout(total=self.timeout,
+                                                                connect=self.connect_timeout),
+                                          trace)
+            except OllamaError as e:
+                print(f"  ⚠ Could not {action} {payload['model']}: {e}")
+                return False
+        return True
+
+    async def is_available(self) -> bool:
+        """True if the server is up, per the cached health snapshot"""
+        return (await self.health.status()).available
+
+    async def close(self) -> None:
+        """Close the pooled session for the current loop"""
+        if self._session is not None and not self._session.closed:
+            try:
+                if self._session_loop is asyncio.get_running_loop():
+                    await self._session.close()
+            except RuntimeError:
+                pass
+        self._session = None
+        self._session_loop = None
+
+    # ------------------------------------------------------------------
+    # Sync path
+    # ------------------------------------------------------------------
+
+    def _sync_session(self):
+        """requests.Session per thread (Session is not thread-safe)"""
+        session = getattr(self._thread_local, "session", None)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._thread_local.session = session
+        return session
+
+    def generate_sync(self, prompt: str, engine: str = "", prompt_name: str = "",
+                      timeout: Optional[float] = None, use_cache: bool = True,
+                      **payload_kwargs: Any) -> str:
+        """Blocking generate (raises OllamaError)"""
+        payload = self.build_payload(prompt, **payload_kwargs)
+        with span("ollama.generate", "llm", engine=engine, prompt_name=prompt_name,
+                  model=payload["model"], prompt_chars=len(prompt)) as trace:
+            data = self.cache.get(payload, use_cache)
+            trace["cache"] = "miss" if data is None else "hit"
+            if data is not None:
+                return data.get("response", "")
+            attempts = LLM_CONFIG.retry_attempts + 1
+            for attempt in range(attempts):
+                try:
+                    data = self._attempt_sync(payload, timeout, trace)
+                    break
+                except OllamaError as e:
+                    if not self._should_retry(e, attempt, attempts):
+                        raise
+                    delay = backoff_delay(attempt)
+                    trace["retries"] = attempt + 1
+                    print(f"  ↻ {e} - retrying in {delay:.1f}s")
+                    time.sleep(delay)
+            data.pop("context", None)
+            self.cache.put(payload, data, use_cache)
+            self._record_usage(trace, data)
+        return data.get("response", "")
+
+    def _attempt_sync(self, payload: Dict[str, Any], timeout: Optional[float],
+                      trace: Dict[str, Any]) -> Dict[str, Any]:
+        """Blocking counterpart of _attempt"""
+        import requests
+
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Ollama at {self.base_url} is failing; circuit open "
+                                   f"for another {self.breaker.retry_after():.0f}s")
+        try:
+            try:
+                with self._sync_slots:
+                    resp = self._sync_session().post(
+                        f"{self.base_url}/api/generate", json=payload,
+                        timeout=(self.connect_timeout, timeout or self.timeout)
+                    )
+            except requests.ConnectionError as e:
+                self.health.mark_down(e)
+                raise OllamaConnectionError(f"Ollama unreachable: {e!r}") from e
+            except requests.Timeout as e:
+                raise OllamaTimeoutError(f"Ollama timed out: {e!r}") from e
+            except requests.RequestException as e:
+                raise OllamaUnavailableError(f"Ollama request failed: {e!r}") from e
+            trace["status"] = resp.status_code
+            if resp.status_code != 200:
+                error = OllamaUnavailableError if resp.status_code >= 500 else OllamaError
+                raise error(f"Ollama returned {resp.status_code}: {resp.text[:200]}")
+        except OllamaUnavailableError:
+            self.breaker.record_failure()
+            raise
+        except OllamaError:
+            self.breaker.record_success()
+            raise
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        return resp.json()
+
+    def list_models_sync(self) -> List[str]:
+        """Blocking /api/tags (raises OllamaError)"""
+        import requests
+
+        try:
+            resp = self._sync_session().get(f"{self.base_url}/api/tags",
+                                            timeout=LLM_CONFIG.probe_timeout)
+        except requests.RequestException as e:
+            raise OllamaError(f"Ollama probe failed: {e!r}") from e
+        if resp.status_code != 200:
+            raise OllamaError(f"Ollama returned {resp.status_code}")
+        return [m.get("name", "") for m in resp.json().get("models", [])]
+
+
+_clients: Dict[str, OllamaClient] = {}
+_clients_lock = threading.Lock()
+_pool = None
+
+
+def get_ollama_client(base_url: Optional[str] = None) -> OllamaClient:
+    """
+    Shared client for a server URL.
+
+    Without a URL: an OllamaPool over LLM_CONFIG.endpoints when more than
+    one is configured, else the client for LLM_CONFIG.base_url.
+    """
+    global _pool
+    if base_url is None and len(LLM_CONFIG.endpoints) > 1:
+        if _pool is None:
+            from src.content_generation.ollama_pool import OllamaPool
+
+            # Built outside the lock: the pool registers its member clients here
+            pool = OllamaPool(LLM_CONFIG.endpoints)
+            with _clients_lock:
+                if _pool is None:
+                    _pool = pool
+        return _pool
+    key = (base_url or LLM_CONFIG.base_url).rstrip("/")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = OllamaClient(base_url=key)
+        return client
+
+
+async def close_ollama_clients() -> None:
+    """Close every shared client's session on the running loop"""
+    for client in list(_clients.values()):
+        await client.close()
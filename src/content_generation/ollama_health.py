@@ -0,0 +1,197 @@
+"""
+Ollama Health Monitor
+=====================
+
+Cached availability probing for the shared Ollama client.
+
+Engines used to hit /api/tags before every prompt. The monitor probes
+once, keeps the result for LLM_CONFIG.health_ttl seconds and, once it
+goes stale, keeps serving the last snapshot while a single background
+probe refreshes it - so generation never waits on a health check after
+the first one. Each snapshot also records which models are installed
+(/api/tags) and which are currently loaded in memory (/api/ps).
+
+A connection failure seen by a real request marks the server down
+immediately, so engines fall back without waiting for the TTL. When a
+later probe finds it up again, the client's circuit breaker is reset.
+
+Long-running processes can call start() to refresh on a fixed interval.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+from config.settings import LLM_CONFIG
+
+
+@dataclass
+class OllamaHealth:
+    """One probe result"""
+    available: bool = False
+    models: List[str] = field(default_factory=list)  # Installed (/api/tags)
+    loaded_models: List[str] = field(default_factory=list)  # In memory (/api/ps)
+    checked_at: float = 0.0
+    error: Optional[str] = None
+
+    def age(self) -> float:
+        return time.time() - self.checked_at
+
+    def has_model(self, model: str) -> bool:
+        """Installed, matching either the exact tag or the base name"""
+        return _matches(model, self.models)
+
+    def is_loaded(self, model: str) -> bool:
+        return _matches(model, self.loaded_models)
+
+    def serves(self, model: str) -> bool:
+        """Server is up and the model is installed"""
+        return self.available and self.has_model(model)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["age"] = round(self.age(), 1)
+        return data
+
+
+def _matches(model: str, names: List[str]) -> bool:
+    base = model.split(":")[0]
+    return any(name == model or name.split(":")[0] == base for name in names)
+
+
+class OllamaHealthMonitor:
+    """
+    TTL-cached, background-refreshed health of one Ollama server.
+
+    Usage:
+        health = await client.health.status()
+        if health.serves("qwen2.5:7b"):
+            ...
+    """
+
+    def __init__(self, client, ttl: Optional[float] = None,
+                 refresh_interval: Optional[float] = None):
+        self.client = client
+        self.ttl = LLM_CONFIG.health_ttl if ttl is None else ttl
+        self.refresh_interval = (LLM_CONFIG.health_refresh_interval
+                                 if refresh_interval is None else refresh_interval)
+        self.probes = 0
+
+        self._health: Optional[OllamaHealth] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._sync_lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> Optional[OllamaHealth]:
+        """Last probe result without probing (None before the first probe)"""
+        return self._health
+
+    # ------------------------------------------------------------------
+    # Async path
+    # ------------------------------------------------------------------
+
+    async def status(self) -> OllamaHealth:
+        """
+        Current health, probing only if nothing has been recorded yet.
+
+        A stale snapshot is returned as-is and refreshed in the background.
+        """
+        health = self._health
+        if health is None:
+            return await self.refresh()
+        if health.age() > self.ttl:
+            self._ensure_probe()
+        return health
+
+    async def refresh(self) -> OllamaHealth:
+        """Probe now, joining a probe that is already in flight"""
+        return await asyncio.shield(self._ensure_probe())
+
+    def refresh_in_background(self) -> None:
+        """Start a probe without waiting for it (needs a running loop)"""
+        self._ensure_probe()
+
+    def _ensure_probe(self) -> asyncio.Task:
+        # A task from a finished event loop (e.g. an earlier asyncio.run) is dead
+        loop = asyncio.get_running_loop()
+        task = self._probe_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._probe_task = loop.create_task(self._probe())
+        return task
+
+    async def _probe(self) -> OllamaHealth:
+        from src.content_generation.ollama_client import OllamaError
+
+        self.probes += 1
+        try:
+            models = await self.client.list_models()
+            try:
+                loaded = await self.client.list_running()
+            except OllamaError:
+                loaded = []  # Older servers have no /api/ps
+            health = OllamaHealth(True, models, loaded, time.time())
+        except OllamaError as e:
+            health = OllamaHealth(False, checked_at=time.time(), error=str(e))
+        self._record(health)
+        return health
+
+    def _record(self, health: OllamaHealth) -> None:
+        previous, self._health = self._health, health
+        breaker = getattr(self.client, "breaker", None)
+        if (breaker is not None and health.available
+                and previous is not None and not previous.available):
+            # Back up after being marked down: connection failures are history
+            breaker.reset()
+
+    def mark_down(self, error: Any) -> None:
+        """Record a connection failure seen outside a probe"""
+        previous = self._health
+        self._health = OllamaHealth(
+            False,
+            models=previous.models if previous else [],
+            checked_at=time.time(),
+            error=str(error),
+        )
+
+    def start(self) -> None:
+        """Refresh every refresh_interval seconds on the running loop"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._loop_task = self._loop_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    # ------------------------------------------------------------------
+    # Sync path
+    # ------------------------------------------------------------------
+
+    def status_sync(self) -> OllamaHealth:
+        """Blocking variant of status(); probes inline when stale"""
+        from src.content_generation.ollama_client import OllamaError
+
+        health = self._health
+        if health is not None and health.age() <= self.ttl:
+            return health
+        with self._sync_lock:
+            health = self._health
+            if health is not None and health.age() <= self.ttl:
+                return health
+            self.probes += 1
+            try:
+                health = OllamaHealth(True, self.client.list_models_sync(),
+                                      checked_at=time.time())
+            except OllamaError as e:
+                health = OllamaHealth(False, checked_at=time.time(), error=str(e))
+            self._record(health)
+            return health
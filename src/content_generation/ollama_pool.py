@@ -0,0 +1,326 @@
+"""
+Ollama Pool
+===========
+
+Health-aware load balancing across several Ollama hosts.
+
+One OllamaClient pins the whole pipeline to one inference box. OllamaPool
+takes a list of endpoints (LLM_CONFIG.endpoints / OLLAMA_HOSTS) and
+exposes the same interface as OllamaClient, so engines do not know
+whether they talk to one host or many:
+
+- each request goes to the admitted host with the fewest outstanding
+  requests (ties rotate)
+- a host that refuses connections is ejected (its health snapshot is
+  marked down) and the request is retried on another host
+- once readmit_after seconds have passed, an ejected host is probed in
+  the background and re-admitted when /api/tags answers again (which
+  also closes its circuit breaker)
+- members do not retry unreachable hosts themselves; the pool fails
+  over to the next host instead
+- identical requests in flight at once are coalesced before routing,
+  so two hosts never compute the same completion
+- pool.health aggregates the members: available if any host is, with
+  the union of their models
+
+Every member keeps its own connection pool and num_parallel limit, so
+capacity grows with the number of hosts.
+
+Demo against local fake servers (one is stopped and restarted midway):
+    python -m src.content_generation.ollama_pool
+"""
+
+import asyncio
+import itertools
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config.settings import LLM_CONFIG
+from src.content_generation.ollama_client import (
+    InflightRequests, OllamaClient, OllamaConnectionError, OllamaError, get_ollama_client
+)
+from src.content_generation.ollama_health import OllamaHealth
+
+
+def merge_health(snapshots: Iterable[Optional[OllamaHealth]]) -> Optional[OllamaHealth]:
+    """Pool-wide view: up if any member is, models of the members that are up"""
+    snapshots = [s for s in snapshots if s is not None]
+    if not snapshots:
+        return None
+    up = [s for s in snapshots if s.available]
+    return OllamaHealth(
+        available=bool(up),
+        models=sorted({m for s in up for m in s.models}),
+        loaded_models=sorted({m for s in up for m in s.loaded_models}),
+        checked_at=min(s.checked_at for s in snapshots),
+        error=None if up else "; ".join(s.error or "down" for s in snapshots),
+    )
+
+
+class PoolHealth:
+    """OllamaHealthMonitor interface over every member's monitor"""
+
+    def __init__(self, pool: "OllamaPool"):
+        self.pool = pool
+
+    @property
+    def snapshot(self) -> Optional[OllamaHealth]:
+        return merge_health(m.health.snapshot for m in self.pool.members)
+
+    async def status(self) -> OllamaHealth:
+        return merge_health(await asyncio.gather(
+            *(m.health.status() for m in self.pool.members)
+        ))
+
+    async def refresh(self) -> OllamaHealth:
+        return merge_health(await asyncio.gather(
+            *(m.health.refresh() for m in self.pool.members)
+        ))
+
+    def status_sync(self) -> OllamaHealth:
+        return merge_health(m.health.status_sync() for m in self.pool.members)
+
+    def start(self) -> None:
+        for member in self.pool.members:
+            member.health.start()
+
+    async def stop(self) -> None:
+        for member in self.pool.members:
+            await member.health.stop()
+
+
+class OllamaPool:
+    """
+    Least-outstanding-requests router over several Ollama hosts.
+
+    Usage:
+        pool = OllamaPool(["http://gpu1:11434", "http://gpu2:11434"])
+        text = await pool.generate(prompt, engine="MyEngine")
+    """
+
+    def __init__(self, endpoints: List[str], readmit_after: Optional[float] = None):
+        urls = list(dict.fromkeys(url.rstrip("/") for url in endpoints))
+        if not urls:
+            raise ValueError("OllamaPool needs at least one endpoint")
+        self.members: List[OllamaClient] = [get_ollama_client(url) for url in urls]
+        for member in self.members:
+            # Fail over straight away rather than back off on a dead host
+            member.retry_unreachable = len(self.members) == 1
+        self.base_url = ",".join(urls)
+        self.model = self.members[0].model
+        self.cache = self.members[0].cache
+        self.health = PoolHealth(self)
+        self.inflight = InflightRequests()
+        self.readmit_after = (LLM_CONFIG.pool_readmit_after
+                              if readmit_after is None else readmit_after)
+
+        self._outstanding: Dict[str, int] = {url: 0 for url in urls}
+        self._requests: Counter = Counter()
+        self._ejections: Counter = Counter()
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def _admitted(self, member: OllamaClient) -> bool:
+        snapshot = member.health.snapshot
+        if snapshot is not None and not snapshot.available:
+            if snapshot.age() < self.readmit_after:
+                return False
+            try:
+                # Re-admission goes through a health check, not live traffic;
+                # a successful probe also closes the member's circuit
+                member.health.refresh_in_background()
+                return False
+            except RuntimeError:
+                # Sync caller (no event loop): let this request be the check
+                return True
+        # Circuit open on a reachable host (5xx, timeouts): it would fail fast anyway
+        return member.breaker.retry_after() == 0
+
+    def _acquire(self, exclude: Set[str]) -> Optional[OllamaClient]:
+        """Pick a host and count the request against it"""
+        with self._lock:
+            candidates = [m for m in self.members if m.base_url not in exclude]
+            if not candidates:
+                return None
+            admitted = [m for m in candidates if self._admitted(m)]
+            if not admitted:
+                # Everything looks down: try the host marked down longest ago
+                admitted = [min(candidates, key=lambda m: (m.health.snapshot.checked_at
+                                                           if m.health.snapshot else 0))]
+            # Rotate before taking the minimum so ties spread evenly
+            start = next(self._rotation) % len(admitted)
+            ordered = admitted[start:] + admitted[:start]
+            member = min(ordered, key=lambda m: self._outstanding[m.base_url])
+            self._outstanding[member.base_url] += 1
+            self._requests[member.base_url] += 1
+            return member
+
+    def _release(self, member: OllamaClient) -> None:
+        with self._lock:
+            self._outstanding[member.base_url] -= 1
+
+    def _eject(self, member: OllamaClient) -> None:
+        with self._lock:
+            self._ejections[member.base_url] += 1
+        print(f"  ⚠ Ollama host {member.base_url} unreachable - ejected")
+
+    def pin(self) -> OllamaClient:
+        """Least-loaded admitted member, for work that needs host affinity"""
+        with self._lock:
+            admitted = [m for m in self.members if self._admitted(m)] or self.members
+            return min(admitted, key=lambda m: self._outstanding[m.base_url])
+
+    # ------------------------------------------------------------------
+    # OllamaClient interface
+    # ------------------------------------------------------------------
+
+    async def generate_raw(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        """Route to the least-busy host; retry elsewhere if it is unreachable"""
+        key = self.members[0].request_key(prompt, **kwargs)
+        return await self.inflight.run(key, lambda: self._route(prompt, **kwargs))
+
+    async def _route(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        tried: Set[str] = set()
+        last_error: Optional[OllamaError] = None
+        while True:
+            member = self._acquire(tried)
+            if member is None:
+                raise last_error or OllamaError("No Ollama hosts configured")
+            try:
+                return await member.generate_raw(prompt, **kwargs)
+            except OllamaConnectionError as e:
+                self._eject(member)
+                tried.add(member.base_url)
+                last_error = e
+            finally:
+                self._release(member)
+
+    async def generate(self, prompt: str, engine: str = "", **kwargs: Any) -> str:
+        data = await self.generate_raw(prompt, engine=engine, **kwargs)
+        return data.get("response", "")
+
+    def generate_sync(self, prompt: str, **kwargs: Any) -> str:
+        tried: Set[str] = set()
+        last_error: Optional[OllamaError] = None
+        while True:
+            member = self._acquire(tried)
+            if member is None:
+                raise last_error or OllamaError("No Ollama hosts configured")
+            try:
+                return member.generate_sync(prompt, **kwargs)
+            except OllamaConnectionError as e:
+                self._eject(member)
+                tried.add(member.base_url)
+                last_error = e
+            finally:
+                self._release(member)
+
+    async def list_models(self) -> List[str]:
+        return (await self.health.refresh()).models
+
+    def list_models_sync(self) -> List[str]:
+        return self.health.status_sync().models
+
+    async def is_available(self) -> bool:
+        return (await self.health.status()).available
+
+    async def close(self) -> None:
+        for member in self.members:
+            await member.close()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host requests, in-flight count, ejections, concurrency limit, circuit and admission state"""
+        with self._lock:
+            return {
+                m.base_url: {
+                    "requests": self._requests[m.base_url],
+                    "outstanding": self._outstanding[m.base_url],
+                    "ejections": self._ejections[m.base_url],
+                    "limit": m.limiter.current,
+                    "circuit": m.breaker.state,
+                    "available": m.health.snapshot.available if m.health.snapshot else None,
+                }
+                for m in self.members
+            }
+
+
+# ----------------------------------------------------------------------
+# Demo with local fake servers
+# ----------------------------------------------------------------------
+
+async def _start_fake_ollama(port: int, delay: float, name: str):
+    """Minimal Ollama look-alike: /api/tags, /api/ps, /api/generate"""
+    from aiohttp import web
+
+    async def tags(request):
+        return web.json_response({"models": [{"name": LLM_CONFIG.model_name}]})
+
+    async def ps(request):
+        return web.json_response({"models": []})
+
+    async def generate(request):
+        body = await request.json()
+        await asyncio.sleep(delay)
+        return web.json_response({"response": f"{name}: {body['prompt']}", "done": True,
+                                  "eval_count": 8, "prompt_eval_count": 16})
+
+    app = web.Application()
+    app.add_routes([web.get("/api/tags", tags), web.get("/api/ps", ps),
+                    web.post("/api/generate", generate)])
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def _demo(hosts: int = 3, requests: int = 30) -> None:
+    import socket
+
+    def free_port() -> int:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
+
+    ports = [free_port() for _ in range(hosts)]
+    delays = [0.02 * (i + 1) for i in range(hosts)]  # host0 is the fastest
+    runners = [await _start_fake_ollama(p, d, f"host{i}")
+               for i, (p, d) in enumerate(zip(ports, delays))]
+    pool = OllamaPool([f"http://127.0.0.1:{p}" for p in ports], readmit_after=0.5)
+
+    async def burst(label: str) -> None:
+        before = {url: s["requests"] for url, s in pool.stats().items()}
+        replies = await asyncio.gather(*(
+            pool.generate(f"prompt {i}", engine="demo", use_cache=False)
+            for i in range(requests)
+        ))
+        served = Counter(reply.split(":")[0] for reply in replies)
+        print(f"\n{label}: {len(replies)} served -> {dict(sorted(served.items()))}")
+        for url, s in pool.stats().items():
+            print(f"   {url}  +{s['requests'] - before[url]:3d} requests  "
+                  f"ejections={s['ejections']}  available={s['available']}")
+
+    print(f"🛰️  Pool over {hosts} fake Ollama hosts (latency {', '.join(f'{d * 1000:.0f}ms' for d in delays)})")
+    print(f"   Pool available: {await pool.is_available()}")
+    await burst("All hosts up")
+
+    await runners[0].cleanup()
+    await burst("host0 stopped")
+
+    runners[0] = await _start_fake_ollama(ports[0], delays[0], "host0")
+    await asyncio.sleep(pool.readmit_after)
+    await burst("host0 restarted (background probe pending)")
+    await asyncio.sleep(0.1)
+    await burst("host0 re-admitted")
+
+    await pool.close()
+    for runner in runners:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(_demo())
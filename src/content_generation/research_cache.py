@@ -0,0 +1,158 @@
+"""
+Research Cache
+==============
+
+Sector-scoped single-flight + TTL cache for deep market research.
+
+AdvancedResearchEngine.deep_research builds its queries from the sector
+and sub-sector only, so every company in the same sector would repeat
+the same searches, page fetches and LLM syntheses. ResearchCache keys
+results on the normalised (sector, sub_sector) pair:
+
+- concurrent callers for the same key await one in-flight computation
+- completed results are written to disk and served until they expire
+
+Research cost therefore scales with the number of sectors in a batch
+rather than the number of companies.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.orchestration.checkpoints import CheckpointMiss, decode_value, encode_value
+
+
+CACHE_FORMAT_VERSION = 1
+
+ResearchKey = Tuple[str, str]
+
+
+def normalize_key(sector: str, sub_sector: str = "") -> ResearchKey:
+    """Case- and whitespace-insensitive cache key"""
+    return (" ".join(sector.lower().split()), " ".join((sub_sector or "").lower().split()))
+
+
+class ResearchCache:
+    """
+    Single-flight, disk-backed TTL cache for research results.
+
+    Usage:
+        cache = ResearchCache(OUTPUT_DIR / "research_cache", ttl_seconds=86400)
+        intel = await cache.get_or_compute(
+            sector, sub_sector,
+            lambda: engine.deep_research(sector, sub_sector)
+        )
+    """
+
+    def __init__(self, cache_dir: Path, ttl_seconds: float = 24 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self._inflight: Dict[ResearchKey, asyncio.Task] = {}
+
+        # Counters for run summaries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _path(self, key: ResearchKey) -> Path:
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()[:16]
+        return self.cache_dir / f"research_{digest}.json"
+
+    def _read(self, key: ResearchKey) -> Optional[Any]:
+        """Return the stored result for key if present and fresh"""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_FORMAT_VERSION or tuple(data.get("key", ())) != key:
+                return None
+            if time.time() - data.get("created", 0) > self.ttl_seconds:
+                return None
+            return decode_value(data["value"])
+        except (OSError, ValueError, KeyError, TypeError, CheckpointMiss) as e:
+            print(f"  ⚠ Ignoring research cache entry {path.name}: {e}")
+            return None
+
+    def _write(self, key: ResearchKey, value: Any) -> None:
+        """Persist a result atomically"""
+        try:
+            payload = {
+                "version": CACHE_FORMAT_VERSION,
+                "key": list(key),
+                "created": time.time(),
+                "value": encode_value(value),
+            }
+        except TypeError as e:
+            print(f"  ⚠ Research result not cacheable: {e}")
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    async def get_or_compute(self, sector: str, sub_sector: str,
+                             compute: Callable[[], Awaitable[Any]],
+                             should_cache: Callable[[Any], bool] = bool) -> Any:
+        """
+        Return the cached result for (sector, sub_sector), computing it once.
+
+        Args:
+            sector: Sector name.
+            sub_sector: Sub-sector name (may be empty).
+            compute: Zero-argument coroutine factory producing the result.
+            should_cache: Predicate deciding whether a result is worth
+                storing; empty or failed research is not cached so a later
+                caller can retry.
+
+        Raises:
+            Whatever compute raises; failures are shared by every caller
+            waiting on that computation and are never cached.
+        """
+        key = normalize_key(sector, sub_sector)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            # shield: a cancelled waiter must not cancel the shared work
+            return await asyncio.shield(task)
+
+        cached = await asyncio.to_thread(self._read, key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        # Another caller may have started while we were reading the disk
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+
+        async def run() -> Any:
+            try:
+                result = await compute()
+                if should_cache(result):
+                    await asyncio.to_thread(self._write, key, result)
+                return result
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(run())
+        # Mark the outcome retrieved even if every waiter was cancelled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/coalesced counters"""
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
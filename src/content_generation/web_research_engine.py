@@ -16,6 +16,11 @@ from dataclasses import dataclass, field
 from urllib.parse import quote_plus
 import time
 
+from src.content_generation.context_packer import pack_context
+from src.content_generation.early_stop import JsonValueStop
+from src.content_generation.ollama_client import OllamaError, get_ollama_client
+from src.orchestration.tracing import span
+
 
 @dataclass
 class ResearchResult:
@@ -48,24 +53,32 @@ class WebResearchEngine:
     relevant statistics to enrich PPT content.
     """
     
-    def __init__(self, ollama_base_url: str = "http://localhost:11434"):
-        self.ollama_url = ollama_base_url
+    def __init__(self, ollama_base_url: Optional[str] = None):
+        self.llm = get_ollama_client(ollama_base_url)
+        self.ollama_url = self.llm.base_url
         self.model = "qwen2.5:7b"
         self.session = None
+        self._owns_session = True
+        self.timeout = aiohttp.ClientTimeout(total=30)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
         
+    def use_session(self, session: aiohttp.ClientSession) -> None:
+        """Borrow a shared pooled session; close() will leave it open"""
+        self.session = session
+        self._owns_session = False
+    
     async def _get_session(self):
         """Get or create aiohttp session"""
         if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout, headers=self.headers)
+            self.session = aiohttp.ClientSession(timeout=self.timeout, headers=self.headers)
+            self._owns_session = True
         return self.session
     
     async def close(self):
-        """Close the session"""
-        if self.session and not self.session.closed:
+        """Close the session (borrowed sessions are left to their owner)"""
+        if self._owns_session and self.session and not self.session.closed:
             await self.session.close()
     
     async def search_duckduckgo(self, query: str, num_results: int = 8) -> List[Dict]:
@@ -81,37 +94,39 @@ class WebResearchEngine:
             # DuckDuckGo HTML search
             search_url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
             
-            async with session.get(search_url) as resp:
-                if resp.status == 200:
-                    html = await resp.text()
-                    
-                    # Parse results from HTML
-                    # DuckDuckGo uses specific classes for results
-                    result_pattern = r'<a class="result__a" href="([^"]+)"[^>]*>([^<]+)</a>.*?<a class="result__snippet"[^>]*>([^<]+)</a>'
+            with span("duckduckgo.html", "http", query=query):
+                async with session.get(search_url, headers=self.headers,
+                                       timeout=self.timeout) as resp:
+                    html = await resp.text() if resp.status == 200 else ""
+            
+            if html:
+                # Parse results from HTML
+                # DuckDuckGo uses specific classes for results
+                result_pattern = r'<a class="result__a" href="([^"]+)"[^>]*>([^<]+)</a>.*?<a class="result__snippet"[^>]*>([^<]+)</a>'
+                
+                # Simpler pattern for snippets
+                link_pattern = r'<a[^>]+class="result__a"[^>]+href="([^"]+)"[^>]*>([^<]+)</a>'
+                snippet_pattern = r'class="result__snippet"[^>]*>([^<]+)<'
+                
+                links = re.findall(link_pattern, html)
+                snippets = re.findall(snippet_pattern, html)
+                
+                for i, (url, title) in enumerate(links[:num_results]):
+                    snippet = snippets[i] if i < len(snippets) else ""
                     
-                    # Simpler pattern for snippets
-                    link_pattern = r'<a[^>]+class="result__a"[^>]+href="([^"]+)"[^>]*>([^<]+)</a>'
-                    snippet_pattern = r'class="result__snippet"[^>]*>([^<]+)<'
+                    # Clean up URL (DuckDuckGo redirects)
+                    if 'uddg=' in url:
+                        actual_url = re.search(r'uddg=([^&]+)', url)
+                        if actual_url:
+                            from urllib.parse import unquote
+                            url = unquote(actual_url.group(1))
                     
-                    links = re.findall(link_pattern, html)
-                    snippets = re.findall(snippet_pattern, html)
+                    results.append({
+                        'title': title.strip(),
+                        'url': url,
+                        'snippet': self._clean_text(snippet)
+                    })
                     
-                    for i, (url, title) in enumerate(links[:num_results]):
-                        snippet = snippets[i] if i < len(snippets) else ""
-                        
-                        # Clean up URL (DuckDuckGo redirects)
-                        if 'uddg=' in url:
-                            actual_url = re.search(r'uddg=([^&]+)', url)
-                            if actual_url:
-                                from urllib.parse import unquote
-                                url = unquote(actual_url.group(1))
-                        
-                        results.append({
-                            'title': title.strip(),
-                            'url': url,
-                            'snippet': self._clean_text(snippet)
-                        })
-                        
         except Exception as e:
             print(f"  ⚠ DuckDuckGo search error: {e}")
         
@@ -262,18 +277,12 @@ If data is unclear, state the range or general trend.
 SUMMARY (3-4 sentences with numbers):"""
 
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60)) as session:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.3, "num_predict": 500}
-                }
-                async with session.post(f"{self.ollama_url}/api/generate", json=payload) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return data.get("response", "").strip()
-        except Exception as e:
+            response = await self.llm.generate(
+                prompt, engine="WebResearchEngine", prompt_name="market_summary",
+                model=self.model, temperature=0.3, max_tokens=500
+            )
+            return response.strip()
+        except OllamaError as e:
             print(f"  ⚠ LLM summarization error: {e}")
         
         return ""
@@ -340,8 +349,9 @@ class EnhancedContentGenerator:
     Enhanced content generator that combines LLM with web research.
     """
     
-    def __init__(self, ollama_url: str = "http://localhost:11434"):
-        self.ollama_url = ollama_url
+    def __init__(self, ollama_url: Optional[str] = None):
+        self.llm = get_ollama_client(ollama_url)
+        self.ollama_url = self.llm.base_url
         self.model = "qwen2.5:7b"
         self.research_engine = WebResearchEngine(ollama_url)
     
@@ -358,7 +368,7 @@ class EnhancedContentGenerator:
         # Combine company data with market research
         context = f"""
 COMPANY DATA:
-{raw_data[:4000]}
+{pack_context(raw_data, "teaser", 1000)}
 
 MARKET RESEARCH:
 - Market Size: {market_research.market_size or 'Research pending'}
@@ -407,28 +417,18 @@ IMPORTANT:
 OUTPUT (valid JSON only):"""
 
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=90)) as session:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "num_predict": 2000,
-                        "top_p": 0.9,
-                    }
-                }
-                async with session.post(f"{self.ollama_url}/api/generate", json=payload) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        response = data.get("response", "")
-                        
-                        # Parse JSON from response
-                        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                        if json_match:
-                            return json.loads(json_match.group())
+            response = await self.llm.generate(
+                prompt, engine="EnhancedContentGenerator", prompt_name="investor_content",
+                model=self.model, temperature=0.7, max_tokens=2000, options={"top_p": 0.9},
+                stop_when=JsonValueStop("{")
+            )
+            
+            # Parse JSON from response
+            json_match = re.search(r'\{.*\}', response, re.DOTALL)
+            if json_match:
+                return json.loads(json_match.group())
                             
-        except Exception as e:
+        except (OllamaError, ValueError) as e:
             print(f"  ⚠ Enhanced generation error: {e}")
         
         # Fallback
@@ -353,9 +353,9 @@ class CompanyDataExtractor:
                 setattr(self.data, field, match.group(1).strip())
 
 
-def load_company_data(company_folder: str) -> CompanyData:
-    """Load and parse company data from folder"""
-    folder_path = COMPANY_DATA_DIR / company_folder
+def load_company_data(company_folder: str, data_dir: Optional[Path] = None) -> CompanyData:
+    """Load and parse company data from folder (under COMPANY_DATA_DIR by default)"""
+    folder_path = (data_dir or COMPANY_DATA_DIR) / company_folder
     
     # Find the markdown file
     md_files = list(folder_path.glob("*.md"))
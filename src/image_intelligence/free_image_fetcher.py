@@ -52,6 +52,8 @@ import requests
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config.settings import OUTPUT_DIR
+from src.orchestration.model_residency import gpu_model
+from src.orchestration.tracing import span
 
 
 @dataclass
@@ -297,7 +299,8 @@ class FreeImageFetcher:
             return None
             
         try:
-            response = self.session.get(url, timeout=10)
+            with span("http.get", "http", kind="image"):
+                response = self.session.get(url, timeout=10)
             if response.status_code != 200:
                 return None
             
@@ -350,13 +353,14 @@ class FreeImageFetcher:
         images = []
         try:
             with DDGS() as ddgs:
-                results = list(ddgs.images(
-                    query,
-                    max_results=max_images * 3,  # Fetch more in case some fail
-                    safesearch='moderate',
-                    size='large',
-                    type_image='photo'
-                ))
+                with span("ddgs.images", "http", query=query):
+                    results = list(ddgs.images(
+                        query,
+                        max_results=max_images * 3,  # Fetch more in case some fail
+                        safesearch='moderate',
+                        size='large',
+                        type_image='photo'
+                    ))
                 
                 for result in results:
                     if len(images) >= max_images:
@@ -403,7 +407,8 @@ class FreeImageFetcher:
                 storage={'root_dir': str(temp_dir)},
                 log_level=50  # Suppress logs
             )
-            crawler.crawl(keyword=query, max_num=max_images)
+            with span("icrawler.bing", "http", query=query):
+                crawler.crawl(keyword=query, max_num=max_images)
             
             # Process downloaded images
             for img_file in temp_dir.glob("*.*"):
@@ -691,6 +696,19 @@ class JanusImageGenerator:
             print(f"  ⚠ Janus not available: {e}")
             return False
     
+    def cleanup(self):
+        """Release GPU memory (the model reloads on next use)"""
+        self.model = None
+        self.processor = None
+        self.model_loaded = False
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+    
+    @gpu_model("janus-pro-7b-images")
     def generate_sector_image(self, prompt: str, sector: str) -> Optional[Path]:
         """Generate an image using Janus"""
         if not self._load_model():
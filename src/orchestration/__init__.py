@@ -0,0 +1,40 @@
+"""
+Orchestration Module - Scheduling and bookkeeping for pipeline runs
+"""
+from .checkpoints import CheckpointStore
+from .model_residency import ModelResidency, get_model_residency, gpu_model
+from .run_manifest import RunManifest
+from .stage_graph import (
+    Fallback,
+    Stage,
+    StageGraph,
+    StageGraphError
+)
+from .tracing import (
+    TraceFile,
+    Tracer,
+    activate,
+    current_tracer,
+    lane,
+    span,
+    track
+)
+
+__all__ = [
+    'CheckpointStore',
+    'ModelResidency',
+    'get_model_residency',
+    'gpu_model',
+    'RunManifest',
+    'Fallback',
+    'Stage',
+    'StageGraph',
+    'StageGraphError',
+    'TraceFile',
+    'Tracer',
+    'activate',
+    'current_tracer',
+    'lane',
+    'span',
+    'track'
+]
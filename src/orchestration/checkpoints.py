@@ -0,0 +1,153 @@
+"""
+Stage Checkpoints
+=================
+
+Per-company persistence of expensive stage outputs, so a crashed or
+re-rendered run can resume without repeating LLM generation, web research
+or image fetching.
+
+Each checkpointed stage writes <checkpoint_dir>/<stage>.json holding its
+outputs plus the fingerprint of the inputs that produced them. Outputs
+are encoded as tagged JSON:
+- dataclasses from the src package -> {"__dataclass__": "module:Class", "fields": {...}}
+- pathlib paths                    -> {"__path__": "..."}
+- dicts, lists, tuples and scalars as themselves
+
+A checkpoint is only reused when its fingerprint matches the current one
+and every path it references still exists. The fingerprint deliberately
+covers source data and configuration but not code, so fixing a template
+or layout bug does not invalidate hours of generated content.
+"""
+
+import dataclasses
+import importlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class CheckpointMiss(Exception):
+    """Raised while decoding a checkpoint that can no longer be used"""
+
+
+# Only reconstruct classes from our own modules
+_ALLOWED_MODULE_PREFIXES = ("src.",)
+
+
+def encode_value(value: Any) -> Any:
+    """Encode a stage output as tagged, JSON-serializable data"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        cls = type(value)
+        return {
+            "__dataclass__": f"{cls.__module__}:{cls.__qualname__}",
+            "fields": {
+                f.name: encode_value(getattr(value, f.name))
+                for f in dataclasses.fields(value) if f.init
+            },
+        }
+    if isinstance(value, Path):
+        return {"__path__": str(value)}
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [encode_value(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot checkpoint value of type {type(value).__name__}")
+
+
+def decode_value(data: Any) -> Any:
+    """Rebuild a stage output encoded by encode_value"""
+    if isinstance(data, list):
+        return [decode_value(v) for v in data]
+    if not isinstance(data, dict):
+        return data
+
+    if "__path__" in data:
+        path = Path(data["__path__"])
+        if not path.exists():
+            raise CheckpointMiss(f"referenced file is gone: {path}")
+        return path
+
+    if "__dataclass__" in data:
+        module_name, _, qualname = data["__dataclass__"].partition(":")
+        if not module_name.startswith(_ALLOWED_MODULE_PREFIXES):
+            raise CheckpointMiss(f"refusing to load type {data['__dataclass__']}")
+        try:
+            cls: Any = importlib.import_module(module_name)
+            for part in qualname.split("."):
+                cls = getattr(cls, part)
+        except (ImportError, AttributeError) as e:
+            raise CheckpointMiss(f"unknown type {data['__dataclass__']}: {e}")
+        known = {f.name for f in dataclasses.fields(cls) if f.init}
+        fields = {k: decode_value(v) for k, v in data["fields"].items() if k in known}
+        return cls(**fields)
+
+    return {k: decode_value(v) for k, v in data.items()}
+
+
+class CheckpointStore:
+    """
+    Checkpoint directory for one company.
+
+    Outputs are always saved after a checkpointed stage succeeds; they are
+    only loaded back when ``resume`` is True.
+    """
+
+    def __init__(self, directory: Path, fingerprint: Dict[str, Any], resume: bool = False):
+        self.directory = Path(directory)
+        self.fingerprint = fingerprint
+        self.resume = resume
+        self.restored: List[str] = []
+
+    def _path(self, stage_name: str) -> Path:
+        return self.directory / f"{stage_name}.json"
+
+    def load(self, stage_name: str) -> Optional[Dict[str, Any]]:
+        """Return the stage's saved outputs, or None if unavailable or stale"""
+        if not self.resume:
+            return None
+        path = self._path(stage_name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") != self.fingerprint:
+                return None
+            values = {name: decode_value(v) for name, v in data["outputs"].items()}
+        except (OSError, ValueError, KeyError, TypeError, CheckpointMiss) as e:
+            print(f"  ⚠ Checkpoint {self.directory.name}/{path.name} not reusable: {e}")
+            return None
+        self.restored.append(stage_name)
+        return values
+
+    def save(self, stage_name: str, outputs: Dict[str, Any]) -> Optional[Path]:
+        """
+        Persist a stage's outputs atomically.
+
+        Stages that produced nothing (every output None or empty - typically
+        a failed optional step) are not saved, so a resume retries them.
+        Stand-in results of failed stages never reach here (see
+        stage_graph.Fallback).
+        """
+        if not any(outputs.values()):
+            return None
+        try:
+            payload = {
+                "stage": stage_name,
+                "fingerprint": self.fingerprint,
+                "outputs": {name: encode_value(v) for name, v in outputs.items()},
+            }
+        except TypeError as e:
+            print(f"  ⚠ Skipping checkpoint for {stage_name}: {e}")
+            return None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(stage_name)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,177 @@
+"""
+Model Residency
+===============
+
+Which models hold GPU memory during a batch, and for how long.
+
+Ollama unloads a model keep_alive after its last request (five minutes
+unless the request says otherwise), so gaps between companies (image
+fetching, rendering, a slow scrape) could turn into cold reloads of the
+content model. The in-process vision models (Qwen2-VL, Janus-Pro-7B) load
+on first use and stay loaded, so two of them end up competing for the
+same GPU memory.
+
+ModelResidency fixes both for one batch:
+
+- pin() preloads the content model before the first company and sets
+  the client's keep_alive to LLM_CONFIG.batch_keep_alive. Every
+  generate request carries that value and renews the pin, so the model
+  is loaded once per batch.
+- release() unloads it (keep_alive=0) when the batch ends.
+- use(name, release) sequences the vision models. Only one is resident
+  at a time, and only one runs at a time. Switching to another model
+  releases the previous one first, never while it is mid-inference.
+  Vision engines take the lease with the @gpu_model decorator.
+
+    residency = get_model_residency()
+    await residency.pin()
+    try:
+        ...
+    finally:
+        await residency.release()
+"""
+
+import asyncio
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from config.settings import LLM_CONFIG
+
+
+class ModelResidency:
+    """Batch-scoped pin for the content model plus a lease for vision models"""
+
+    def __init__(self, client: Any = None, model: Optional[str] = None,
+                 keep_alive: Optional[str] = None):
+        self._client = client
+        self.model = model or LLM_CONFIG.model_name
+        self.keep_alive = keep_alive or LLM_CONFIG.batch_keep_alive
+        self.pinned = False
+        self._pin_task: Optional[asyncio.Task] = None
+
+        self.resident: Optional[str] = None  # Vision model currently in GPU memory
+        self.loads: Dict[str, int] = {}
+        self.evictions = 0
+        self._release: Optional[Callable[[], None]] = None
+        self._lease = threading.RLock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from src.content_generation.ollama_client import get_ollama_client
+
+            self._client = get_ollama_client()
+        return self._client
+
+    def _clients(self):
+        # A pool pins the model on every host
+        return getattr(self.client, "members", [self.client])
+
+    # ------------------------------------------------------------------
+    # Content model (Ollama)
+    # ------------------------------------------------------------------
+
+    async def pin(self) -> bool:
+        """Preload the content model and keep it loaded until release()"""
+        # Workers starting together share one preload
+        if self._pin_task is None:
+            self._pin_task = asyncio.ensure_future(self._pin())
+        return await asyncio.shield(self._pin_task)
+
+    async def _pin(self) -> bool:
+        clients = self._clients()
+        for client in clients:
+            client.keep_alive = self.keep_alive
+        loaded = [await client.load_model(self.model, self.keep_alive) for client in clients]
+        self.pinned = any(loaded)
+        if self.pinned:
+            print(f"📌 {self.model} loaded and pinned for the batch (keep_alive {self.keep_alive})")
+        return self.pinned
+
+    async def release(self) -> None:
+        """Unload the content model and restore Ollama's default keep_alive"""
+        if self._pin_task is not None:
+            await asyncio.gather(self._pin_task, return_exceptions=True)
+            self._pin_task = None
+        clients = self._clients()
+        for client in clients:
+            client.keep_alive = None
+        if self.pinned:
+            for client in clients:
+                await client.load_model(self.model, keep_alive=0)
+            self.pinned = False
+            print(f"📌 {self.model} released")
+
+    # ------------------------------------------------------------------
+    # Vision models (in-process)
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def use(self, name: str, release: Callable[[], None]) -> Iterator[None]:
+        """
+        Run vision work for model `name`, evicting any other vision model.
+
+        `release` frees `name`'s GPU memory; it is called when a different
+        model needs the GPU. Concurrent users are serialized.
+        """
+        with self._lease:
+            if self.resident != name:
+                self._evict()
+                self.resident = name
+                self._release = release
+                self.loads[name] = self.loads.get(name, 0) + 1
+            yield
+
+    def _evict(self) -> None:
+        if self.resident is None:
+            return
+        print(f"  ♻️  Releasing {self.resident} from GPU memory")
+        release, self._release = self._release, None
+        self.resident = None
+        self.evictions += 1
+        if release is not None:
+            release()
+
+    def release_vision(self) -> None:
+        """Free whichever vision model is resident (end of batch)"""
+        with self._lease:
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "content_model": self.model,
+            "pinned": self.pinned,
+            "keep_alive": self.keep_alive,
+            "vision_resident": self.resident,
+            "vision_loads": dict(self.loads),
+            "vision_evictions": self.evictions,
+        }
+
+
+_residency: Optional[ModelResidency] = None
+_residency_lock = threading.Lock()
+
+
+def get_model_residency() -> ModelResidency:
+    """Process-wide residency manager"""
+    global _residency
+    with _residency_lock:
+        if _residency is None:
+            _residency = ModelResidency()
+        return _residency
+
+
+def gpu_model(name: str) -> Callable:
+    """
+    Method decorator for vision engines: run under the residency lease
+    for `name`, with the engine's cleanup() as its release.
+    """
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with get_model_residency().use(name, self.cleanup):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,180 @@
+"""
+Results Sink
+============
+
+Streaming JSONL bookkeeping for batch runs.
+
+process_all appends one JSON line per company to processing_results.jsonl
+the moment that company finishes, and flushes it immediately. A crash
+therefore loses at most the companies still in flight, memory does not
+grow with batch size, and dashboards can follow progress live.
+
+ResultsSummary aggregates records - from a finished file, or by tailing a
+file that is still being written:
+
+    python -m src.orchestration.results_sink output/v5_enhanced/processing_results.jsonl
+    python -m src.orchestration.results_sink output/v5_enhanced/processing_results.jsonl --follow
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+class ResultsSink:
+    """Append-only JSONL writer; every record is flushed as it is written"""
+
+    def __init__(self, path: Path, truncate: bool = True):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w" if truncate else "a", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one record and flush it to disk"""
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "ResultsSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ResultsSummary:
+    """Running totals over result records"""
+
+    def __init__(self):
+        self.total = 0
+        self.successful = 0
+        self.failed = 0
+        self.cached = 0
+        self.total_time = 0.0
+        self.sectors: Counter = Counter()
+        self.stage_time: Counter = Counter()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Fold one result record into the totals"""
+        self.total += 1
+        if record.get("success"):
+            self.successful += 1
+        else:
+            self.failed += 1
+        if record.get("cached"):
+            self.cached += 1
+        self.total_time += record.get("time", 0.0) or 0.0
+        if record.get("sector"):
+            self.sectors[record["sector"]] += 1
+        for stage, seconds in (record.get("stages") or {}).items():
+            self.stage_time[stage] += seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "successful": self.successful,
+            "failed": self.failed,
+            "cached": self.cached,
+            "total_time": round(self.total_time, 3),
+            "sectors": dict(self.sectors),
+            "stage_time": {k: round(v, 3) for k, v in self.stage_time.most_common()},
+        }
+
+    @staticmethod
+    def read(path: Path) -> Iterator[Dict[str, Any]]:
+        """Yield records from a JSONL file, skipping a torn trailing line"""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    @staticmethod
+    def follow(path: Path, poll_interval: float = 1.0,
+               stop_after: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Tail a JSONL file, yielding records as they are appended.
+
+        Restarts from the top if the file is truncated (a new run began).
+
+        Args:
+            path: File to follow; waits for it to appear.
+            poll_interval: Seconds between checks for new data.
+            stop_after: Stop after this many idle seconds (None = forever).
+        """
+        path = Path(path)
+        position = 0
+        buffer = ""
+        idle = 0.0
+        while True:
+            if path.exists():
+                size = path.stat().st_size
+                if size < position:
+                    position, buffer = 0, ""
+                if size > position:
+                    with open(path, "r", encoding="utf-8") as f:
+                        f.seek(position)
+                        buffer += f.read()
+                        position = f.tell()
+                    idle = 0.0
+                    *lines, buffer = buffer.split("\n")
+                    for line in lines:
+                        if line.strip():
+                            try:
+                                yield json.loads(line)
+                            except ValueError:
+                                continue
+                    continue
+            if stop_after is not None and idle >= stop_after:
+                return
+            time.sleep(poll_interval)
+            idle += poll_interval
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ResultsSummary":
+        summary = cls()
+        for record in cls.read(path):
+            summary.add(record)
+        return summary
+
+
+def _print_record(record: Dict[str, Any], summary: ResultsSummary) -> None:
+    status = "♻️" if record.get("cached") else ("✅" if record.get("success") else "❌")
+    print(f"{status} {record.get('company', '?')}: {record.get('sector', '')} "
+          f"({record.get('time', 0.0):.1f}s)  "
+          f"[{summary.successful} ok / {summary.failed} failed / {summary.total} done]")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize a KELP results JSONL file")
+    parser.add_argument("path", type=Path, help="processing_results.jsonl")
+    parser.add_argument("--follow", action="store_true", help="Keep tailing for new results")
+    parser.add_argument("--interval", type=float, default=1.0, help="Poll interval in seconds")
+    args = parser.parse_args()
+
+    if not args.follow and not args.path.exists():
+        parser.error(f"{args.path} does not exist")
+
+    summary = ResultsSummary()
+    records = (ResultsSummary.follow(args.path, args.interval) if args.follow
+               else ResultsSummary.read(args.path))
+    try:
+        for record in records:
+            summary.add(record)
+            _print_record(record, summary)
+    except KeyboardInterrupt:
+        pass
+
+    print(json.dumps(summary.as_dict(), indent=2))
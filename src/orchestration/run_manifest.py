@@ -0,0 +1,168 @@
+"""
+Run Manifest
+============
+
+Content-hash bookkeeping for incremental batch runs.
+
+Each company is fingerprinted from three parts:
+- inputs: sha256 of every markdown file in its Company Data folder
+- config: sha256 of SECTOR_CONFIGS and the LLM_CONFIG fields that shape
+  content (transport settings such as hosts, timeouts and concurrency
+  do not invalidate anything)
+- code:   package version plus a sha256 of the pipeline source files
+
+After a successful run the fingerprint and result are stored in
+run_manifest.json. On the next run, a company whose fingerprint is
+unchanged and whose deck and citation files still exist is reused
+instead of regenerated, so batch cost scales with what changed.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.settings import BASE_DIR, LLM_CONFIG, SECTOR_CONFIGS
+
+
+MANIFEST_VERSION = 1
+
+# LLM_CONFIG fields that change what the model writes
+CONTENT_LLM_FIELDS = ("model_name", "temperature_factual", "temperature_creative",
+                      "max_tokens", "default_options", "one_shot_content", "context_sessions")
+
+# Source trees whose contents define the code version
+CODE_PATHS = ("src", "config", "pipeline_v5_enhanced.py")
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_inputs(company_dir: Path) -> Dict[str, str]:
+    """Hash every markdown file in a company folder, keyed by file name"""
+    return {
+        md_file.name: _sha256_bytes(md_file.read_bytes())
+        for md_file in sorted(company_dir.glob("*.md"))
+    }
+
+
+def config_fingerprint() -> str:
+    """Hash the sector and LLM configuration that shapes generated content"""
+    payload = {
+        "sectors": {key: asdict(cfg) for key, cfg in SECTOR_CONFIGS.items()},
+        "llm": {name: getattr(LLM_CONFIG, name) for name in CONTENT_LLM_FIELDS},
+    }
+    return _sha256_bytes(json.dumps(payload, sort_keys=True, default=str).encode())
+
+
+def _iter_source_files(root: Path, paths: Iterable[str]) -> Iterable[Path]:
+    for rel in paths:
+        path = root / rel
+        if path.is_file():
+            yield path
+        elif path.is_dir():
+            yield from sorted(p for p in path.rglob("*.py") if "__pycache__" not in p.parts)
+
+
+def code_version(root: Path = BASE_DIR) -> str:
+    """Package version plus a hash of the pipeline source files"""
+    from src import __version__
+
+    digest = hashlib.sha256()
+    for path in _iter_source_files(root, CODE_PATHS):
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(path.read_bytes())
+    return f"{__version__}+{digest.hexdigest()[:16]}"
+
+
+class RunManifest:
+    """
+    Persistent record of the last successful run for each company folder.
+
+    Usage:
+        manifest = RunManifest.load(output_dir / "run_manifest.json")
+        fingerprint = manifest.fingerprint(COMPANY_DATA_DIR / folder)
+        entry = manifest.lookup(folder, fingerprint)
+        if entry is None:
+            ...  # regenerate, then
+            manifest.record(folder, fingerprint, result_dict)
+            manifest.save()
+    """
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        # Config and code only change between runs, so hash them once
+        self.config_hash = config_fingerprint()
+        self.code_version = code_version()
+
+    @classmethod
+    def load(cls, path: Path) -> "RunManifest":
+        """Load a manifest, starting empty if missing, unreadable or outdated"""
+        path = Path(path)
+        entries = {}
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    entries = data.get("companies", {})
+            except (OSError, ValueError) as e:
+                print(f"  ⚠ Ignoring unreadable run manifest {path.name}: {e}")
+        return cls(path, entries)
+
+    def fingerprint(self, company_dir: Path) -> Dict[str, Any]:
+        """Current fingerprint for a company folder"""
+        return {
+            "inputs": hash_inputs(Path(company_dir)),
+            "config": self.config_hash,
+            "code": self.code_version,
+        }
+
+    def changes(self, company_folder: str, fingerprint: Dict[str, Any]) -> List[str]:
+        """Names of the fingerprint parts that differ from the recorded run"""
+        entry = self.entries.get(company_folder)
+        if entry is None:
+            return ["new"]
+        recorded = entry.get("fingerprint", {})
+        return [part for part in ("inputs", "config", "code")
+                if recorded.get(part) != fingerprint.get(part)]
+
+    def lookup(self, company_folder: str,
+               fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return the recorded result if it is still valid.
+
+        An entry is valid when its fingerprint matches and every artifact
+        it points to is still on disk.
+        """
+        if self.changes(company_folder, fingerprint):
+            return None
+        entry = self.entries[company_folder]
+        artifacts = [p for p in entry.get("artifacts", []) if p]
+        if not artifacts or not all(Path(p).exists() for p in artifacts):
+            return None
+        return entry.get("result")
+
+    def record(self, company_folder: str, fingerprint: Dict[str, Any],
+               result: Dict[str, Any]) -> None:
+        """Store a successful result and its artifacts for a company folder"""
+        self.entries[company_folder] = {
+            "fingerprint": fingerprint,
+            "artifacts": [result.get("ppt_path", ""), result.get("citation_path", "")],
+            "result": result,
+            "updated": datetime.now().isoformat(),
+        }
+
+    def save(self) -> Path:
+        """Write the manifest atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "companies": self.entries}, f, indent=2)
+        os.replace(tmp_path, self.path)
+        return self.path
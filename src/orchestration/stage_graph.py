@@ -0,0 +1,191 @@
+"""
+Stage Graph Executor
+====================
+
+Runs pipeline steps as a dependency graph instead of a fixed sequence.
+
+Each Stage declares the named values it consumes (inputs) and produces
+(outputs). A stage starts as soon as all of its inputs exist, so stages with
+no dependency on each other - e.g. web research and image fetching - run
+concurrently and total wall time falls to the critical path.
+
+Blocking stages (synchronous network or disk work) run in a worker thread
+via asyncio.to_thread so they never stall the event loop. Every stage runs
+on its own trace track inside a "stage" span.
+
+Stages marked checkpoint=True save their outputs to a CheckpointStore
+when one is passed to run(); on resume they restore those outputs instead
+of executing. A stage that failed but can still hand downstream stages a
+stand-in (empty metrics, template content) returns it wrapped in
+Fallback: the value is used for this run but never checkpointed, so a
+resume recomputes it. The same goes for every stage downstream of it,
+since their outputs were built from the stand-in.
+"""
+
+import asyncio
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .checkpoints import CheckpointStore
+from .tracing import span, track
+
+
+@dataclass
+class Stage:
+    """A single node in the stage graph"""
+    name: str
+    func: Callable[..., Any]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    blocking: bool = False  # Run a synchronous func in a worker thread
+    checkpoint: bool = False  # Persist outputs so a resumed run can skip the stage
+
+
+@dataclass
+class Fallback:
+    """Stage result standing in for output the stage failed to produce"""
+    value: Any
+
+
+class StageGraphError(RuntimeError):
+    """Raised when a stage graph is malformed"""
+
+
+class StageGraph:
+    """
+    Dependency-driven executor for pipeline stages.
+
+    Stage functions are called with their inputs as keyword arguments.
+    A stage with one output returns the value directly; a stage with
+    several outputs returns a tuple in the declared order.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        self._producers: Dict[str, str] = {}
+
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise StageGraphError(
+                        f"'{output}' is produced by both '{self._producers[output]}' "
+                        f"and '{stage.name}'"
+                    )
+                self._producers[output] = stage.name
+
+    def _validate(self, available: Set[str]) -> None:
+        """Ensure every input can be satisfied and the graph is acyclic"""
+        known = set(available) | set(self._producers)
+        for stage in self.stages:
+            missing = [i for i in stage.inputs if i not in known]
+            if missing:
+                raise StageGraphError(f"Stage '{stage.name}' has unsatisfied inputs: {missing}")
+
+        # Simulate execution order to detect cycles
+        ready = set(available)
+        remaining = list(self.stages)
+        while remaining:
+            runnable = [s for s in remaining if all(i in ready for i in s.inputs)]
+            if not runnable:
+                names = [s.name for s in remaining]
+                raise StageGraphError(f"Cycle detected between stages: {names}")
+            for stage in runnable:
+                ready.update(stage.outputs)
+                remaining.remove(stage)
+
+    async def _run_stage(self, stage: Stage, values: Dict[str, Any],
+                         checkpoints: Optional[CheckpointStore] = None,
+                         tainted: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Execute one stage and map its return value onto its outputs.
+
+        `tainted` names the values derived from a Fallback; this stage's
+        outputs join it when the stage falls back or consumes one.
+        """
+        tainted = set() if tainted is None else tainted
+        kwargs = {name: values[name] for name in stage.inputs}
+        use_checkpoint = stage.checkpoint and checkpoints is not None
+
+        with track(stage.name), span(stage.name, "stage") as trace:
+            if use_checkpoint:
+                restored = await asyncio.to_thread(checkpoints.load, stage.name)
+                if restored is not None and set(restored) == set(stage.outputs):
+                    trace["resumed"] = True
+                    return restored
+
+            if stage.blocking:
+                result = await asyncio.to_thread(stage.func, **kwargs)
+            else:
+                result = stage.func(**kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+            fallback = isinstance(result, Fallback)
+            if fallback:
+                result = result.value
+                trace["fallback"] = True
+            elif any(name in tainted for name in stage.inputs):
+                fallback = True  # Built from a stand-in: just as unfit to resume
+                trace["fallback_input"] = True
+
+        if len(stage.outputs) == 0:
+            outputs = {}
+        elif len(stage.outputs) == 1:
+            outputs = {stage.outputs[0]: result}
+        elif not isinstance(result, tuple) or len(result) != len(stage.outputs):
+            raise StageGraphError(
+                f"Stage '{stage.name}' must return a tuple of {len(stage.outputs)} values"
+            )
+        else:
+            outputs = dict(zip(stage.outputs, result))
+
+        if fallback:
+            tainted.update(outputs)
+        elif use_checkpoint:
+            await asyncio.to_thread(checkpoints.save, stage.name, outputs)
+        return outputs
+
+    async def run(self, initial: Optional[Dict[str, Any]] = None,
+                  checkpoints: Optional[CheckpointStore] = None) -> Dict[str, Any]:
+        """
+        Run all stages, starting each one as soon as its inputs are ready.
+
+        Args:
+            initial: Seed values available before any stage runs.
+            checkpoints: Store for saving and restoring checkpointed stages.
+
+        Returns:
+            Dict of all seed values plus every stage output.
+
+        Raises:
+            StageGraphError: If the graph cannot be satisfied.
+            Exception: The first exception raised by a stage; all other
+                in-flight stages are cancelled.
+        """
+        values: Dict[str, Any] = dict(initial or {})
+        self._validate(set(values))
+
+        pending = list(self.stages)
+        running: Dict[asyncio.Task, Stage] = {}
+        tainted: Set[str] = set()  # Outputs built from a Fallback
+
+        try:
+            while pending or running:
+                # Launch every stage whose inputs are now available
+                for stage in [s for s in pending if all(i in values for i in s.inputs)]:
+                    pending.remove(stage)
+                    task = asyncio.create_task(self._run_stage(stage, values, checkpoints,
+                                                               tainted))
+                    running[task] = stage
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    running.pop(task)
+                    values.update(task.result())
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return values
@@ -0,0 +1,247 @@
+"""
+Pipeline Tracing
+================
+
+Lightweight span instrumentation with Chrome-trace / Perfetto export.
+
+A Tracer is activated for a run; any code executing inside it - pipeline
+stages, LLM calls, HTTP fetches, even work pushed to threads with
+asyncio.to_thread - can emit timed spans through the module-level span()
+helper without having the tracer passed in. When no tracer is active,
+span() is a no-op, so instrumented modules work unchanged outside the
+pipeline.
+
+Trace layout:
+- one process (pid) per lane, normally one lane per company
+- one thread (tid) per track, normally one track per pipeline stage
+
+Long batches keep memory flat by draining each company's lane once its
+result is recorded and streaming the events to a TraceFile:
+
+    with TraceFile(path, tracer) as trace_file:
+        ...
+        trace_file.write(tracer.drain(company))
+
+Open the written JSON at https://ui.perfetto.dev or chrome://tracing.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+_current_tracer: ContextVar[Optional["Tracer"]] = ContextVar("kelp_tracer", default=None)
+_current_lane: ContextVar[str] = ContextVar("kelp_trace_lane", default="pipeline")
+_current_track: ContextVar[str] = ContextVar("kelp_trace_track", default="main")
+
+
+class Tracer:
+    """Collects spans for a single pipeline run"""
+
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self._origin = time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._pids: Dict[str, int] = {}
+        self._tids: Dict[Tuple[str, str], int] = {}
+        # Never reused, so drained lanes keep distinct pids in a streamed trace
+        self._pid_counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _now_us(self) -> float:
+        """Microseconds since the tracer was created"""
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _ids_for(self, lane: str, track: str) -> Tuple[int, int]:
+        """Map lane/track names to pid/tid, emitting metadata on first use"""
+        with self._lock:
+            if lane not in self._pids:
+                pid = next(self._pid_counter)
+                self._pids[lane] = pid
+                self._events.append({
+                    "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                    "args": {"name": lane}
+                })
+            pid = self._pids[lane]
+
+            key = (lane, track)
+            if key not in self._tids:
+                tid = sum(1 for (l, _) in self._tids if l == lane) + 1
+                self._tids[key] = tid
+                self._events.append({
+                    "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                    "args": {"name": track}
+                })
+            return pid, self._tids[key]
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **args: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time the enclosed block as a complete ("X") trace event.
+
+        Yields a dict that the caller may add args to (e.g. token counts
+        known only after the call returns).
+        """
+        lane, track = _current_lane.get(), _current_track.get()
+        extra: Dict[str, Any] = dict(args)
+        start = self._now_us()
+        error: Optional[str] = None
+        try:
+            yield extra
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = self._now_us() - start
+            if error:
+                extra["error"] = error
+            pid, tid = self._ids_for(lane, track)
+            event = {
+                "name": name, "cat": category, "ph": "X",
+                "ts": round(start, 1), "dur": round(duration, 1),
+                "pid": pid, "tid": tid,
+                "args": {k: v for k, v in extra.items() if v is not None},
+            }
+            with self._lock:
+                self._events.append(event)
+
+    def stage_timings(self, lane: str, category: str = "stage") -> Dict[str, float]:
+        """Total seconds spent per span name in a lane, for one category"""
+        pid = self._pids.get(lane)
+        timings: Dict[str, float] = {}
+        if pid is None:
+            return timings
+        with self._lock:
+            for event in self._events:
+                if event["ph"] == "X" and event["pid"] == pid and event["cat"] == category:
+                    timings[event["name"]] = round(
+                        timings.get(event["name"], 0.0) + event["dur"] / 1e6, 3
+                    )
+        return timings
+
+    def spans(self, name: str, lane: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Completed spans with this name (in one lane, or all), oldest first"""
+        pid = self._pids.get(lane) if lane is not None else None
+        if lane is not None and pid is None:
+            return []
+        with self._lock:
+            return [dict(event) for event in self._events
+                    if event["ph"] == "X" and event["name"] == name
+                    and (pid is None or event["pid"] == pid)]
+
+    def drain(self, lane: str) -> List[Dict[str, Any]]:
+        """Remove and return every event of a lane (finished company)"""
+        with self._lock:
+            pid = self._pids.pop(lane, None)
+            if pid is None:
+                return []
+            for key in [key for key in self._tids if key[0] == lane]:
+                del self._tids[key]
+            drained = [event for event in self._events if event["pid"] == pid]
+            self._events = [event for event in self._events if event["pid"] != pid]
+        return drained
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build the Chrome trace JSON object"""
+        with self._lock:
+            events = list(self._events)
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"tracer": self.name, "host_pid": os.getpid()},
+        }
+
+    def write(self, path: Path) -> Path:
+        """Write the trace to disk"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+
+class TraceFile:
+    """
+    Chrome trace written incrementally: drained events go straight to
+    disk, and whatever the tracer still holds is added on close.
+    """
+
+    def __init__(self, path: Path, tracer: Tracer):
+        self.path = Path(path)
+        self.tracer = tracer
+        self._file = None
+        self._first = True
+
+    def __enter__(self) -> "TraceFile":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write('{"traceEvents": [')
+        return self
+
+    def write(self, events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            self._file.write(("" if self._first else ",\n") + json.dumps(event))
+            self._first = False
+        self._file.flush()
+
+    def __exit__(self, *exc: Any) -> None:
+        trace = self.tracer.to_chrome_trace()
+        self.write(trace.pop("traceEvents"))
+        self._file.write("],\n" + json.dumps(trace)[1:])
+        self._file.close()
+
+
+# ============================================================================
+# CONTEXT HELPERS
+# ============================================================================
+
+def current_tracer() -> Optional[Tracer]:
+    """Return the tracer active in this context, if any"""
+    return _current_tracer.get()
+
+
+@contextmanager
+def activate(tracer: Tracer) -> Iterator[Tracer]:
+    """Make a tracer current for the enclosed block (and tasks it spawns)"""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def lane(name: str) -> Iterator[None]:
+    """Route spans in the enclosed block to a named lane (trace process)"""
+    token = _current_lane.set(name)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+@contextmanager
+def track(name: str) -> Iterator[None]:
+    """Route spans in the enclosed block to a named track (trace thread)"""
+    token = _current_track.set(name)
+    try:
+        yield
+    finally:
+        _current_track.reset(token)
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **args: Any) -> Iterator[Dict[str, Any]]:
+    """Emit a span on the current tracer; no-op when tracing is inactive"""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield dict(args)
+        return
+    with tracer.span(name, category, **args) as extra:
+        yield extra
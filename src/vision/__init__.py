@@ -1,18 +1,40 @@
 """
 Vision Module
 Contains VL engines for layout generation, image analysis, and image generation
+
+Both engines depend on torch, so submodules are imported on first attribute
+access rather than when the package is imported.
 """
-from .vl_engine import Qwen3VLEngine, LayoutBlueprint, get_vl_engine
-from .janus_engine import JanusProEngine, JanusConfig, get_janus_engine, generate_sector_images
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .vl_engine import Qwen3VLEngine, LayoutBlueprint, get_vl_engine
+    from .janus_engine import JanusProEngine, JanusConfig, get_janus_engine, generate_sector_images
 
-__all__ = [
+_LAZY_ATTRS = {
     # Qwen VL Engine
-    'Qwen3VLEngine', 
-    'LayoutBlueprint', 
-    'get_vl_engine',
+    'Qwen3VLEngine': '.vl_engine',
+    'LayoutBlueprint': '.vl_engine',
+    'get_vl_engine': '.vl_engine',
     # Janus-Pro Engine
-    'JanusProEngine',
-    'JanusConfig',
-    'get_janus_engine',
-    'generate_sector_images'
-]
+    'JanusProEngine': '.janus_engine',
+    'JanusConfig': '.janus_engine',
+    'get_janus_engine': '.janus_engine',
+    'generate_sector_images': '.janus_engine'
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
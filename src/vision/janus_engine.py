@@ -21,6 +21,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config.settings import OUTPUT_DIR
+from src.orchestration.model_residency import gpu_model
 
 
 @dataclass
@@ -126,6 +127,17 @@ class JanusProEngine:
                 pass
         return self._initialized
     
+    def cleanup(self):
+        """Release GPU memory (the model reloads on next use)"""
+        self.model = None
+        self.processor = None
+        self.tokenizer = None
+        self.image_gen_processor = None
+        self._initialized = False
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    
+    @gpu_model("janus-pro-7b")
     def generate_sector_image(self, sector: str, image_type: str = "generic",
                              seed: int = None) -> Optional[Path]:
         """
@@ -349,6 +361,7 @@ class JanusProEngine:
         
         return output_path
     
+    @gpu_model("janus-pro-7b")
     def analyze_image(self, image_path: Union[str, Path]) -> str:
         """
         Analyze an image and generate description.
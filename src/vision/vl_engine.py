@@ -19,6 +19,7 @@ import io
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from src.orchestration.model_residency import gpu_model
 
 
 @dataclass
@@ -135,6 +136,7 @@ class Qwen3VLEngine:
             print(f"Error encoding image: {e}")
             return None
     
+    @gpu_model("qwen2-vl")
     def analyze_image(self, image_path: str, prompt: str) -> str:
         """Analyze an image using Qwen3-VL"""
         if not self._initialized:
@@ -359,6 +361,7 @@ Format as JSON with keys: metrics, products, achievements, positioning, visual_d
             # Return raw insights
             return {"raw_insights": response}
     
+    @gpu_model("qwen2-vl")
     def generate_creative_content(self, prompt: str, context: Dict = None) -> str:
         """
         Generate creative text content with high variation.
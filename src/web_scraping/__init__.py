@@ -9,6 +9,8 @@ from .scraper import (
     scrape_company_website
 )
 
+from .http_pool import SharedHTTPClient
+
 from .web_search import (
     SearchResult,
     ExtractedContent,
@@ -34,5 +36,7 @@ __all__ = [
     'IntelligentScraper',
     'WebSearchPipeline',
     'research_company',
-    'research_company_async'
+    'research_company_async',
+    # From http_pool.py
+    'SharedHTTPClient'
 ]
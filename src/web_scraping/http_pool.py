@@ -0,0 +1,77 @@
+"""
+Shared HTTP Client
+==================
+
+One pooled aiohttp session for a whole pipeline run.
+
+Every research and scraping engine used to open (and close) its own
+ClientSession, so each company paid again for DNS lookups, TCP handshakes
+and TLS negotiation with the same search and news hosts. SharedHTTPClient
+owns a single keep-alive connector that engines borrow via use_session().
+Borrowed sessions are never closed by the engines - only by the owner.
+
+Engines keep their own behaviour by passing headers, timeouts and ssl
+settings per request rather than relying on session defaults.
+"""
+
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+
+class SharedHTTPClient:
+    """
+    Pipeline-scoped aiohttp session with keep-alive connection pooling.
+
+    Usage:
+        async with SharedHTTPClient() as http:
+            engine.use_session(http.session)
+            ...
+    """
+
+    def __init__(self, limit: int = 32, limit_per_host: int = 4,
+                 total_timeout: float = 30, connect_timeout: float = 10,
+                 keepalive_timeout: float = 60):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        """The open session, or None before open() / after close()"""
+        if self._session is None or self._session.closed:
+            return None
+        return self._session
+
+    async def open(self) -> aiohttp.ClientSession:
+        """Open the pooled session (idempotent)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.session is None:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                )
+                self._session = aiohttp.ClientSession(timeout=self.timeout, connector=connector)
+            return self._session
+
+    async def close(self) -> None:
+        """Close the pooled session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._lock = None
+
+    async def __aenter__(self) -> "SharedHTTPClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
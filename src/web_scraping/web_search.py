@@ -80,6 +80,8 @@ class DuckDuckGoSearch:
     
     def __init__(self):
         self.session = None
+        self._owns_session = True
+        self.timeout = aiohttp.ClientTimeout(total=30)
         self._ua_index = 0
     
     def _get_headers(self) -> Dict:
@@ -94,11 +96,16 @@ class DuckDuckGoSearch:
             'Connection': 'keep-alive',
         }
     
+    def use_session(self, session: aiohttp.ClientSession) -> None:
+        """Borrow a shared pooled session; close() will leave it open"""
+        self.session = session
+        self._owns_session = False
+    
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
             connector = aiohttp.TCPConnector(limit=5, ssl=False)
-            self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+            self.session = aiohttp.ClientSession(timeout=self.timeout, connector=connector)
+            self._owns_session = True
         return self.session
     
     async def search(self, query: str, max_results: int = 10, retries: int = 3) -> List[SearchResult]:
@@ -125,7 +132,8 @@ class DuckDuckGoSearch:
                 # Try HTML endpoint first, then lite
                 url = self.BASE_URL if attempt < 2 else self.LITE_URL
                 
-                async with session.post(url, data=data, headers=headers) as response:
+                async with session.post(url, data=data, headers=headers, ssl=False,
+                                        timeout=self.timeout) as response:
                     if response.status == 202:
                         # Rate limited, wait and retry
                         await asyncio.sleep(2 * (attempt + 1))
@@ -244,7 +252,7 @@ class DuckDuckGoSearch:
             return images
     
     async def close(self):
-        if self.session and not self.session.closed:
+        if self._owns_session and self.session and not self.session.closed:
             await self.session.close()
 
 
@@ -256,6 +264,8 @@ class IntelligentScraper:
     
     def __init__(self):
         self.session = None
+        self._owns_session = True
+        self.timeout = aiohttp.ClientTimeout(total=30)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -263,15 +273,20 @@ class IntelligentScraper:
         self.cache_dir = OUTPUT_DIR / "web_cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+    def use_session(self, session: aiohttp.ClientSession) -> None:
+        """Borrow a shared pooled session; close() will leave it open"""
+        self.session = session
+        self._owns_session = False
+    
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
             connector = aiohttp.TCPConnector(limit=10, ssl=False)
             self.session = aiohttp.ClientSession(
-                timeout=timeout,
+                timeout=self.timeout,
                 connector=connector,
                 headers=self.headers
             )
+            self._owns_session = True
         return self.session
     
     def _get_cache_path(self, url: str) -> Path:
@@ -329,7 +344,8 @@ class IntelligentScraper:
         session = await self._get_session()
         
         try:
-            async with session.get(url) as response:
+            async with session.get(url, headers=self.headers, ssl=False,
+                                   timeout=self.timeout) as response:
                 if response.status != 200:
                     return None
                 html = await response.text()
@@ -490,7 +506,7 @@ class IntelligentScraper:
         return metadata
     
     async def close(self):
-        if self.session and not self.session.closed:
+        if self._owns_session and self.session and not self.session.closed:
             await self.session.close()
 
 
@@ -680,6 +696,11 @@ class WebSearchPipeline:
         
         return images
     
+    def use_session(self, session: aiohttp.ClientSession) -> None:
+        """Share one pooled session between the search and scraper"""
+        self.search.use_session(session)
+        self.scraper.use_session(session)
+    
     async def close(self):
         await self.search.close()
         await self.scraper.close()
@@ -0,0 +1,106 @@
+"""
+AIMD behaviour of AdaptiveLimiter, driven by a fake clock.
+"""
+
+import types
+
+import pytest
+
+from src.content_generation import adaptive_limit
+from src.content_generation.adaptive_limit import AdaptiveLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(adaptive_limit, "time", types.SimpleNamespace(perf_counter=clock, time=clock))
+    return clock
+
+
+def _limiter(initial=2, min_limit=1, max_limit=8):
+    return AdaptiveLimiter(initial=initial, min_limit=min_limit, max_limit=max_limit,
+                           latency_tolerance=1.5, backoff=0.5, adaptive=True)
+
+
+def _window(limiter, clock, tokens, seconds=1.0, queued=0.0):
+    """One full window: `limit` concurrent requests finishing together"""
+    clock.now += seconds
+    for _ in range(max(2, limiter.current)):
+        limiter.record(tokens=tokens, seconds=seconds, queued=queued)
+
+
+def test_increases_by_one_while_callers_queue(clock):
+    limiter = _limiter(initial=2)
+    _window(limiter, clock, tokens=100, queued=0.5)
+    assert limiter.current == 3
+    assert limiter.last_throughput == pytest.approx(200)
+
+    _window(limiter, clock, tokens=100, queued=0.5)
+    assert limiter.current == 4
+    assert limiter.increases == 2 and limiter.decreases == 0
+
+
+def test_holds_without_demand(clock):
+    limiter = _limiter(initial=2)
+    _window(limiter, clock, tokens=100, queued=0.0)
+    assert limiter.current == 2
+    assert limiter.increases == 0
+
+
+def test_halves_when_throughput_regresses_under_load(clock):
+    limiter = _limiter(initial=4)
+    _window(limiter, clock, tokens=100, queued=0.5)   # 400 tok/s, step up to 5
+    _window(limiter, clock, tokens=100, queued=0.5)   # 500 tok/s, step up to 6
+    assert limiter.current == 6
+
+    _window(limiter, clock, tokens=20, queued=0.5)    # 120 tok/s: thrashing
+    assert limiter.current == 3
+    assert limiter.decreases == 1
+
+
+def test_queue_wait_is_the_demand_signal(clock):
+    limiter = _limiter(initial=4)
+    _window(limiter, clock, tokens=100, queued=0.0)   # baseline 400 tok/s, no demand
+    assert limiter.current == 4
+
+    # Slower, but nobody queued: an idle server, not thrashing
+    _window(limiter, clock, tokens=40, queued=0.0)
+    assert limiter.current == 4
+
+    # Same throughput with callers waiting for slots: back off
+    _window(limiter, clock, tokens=40, queued=0.5)
+    assert limiter.current == 2
+    assert limiter.last_queue_wait == pytest.approx(0.5)
+
+
+def test_undoes_an_increase_that_lowered_throughput(clock):
+    limiter = _limiter(initial=4)
+    _window(limiter, clock, tokens=100, queued=0.5)   # 400 tok/s, step up to 5
+    assert limiter.current == 5
+
+    # 5 x 70 = 350 tok/s: within tolerance of the baseline, but worse than before
+    _window(limiter, clock, tokens=70, queued=0.0)
+    assert limiter.current == 2
+    assert limiter.decreases == 1
+
+
+def test_limit_is_clamped(clock):
+    limiter = _limiter(initial=20, min_limit=2, max_limit=4)
+    assert limiter.current == 4
+    for _ in range(3):
+        _window(limiter, clock, tokens=100, queued=0.5)
+    assert limiter.current == 4
+    assert limiter.increases == 0
+
+    for _ in range(5):
+        limiter.record_failure()
+    assert limiter.current == 2
+    assert limiter.stats()["limit"] == 2
@@ -0,0 +1,73 @@
+"""
+Checkpoint behaviour of StageGraph: failed stages must not be resumed.
+"""
+
+import asyncio
+
+from src.orchestration import CheckpointStore, Fallback, Stage, StageGraph
+
+
+def _graph(calls, enrich):
+    def load():
+        return "raw"
+
+    def content(enriched):
+        calls.append("content")
+        return {"bullets": [enriched.get("revenue")]}
+
+    return StageGraph([
+        Stage("load", load, outputs=["raw"]),
+        Stage("enrich", enrich, inputs=["raw"], outputs=["enriched"], checkpoint=True),
+        Stage("content", content, inputs=["enriched"], outputs=["content"], checkpoint=True),
+    ])
+
+
+def _run(graph, directory, resume):
+    store = CheckpointStore(directory, {"config": "test"}, resume=resume)
+    values = asyncio.run(graph.run(checkpoints=store))
+    return values, store
+
+
+def test_failed_enrichment_is_not_checkpointed(tmp_path):
+    calls = []
+
+    async def failing_enrich(raw):
+        calls.append("enrich")
+        # What the pipeline does when extraction raises: empty stand-in metrics
+        return Fallback({"revenue": None})
+
+    values, _ = _run(_graph(calls, failing_enrich), tmp_path, resume=False)
+    assert values["enriched"] == {"revenue": None}
+    assert not (tmp_path / "enrich.json").exists()
+    # Content built from the stand-in metrics is just as stale
+    assert values["content"] == {"bullets": [None]}
+    assert not (tmp_path / "content.json").exists()
+
+    async def working_enrich(raw):
+        calls.append("enrich")
+        return {"revenue": 120}
+
+    calls.clear()
+    values, store = _run(_graph(calls, working_enrich), tmp_path, resume=True)
+    # Enrichment and everything downstream of it are recomputed, not restored
+    assert store.restored == []
+    assert calls == ["enrich", "content"]
+    assert values["enriched"] == {"revenue": 120}
+    assert values["content"] == {"bullets": [120]}
+
+
+def test_successful_stages_are_resumed(tmp_path):
+    calls = []
+
+    async def enrich(raw):
+        calls.append("enrich")
+        return {"revenue": 120}
+
+    _run(_graph(calls, enrich), tmp_path, resume=False)
+    assert (tmp_path / "enrich.json").exists()
+
+    calls.clear()
+    values, store = _run(_graph(calls, enrich), tmp_path, resume=True)
+    assert calls == []
+    assert store.restored == ["enrich", "content"]
+    assert values["content"] == {"bullets": [120]}
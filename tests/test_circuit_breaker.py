@@ -0,0 +1,107 @@
+"""
+CircuitBreaker state machine and retry backoff, with a fake clock and RNG.
+"""
+
+import types
+
+import pytest
+
+from src.content_generation import circuit_breaker
+from src.content_generation.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, backoff_delay
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(circuit_breaker, "time", types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def _open_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, name="test")
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, name="test")
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # Resets the streak
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.opened == 1
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert breaker.retry_after() == pytest.approx(30)
+
+
+def test_half_open_probe_closes_the_circuit(clock):
+    breaker = _open_breaker(clock)
+    clock.now += 29.9
+    assert not breaker.allow()
+
+    clock.now += 0.1
+    assert breaker.retry_after() == 0
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = _open_breaker(clock)
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert not breaker.allow()
+    assert breaker.rejected == 2
+
+    # A probe that ends without a verdict frees the slot for the next caller
+    breaker.release_probe()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_failed_probe_reopens_for_another_timeout(clock):
+    breaker = _open_breaker(clock)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.opened == 1  # Still the same outage
+    assert breaker.retry_after() == pytest.approx(30)
+
+    clock.now += 30
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+def test_backoff_delay_is_full_jitter_up_to_the_cap(monkeypatch):
+    bounds = []
+
+    def uniform(low, high):
+        bounds.append((low, high))
+        return high
+
+    monkeypatch.setattr(circuit_breaker, "random", types.SimpleNamespace(uniform=uniform))
+    delays = [backoff_delay(attempt, base=0.5, cap=5.0) for attempt in range(6)]
+    assert bounds == [(0, 0.5), (0, 1.0), (0, 2.0), (0, 4.0), (0, 5.0), (0, 5.0)]
+    assert delays == [0.5, 1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_backoff_delay_stays_within_bounds():
+    for attempt in range(8):
+        for _ in range(50):
+            assert 0 <= backoff_delay(attempt, base=0.25, cap=3.0) <= min(3.0, 0.25 * 2 ** attempt)
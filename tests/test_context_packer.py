@@ -0,0 +1,103 @@
+"""
+Token-budgeted context packing of company one-pagers.
+"""
+
+from src.content_generation.context_packer import (
+    CHARS_PER_TOKEN, HEADER_SECTION, estimate_tokens, pack, pack_context, score_section
+)
+
+
+RESEARCH = """[WEB RESEARCH - USE THESE STATISTICS IN YOUR CONTENT]
+MARKET SIZE: USD 4.2 billion
+INDUSTRY CAGR: 11.5%
+
+[COMPANY DATA]
+# Example Components Pvt Ltd"""
+
+
+def _section(title, sentence, repeat):
+    return f"## {title}\n" + "\n".join(f"{sentence} ({i})" for i in range(repeat))
+
+
+def _one_pager(repeat=20):
+    return "\n".join([
+        RESEARCH,
+        _section("Business Description", "Makes precision castings for automotive OEMs.", repeat),
+        _section("Shareholders", "Promoter group holds 74% of equity.", 3),
+        _section("Board Members", "Independent director with audit background.", 3),
+        _section("Financials", "Revenue grew 18% to INR 420 crore.", repeat),
+        _section("Awards", "Supplier excellence award from a large OEM.", repeat),
+        _section("Future Plan", "Commissioning a second plant in Pune next year.", repeat),
+    ])
+
+
+def test_small_document_is_returned_whole():
+    markdown = _one_pager(repeat=1)
+    packed = pack(markdown, "growth", token_budget=10_000)
+    assert packed.text == markdown
+    assert packed.dropped == [] and packed.truncated == []
+
+
+def test_stays_within_token_budget():
+    markdown = _one_pager()
+    assert estimate_tokens(markdown) > 600
+    for budget in (150, 300, 600):
+        packed = pack(markdown, "growth", token_budget=budget)
+        assert packed.tokens <= budget
+        assert estimate_tokens(packed.text) == packed.tokens
+
+
+def test_most_relevant_sections_win_and_keep_document_order():
+    packed = pack(_one_pager(), "growth", token_budget=600)
+    # growth: Future Plan 1.0, Financials 0.8, Business Description 0.5, Awards default
+    assert packed.sections == [HEADER_SECTION, "Business Description", "Financials", "Future Plan"]
+    assert "Awards" in packed.dropped
+    text = packed.text
+    assert text.index("## Financials") < text.index("## Future Plan")
+
+
+def test_best_section_that_does_not_fit_is_truncated():
+    packed = pack(_one_pager(), "expansion", token_budget=200)
+    # No section fits whole; the best one is cut to the remaining budget, on a line
+    assert packed.sections == [HEADER_SECTION, "Future Plan"]
+    assert packed.truncated == ["Future Plan"]
+    body = packed.text.split("## Future Plan\n")[1]
+    assert body.endswith(")")
+    assert "(0)" in body and "(19)" not in body
+
+
+def test_excluded_sections_are_never_packed():
+    markdown = _one_pager()
+    for purpose in ("teaser", "enrichment", "research"):
+        packed = pack(markdown, purpose, token_budget=estimate_tokens(markdown) - 1)
+        assert "Shareholders" in packed.dropped
+        assert "Board Members" in packed.dropped
+        assert "Promoter group" not in packed.text
+    for title in ("Residence of Shareholders", "Auditor Details", "Related Party Disclosure",
+                  "CARO Analysis", "People", "Ownership"):
+        assert score_section(title, "teaser") == 0.0
+
+
+def test_web_research_header_survives_truncation():
+    packed = pack(_one_pager(), "overview", token_budget=200)
+    assert packed.sections[0] == HEADER_SECTION
+    assert packed.text.startswith(RESEARCH)
+    assert "INDUSTRY CAGR: 11.5%" in packed.text
+    assert packed.dropped
+
+
+def test_long_header_is_capped_at_a_quarter_of_the_budget():
+    research = RESEARCH + "\n" + "\n".join(f"TREND {i}: demand from EV platforms" for i in range(100))
+    markdown = research + "\n" + _section("Future Plan", "Second plant in Pune.", 20)
+    packed = pack(markdown, "growth", token_budget=400)
+    header = packed.text.split("\n\n## ")[0]
+    assert header.startswith("[WEB RESEARCH")
+    assert len(header) <= 100 * CHARS_PER_TOKEN
+    assert "Future Plan" in packed.sections
+
+
+def test_text_without_sections_is_cut_to_budget():
+    text = "Plain notes without any headings. " * 200
+    packed = pack_context(text, "teaser", token_budget=100)
+    assert len(packed) <= 100 * CHARS_PER_TOKEN
+    assert text.startswith(packed)
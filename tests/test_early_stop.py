@@ -0,0 +1,76 @@
+"""
+Streaming stop predicates, fed the growing response chunk by chunk.
+"""
+
+import json
+
+from src.content_generation.early_stop import BulletCountStop, FirstOf, JsonValueStop
+
+
+def _stream(predicate, chunks):
+    """Index of the chunk after which the predicate fired, or None"""
+    text = ""
+    for i, chunk in enumerate(chunks):
+        text += chunk
+        if predicate(text):
+            return i
+    return None
+
+
+def _split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_json_object_completes_on_closing_brace():
+    assert _stream(JsonValueStop("{"), ['Sure! ```json\n{"a": ', '[1, 2]', "}", "\n```"]) == 2
+
+
+def test_brackets_inside_strings_are_ignored():
+    value = '{"note": "ends with } and ]", "list": ["[x", "y}"]}'
+    stop = JsonValueStop("{")
+    assert not stop(value[:-1])
+    assert stop(value)
+
+
+def test_escaped_quotes_do_not_end_a_string():
+    value = r'{"quote": "he said \"}\" then \\", "n": 1}'
+    json.loads(value)  # Sanity: the fixture is valid JSON
+    stop = JsonValueStop("{")
+    assert not stop(value[:-1])
+    assert stop(value)
+
+
+def test_value_split_across_chunks():
+    value = r'Here: {"a": "x\"}y", "b": [{"c": "]"}], "d": "\\"} trailing'
+    closing = value.index("} trailing")
+    for size in (1, 2, 3, 7):
+        chunks = _split(value, size)
+        fired = _stream(JsonValueStop("{"), chunks)
+        # Fires on the chunk that contains the closing brace, not before
+        assert fired == closing // size
+
+
+def test_only_listed_openers_start_a_value():
+    stop = JsonValueStop("[")
+    assert not stop('{"a": 1} ')
+    assert stop('{"a": 1} ["b"]')
+
+
+def test_bullets_count_only_complete_lines():
+    stop = BulletCountStop(3)
+    assert _stream(stop, ["- one\n• tw", "o\n", "Not a bullet\n3. thr", "ee", "\n- four\n"]) == 4
+    assert stop._seen == 4
+
+
+def test_bullet_count_across_single_character_chunks():
+    text = "Intro\n- a\n* b\n1) c\n-\n- d\n"
+    assert _stream(BulletCountStop(4), list(text)) == len(text) - 1
+    assert _stream(BulletCountStop(5), list(text)) is None
+
+
+def test_first_of_keeps_every_predicate_incremental():
+    bullets = BulletCountStop(2)
+    stop = FirstOf(JsonValueStop("{"), bullets)
+    assert _stream(stop, ["- a\n", '{"x": ', "1}"]) == 2
+    assert bullets._seen == 1
+    assert stop.tag == "json:{|bullets:2"
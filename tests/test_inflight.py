@@ -0,0 +1,97 @@
+"""
+InflightRequests: identical concurrent generations share one task.
+"""
+
+import asyncio
+
+from src.content_generation.ollama_client import InflightRequests
+
+
+class FakeGeneration:
+    """Counts calls; each call blocks until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = 0
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"response": f"reply {self.calls}"}
+
+
+def test_identical_requests_share_one_generation():
+    async def scenario():
+        inflight, generation = InflightRequests(), FakeGeneration()
+        generation.release = asyncio.Event()
+        waiters = [asyncio.create_task(inflight.run("k", generation)) for _ in range(3)]
+        other = asyncio.create_task(inflight.run("other", generation))
+        await asyncio.sleep(0)
+        generation.release.set()
+        results = await asyncio.gather(*waiters, other)
+        return inflight, generation, results
+
+    inflight, generation, results = asyncio.run(scenario())
+    assert generation.calls == 2
+    assert inflight.coalesced == 2
+    assert results[:3] == [results[0]] * 3
+    # Every caller gets its own copy
+    assert results[0] is not results[1]
+
+
+def test_finished_request_is_not_reused():
+    async def scenario():
+        inflight, generation = InflightRequests(), FakeGeneration()
+        generation.release = asyncio.Event()
+        generation.release.set()
+        first = await inflight.run("k", generation)
+        second = await inflight.run("k", generation)
+        return generation, first, second
+
+    generation, first, second = asyncio.run(scenario())
+    assert generation.calls == 2
+    assert first != second
+
+
+def test_cancelled_waiter_leaves_shared_generation_running():
+    async def scenario():
+        inflight, generation = InflightRequests(), FakeGeneration()
+        generation.release = asyncio.Event()
+        leaving = asyncio.create_task(inflight.run("k", generation))
+        staying = asyncio.create_task(inflight.run("k", generation))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        await asyncio.sleep(0)
+        assert leaving.cancelled()
+        assert inflight.pending("k")
+
+        generation.release.set()
+        return generation, await staying
+
+    generation, result = asyncio.run(scenario())
+    assert result == {"response": "reply 1"}
+    assert generation.calls == 1
+    assert generation.cancelled == 0
+
+
+def test_generation_is_cancelled_when_every_waiter_leaves():
+    async def scenario():
+        inflight, generation = InflightRequests(), FakeGeneration()
+        generation.release = asyncio.Event()
+        waiters = [asyncio.create_task(inflight.run("k", generation)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        return inflight, generation
+
+    inflight, generation = asyncio.run(scenario())
+    assert generation.cancelled == 1
+    assert not inflight._waiters
@@ -0,0 +1,86 @@
+"""
+LLMResponseCache keying and LRU eviction.
+"""
+
+import types
+
+import pytest
+
+from src.content_generation import llm_cache
+from src.content_generation.llm_cache import LLMResponseCache, payload_key
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # Distinct, increasing timestamps so LRU order never ties
+    clock = types.SimpleNamespace(now=1000.0)
+
+    def tick():
+        clock.now += 1
+        return clock.now
+
+    monkeypatch.setattr(llm_cache, "time", types.SimpleNamespace(time=tick))
+    cache = LLMResponseCache(tmp_path / "cache.sqlite", max_entries=3, enabled=True)
+    yield cache
+    cache.close()
+
+
+def _payload(prompt):
+    return {"model": "test", "prompt": prompt, "options": {"temperature": 0.3}}
+
+
+def _reply(text):
+    return {"response": text, "done": True}
+
+
+def test_key_ignores_stream_and_keep_alive():
+    payload = _payload("hello")
+    assert payload_key({**payload, "stream": True, "keep_alive": "30m"}) == payload_key(payload)
+    assert payload_key({**payload, "stream": False, "keep_alive": 0}) == payload_key(payload)
+
+
+def test_key_covers_everything_else():
+    payload = _payload("hello")
+    assert payload_key({**payload, "prompt": "hello!"}) != payload_key(payload)
+    assert payload_key({**payload, "options": {"temperature": 0.7}}) != payload_key(payload)
+    assert payload_key({**payload, "format": "json"}) != payload_key(payload)
+    # Dict order does not matter
+    assert payload_key(dict(reversed(list(payload.items())))) == payload_key(payload)
+
+
+def test_streamed_request_hits_entry_stored_without_streaming(cache):
+    cache.put({**_payload("a"), "stream": False}, _reply("A"))
+    assert cache.get({**_payload("a"), "stream": True, "keep_alive": "5m"}) == _reply("A")
+
+
+def test_evicts_least_recently_used_at_capacity(cache):
+    for prompt in "abc":
+        cache.put(_payload(prompt), _reply(prompt.upper()))
+    assert cache.size() == 3
+
+    # Reading "a" makes "b" the least recently used
+    assert cache.get(_payload("a")) == _reply("A")
+    cache.put(_payload("d"), _reply("D"))
+
+    assert cache.size() == 3
+    assert cache.evictions == 1
+    assert cache.get(_payload("b")) is None
+    for prompt in "acd":
+        assert cache.get(_payload(prompt)) == _reply(prompt.upper())
+
+
+def test_replacing_an_entry_does_not_evict(cache):
+    for prompt in "abc":
+        cache.put(_payload(prompt), _reply(prompt.upper()))
+    cache.put(_payload("a"), _reply("A2"))
+    assert cache.size() == 3
+    assert cache.evictions == 0
+    assert cache.get(_payload("a")) == _reply("A2")
+
+
+def test_empty_responses_and_bypass_are_not_stored(cache):
+    cache.put(_payload("a"), {"response": "", "done": True})
+    cache.put(_payload("b"), _reply("B"), use_cache=False)
+    assert cache.size() == 0
+    assert cache.get(_payload("b"), use_cache=False) is None
+    assert cache.stats()["bypassed"] == 1
@@ -0,0 +1,86 @@
+"""
+OllamaPool routing against fake Ollama hosts on localhost.
+"""
+
+import asyncio
+import socket
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from src.content_generation.ollama_pool import OllamaPool, _start_fake_ollama
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _hosts(delays):
+    ports = [_free_port() for _ in delays]
+    runners = [await _start_fake_ollama(port, delay, f"host{i}")
+               for i, (port, delay) in enumerate(zip(ports, delays))]
+    return ports, runners
+
+
+async def _ask(pool, prompt):
+    reply = await pool.generate(prompt, engine="test", use_cache=False)
+    return reply.split(":")[0]
+
+
+def test_requests_go_to_least_outstanding_host():
+    async def scenario():
+        # host0 holds each request far longer than the gap between requests
+        ports, runners = await _hosts([0.5, 0.0, 0.0])
+        pool = OllamaPool([f"http://127.0.0.1:{p}" for p in ports], readmit_after=60)
+        try:
+            tasks = []
+            for i in range(12):
+                tasks.append(asyncio.create_task(_ask(pool, f"prompt {i}")))
+                await asyncio.sleep(0.03)
+            return Counter(await asyncio.gather(*tasks))
+        finally:
+            await pool.close()
+            for runner in runners:
+                await runner.cleanup()
+
+    served = asyncio.run(scenario())
+    assert sum(served.values()) == 12
+    # Round-robin would send host0 a third of the traffic
+    assert served["host0"] <= 1
+    assert served["host1"] > 0 and served["host2"] > 0
+
+
+def test_unreachable_host_is_ejected_and_readmitted():
+    async def scenario():
+        ports, runners = await _hosts([0.0, 0.0])
+        pool = OllamaPool([f"http://127.0.0.1:{p}" for p in ports], readmit_after=0.3)
+        down = f"http://127.0.0.1:{ports[0]}"
+        try:
+            await runners[0].cleanup()
+            served = Counter([await _ask(pool, f"down {i}") for i in range(4)])
+            assert served == {"host1": 4}
+            stats = pool.stats()[down]
+            assert stats["ejections"] >= 1
+            assert stats["available"] is False
+
+            # Back up, but still inside the health TTL: no traffic yet
+            runners[0] = await _start_fake_ollama(ports[0], 0.0, "host0")
+            assert {await _ask(pool, "early")} == {"host1"}
+
+            # Past the TTL the next request triggers a background probe
+            await asyncio.sleep(pool.readmit_after)
+            await _ask(pool, "probe")
+            await asyncio.sleep(0.1)
+            assert pool.stats()[down]["available"] is True
+            return Counter([await _ask(pool, f"up {i}") for i in range(4)])
+        finally:
+            await pool.close()
+            for runner in runners:
+                await runner.cleanup()
+
+    served = asyncio.run(scenario())
+    assert served["host0"] > 0